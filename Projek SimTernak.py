@@ -1,603 +1,6101 @@
-import csv
-import os
-import datetime
-
-# ---------- KONSTANTA: Nama File dan Headers ----------
-
-USERS_FILE = 'users.csv'
-LIVESTOCK_FILE = 'livestock.csv'
-HEALTH_FILE = 'health_records.csv'
-FEEDING_FILE = 'feeding_log.csv'
-
-# Headers (Kepala Kolom) untuk setiap file CSV
-HEADERS_USERS = ['username', 'password', 'role']
-HEADERS_LIVESTOCK = ['ternak_id', 'jenis_ternak', 'tgl_lahir', 'berat_sekarang', 'status_kesehatan', 'kandang_id']
-HEADERS_HEALTH = ['record_id', 'ternak_id', 'tanggal', 'gejala', 'tindakan', 'dicatat_oleh']
-HEADERS_FEEDING = ['log_id', 'kandang_id', 'tanggal', 'jenis_pakan', 'jumlah_kg', 'dicatat_oleh']
-
-# ---------- FUNGSI SETUP ----------
-
-def setup_files():
-    # Memeriksa apakah file CSV ada. Jika tidak, buat file dengan headernya.
-    file_headers_map = {
-        USERS_FILE: HEADERS_USERS,
-        LIVESTOCK_FILE: HEADERS_LIVESTOCK,
-        HEALTH_FILE: HEADERS_HEALTH,
-        FEEDING_FILE: HEADERS_FEEDING
-    }
-    
-    for filename, headers in file_headers_map.items():
-        if not os.path.exists(filename):
-            try:
-                with open(filename, mode='w', newline='', encoding='utf-8') as file:
-                    writer = csv.writer(file)
-                    writer.writerow(headers)
-                print(f"File '{filename}' berhasil dibuat.")
-            except IOError as e:
-                print(f"ERROR: Tidak dapat membuat file {filename}. {e}")
-    
-    # Tambahkan admin default jika file users baru dibuat dan kosong
-    if not read_csv(USERS_FILE):
-         # Data admin default
-        admin_data = {'username': 'admin', 'password': 'admin', 'role': 'admin'}
-        append_csv_row(USERS_FILE, admin_data, HEADERS_USERS)
-        print("Akun 'admin' (pass: 'admin') default telah ditambahkan.")
-
-
-# ---------- FUNGSI HELPER CSV (OPERASI FILE) ----------
-
-def read_csv(filename):
-    # Membaca seluruh data dari file CSV dan mengembalikannya sebagai list of dicts.
-    data = []
-    try:
-        with open(filename, mode='r', newline='', encoding='utf-8') as file:
-            # DictReader otomatis menggunakan baris pertama sebagai keys
-            reader = csv.DictReader(file)
-            for row in reader:
-                data.append(row)
-    except FileNotFoundError:
-        print(f"ERROR: File {filename} tidak ditemukan.")
-    except Exception as e:
-        print(f"ERROR: Terjadi kesalahan saat membaca {filename}. {e}")
-    return data
-
-def write_csv_overwrite(filename, data, headers):
-    # Menulis ulang (overwrite) seluruh file CSV dengan data baru.
-    # bagian dari algoritma READ-MODIFY-WRITE.
-    try:
-        with open(filename, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=headers)
-            writer.writeheader()  # Menulis header
-            writer.writerows(data) # Menulis semua baris data
-    except IOError as e:
-        print(f"ERROR: Tidak dapat menulis ke file {filename}. {e}")
-
-def append_csv_row(filename, data_dict, headers):
-    #Menambahkan satu baris data (dict) baru ke akhir file CSV.
-    try:
-        # 'a' (append) untuk menambahkan, bukan 'w' (write)
-        with open(filename, mode='a', newline='', encoding='utf-8') as file:
-            # fieldnames penting agar urutan penulisan benar
-            writer = csv.DictWriter(file, fieldnames=headers)
-            writer.writerow(data_dict)
-    except IOError as e:
-        print(f"ERROR: Tidak dapat menambahkan data ke file {filename}. {e}")
-
-# ---------- FUNGSI HELPER UTILITAS ----------
-
-def clear_screen():
-    # Membersihkan layar terminal.
-    # 'nt' adalah windows
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-def get_current_date():
-    # Mengembalikan tanggal hari ini dalam format YYYY-MM-DD.
-    return datetime.date.today().strftime('%Y-%m-%d')
-
-def generate_id(prefix, filename, id_column):
-    # Membuat ID unik baru berdasarkan data yang ada (contoh: S001 -> S002).
-    data = read_csv(filename)
-    if not data:
-        return f"{prefix}001"
-    
-    # Ambil ID terakhir, ambil angkanya, tambah 1
-    try:
-        last_id = data[-1][id_column]
-        last_num = int(last_id.replace(prefix, ''))
-        new_num = last_num + 1
-        # zfill(3) untuk padding nol (001, 002, ... 010, ... 100)
-        return f"{prefix}{str(new_num).zfill(3)}"
-    except (KeyError, IndexError, ValueError):
-        # Fallback jika ada data korup atau format ID tidak terduga
-        return f"{prefix}{len(data) + 1:03d}"
-
-
-def print_table(data_list, headers):
-    # Mencetak list of dictionaries sebagai tabel yang rapi.
-    if not data_list:
-        print("\n[ Tidak ada data untuk ditampilkan ]")
-        return
-    
-    # Tentukan lebar kolom (bisa di-improve, tapi ini cara sederhana)
-    col_widths = {header: len(header) for header in headers}
-    for row in data_list:
-        for header in headers:
-            col_widths[header] = max(col_widths[header], len(str(row.get(header, ''))))
-            
-    # Cetak Header
-    header_str = " | ".join(header.ljust(col_widths[header]) for header in headers)
-    print("\n" + header_str)
-    print("-" * len(header_str))
-    
-    # Cetak Data
-    for row in data_list:
-        row_str = " | ".join(str(row.get(header, '')).ljust(col_widths[header]) for header in headers)
-        print(row_str)
-
-def get_float_input(prompt):
-    # Memvalidasi input agar pasti float.
-    while True:
-        try:
-            value = float(input(prompt))
-            return value
-        except ValueError:
-            print("Input tidak valid. Masukkan angka (contoh: 150.5)")
-
-# ---------- FUNGSI ALGORITMA (SORTING) ----------
-
-def bubble_sort(data_list, key, reverse=False):
-    # Implementasi Algoritma Bubble Sort untuk daftar ternak.
-    # Dapat mengurutkan berdasarkan 'berat_sekarang' (float) atau 'tgl_lahir' (string).
-    n = len(data_list)
-    sorted_list = list(data_list) 
-    
-    for i in range(n - 1):
-        swapped = False
-        for j in range(0, n - i - 1):
-            try:
-                # Ambil nilai
-                val_a = sorted_list[j][key]
-                val_b = sorted_list[j+1][key]
-                
-                # Konversi jika perlu
-                if key == 'berat_sekarang':
-                    val_a = float(val_a)
-                    val_b = float(val_b)
-                
-                # Tentukan kondisi pembanding
-                condition = (val_a > val_b) if not reverse else (val_a < val_b)
-                
-                if condition:
-                    # Tukar (Swap)
-                    sorted_list[j], sorted_list[j+1] = sorted_list[j+1], sorted_list[j]
-                    swapped = True
-            except (KeyError, ValueError):
-                print(f"Warning: Gagal membandingkan data pada key '{key}'.")
-                continue # Lanjut ke iterasi berikutnya
-                
-        if not swapped:
-            break # Jika tidak ada yang ditukar, list sudah terurut
-            
-    return sorted_list
-
-# ---------- FUNGSI LOGIKA: LOGIN ----------
-
-def fungsi_login():
-    # Menangani login pengguna.
-    # Menggunakan ALGORITMA LINEAR SEARCH untuk mencari user.
-    print("--- LOGIN SimTernak ---")
-    username = input("Username: ")
-    password = input("Password: ")
-    
-    users = read_csv(USERS_FILE)
-    
-    # ALGORITMA: Linear Search
-    for user in users:
-        if user['username'] == username and user['password'] == password:
-            print(f"Login berhasil! Selamat datang, {user['username']} ({user['role']})")
-            return user['username'], user['role']
-            
-    print("Username atau password salah.")
-    return None, None
-
-# ---------- FUNGSI FITUR: PEKERJA ----------
-
-def pekerja_catat_kesehatan(username):
-    # Pekerja mencatat cek kesehatan harian.
-    clear_screen()
-    print(f"--- Catat Cek Kesehatan Harian (Dicatat oleh: {username}) ---")
-    
-    # Tampilkan ternak untuk memudahkan
-    print_table(read_csv(LIVESTOCK_FILE), HEADERS_LIVESTOCK)
-    
-    ternak_id = input("\nID Ternak yang dicek: ").upper()
-    gejala = input("Gejala (kosongi jika sehat): ")
-    tindakan = input("Tindakan yang diberikan: ")
-    tanggal = get_current_date()
-    record_id = generate_id('H', HEALTH_FILE, 'record_id')
-    
-    record_data = {
-        'record_id': record_id,
-        'ternak_id': ternak_id,
-        'tanggal': tanggal,
-        'gejala': gejala if gejala else "Cek Rutin",
-        'tindakan': tindakan,
-        'dicatat_oleh': username
-    }
-    
-    # 1. Simpan ke health_records.csv (APPEND)
-    append_csv_row(HEALTH_FILE, record_data, HEADERS_HEALTH)
-    print(f"Catatan kesehatan {record_id} untuk {ternak_id} berhasil disimpan.")
-    
-    # 2. (Fitur Tambahan) Update status di livestock.csv jika sakit
-    if gejala:
-        pekerja_update_status_ternak(ternak_id, "Sakit")
-
-def pekerja_update_status_ternak(ternak_id, status_baru):
-    # Fungsi helper untuk update status ternak.
-    # Menggunakan ALGORITMA READ-MODIFY-OVERWRITE.
-    # 1. READ (Baca)
-    livestock_data = read_csv(LIVESTOCK_FILE)
-    
-    found = False
-    # 2. MODIFY (Modifikasi di memori)
-    for ternak in livestock_data:
-        if ternak['ternak_id'] == ternak_id:
-            ternak['status_kesehatan'] = status_baru
-            found = True
-            break
-    
-    # 3. OVERWRITE (Tulis Ulang)
-    if found:
-        write_csv_overwrite(LIVESTOCK_FILE, livestock_data, HEADERS_LIVESTOCK)
-        print(f"Status ternak {ternak_id} telah di-update menjadi '{status_baru}'.")
-    else:
-        print(f"Warning: Gagal update status, ternak {ternak_id} tidak ditemukan.")
-
-def pekerja_catat_pakan(username):
-    # Pekerja mencatat pemberian pakan.
-    clear_screen()
-    print(f"--- Catat Pemberian Pakan (Dicatat oleh: {username}) ---")
-    
-    kandang_id = input("ID Kandang yang diberi pakan: ").upper()
-    jenis_pakan = input("Jenis Pakan (Misal: Konsentrat / Rumput): ")
-    jumlah_kg = get_float_input("Jumlah (kg): ")
-    tanggal = get_current_date()
-    log_id = generate_id('F', FEEDING_FILE, 'log_id')
-
-    log_data = {
-        'log_id': log_id,
-        'kandang_id': kandang_id,
-        'tanggal': tanggal,
-        'jenis_pakan': jenis_pakan,
-        'jumlah_kg': jumlah_kg,
-        'dicatat_oleh': username
-    }
-    
-    # Simpan ke feeding_log.csv (APPEND)
-    append_csv_row(FEEDING_FILE, log_data, HEADERS_FEEDING)
-    print(f"Catatan pakan {log_id} untuk kandang {kandang_id} berhasil disimpan.")
-
-def pekerja_update_bobot():
-    """
-    Pekerja meng-update bobot ternak setelah ditimbang.
-    Ini adalah implementasi utama ALGORITMA READ-MODIFY-OVERWRITE.
-    """
-    clear_screen()
-    print("--- Update Bobot Timbang Ternak ---")
-    
-    # Tampilkan data ternak agar mudah dilihat
-    print_table(read_csv(LIVESTOCK_FILE), HEADERS_LIVESTOCK)
-    
-    ternak_id = input("\nID Ternak yang ditimbang: ").upper()
-    
-    # 1. READ (Baca)
-    livestock_data = read_csv(LIVESTOCK_FILE)
-    
-    found = False
-    
-    # 2. MODIFY (Modifikasi di memori)
-    # Algoritma Linear Search untuk menemukan ID yang tepat
-    for ternak in livestock_data:
-        if ternak['ternak_id'] == ternak_id:
-            print(f"Bobot saat ini untuk {ternak_id}: {ternak['berat_sekarang']} kg")
-            berat_baru = get_float_input("Masukkan bobot baru (kg): ")
-            ternak['berat_sekarang'] = berat_baru
-            found = True
-            break # Hentikan loop jika sudah ditemukan
-            
-    # 3. OVERWRITE (Tulis Ulang)
-    if found:
-        write_csv_overwrite(LIVESTOCK_FILE, livestock_data, HEADERS_LIVESTOCK)
-        print(f"Bobot ternak {ternak_id} berhasil di-update.")
-    else:
-        print(f"ERROR: Ternak dengan ID {ternak_id} tidak ditemukan.")
-
-def pekerja_lihat_ternak():
-    """Pekerja melihat daftar ternak (Read-only)."""
-    clear_screen()
-    print("--- Daftar Semua Ternak (Read-Only) ---")
-    data_ternak = read_csv(LIVESTOCK_FILE)
-    print_table(data_ternak, HEADERS_LIVESTOCK)
-
-
-# ---------- 8. FUNGSI FITUR: ADMIN ----------
-
-def admin_manajemen_ternak():
-    """Sub-menu untuk Admin mengelola data master ternak (CRUD)."""
-    while True:
-        clear_screen()
-        print("--- Manajemen Ternak ---")
-        print("1. Tambah Ternak Baru")
-        print("2. Update Data Ternak")
-        print("3. Hapus Data Ternak (Terjual/Mati)")
-        print("4. Kembali ke Menu Admin")
-        pilihan = input("Pilihan [1-4]: ")
-        
-        if pilihan == '1':
-            # --- CREATE (APPEND) ---
-            print("\n--- 1. Tambah Ternak Baru ---")
-            ternak_id = generate_id('S', LIVESTOCK_FILE, 'ternak_id')
-            print(f"ID Ternak Baru (Otomatis): {ternak_id}")
-            jenis = input("Jenis Ternak (Misal: Limosin): ")
-            tgl_lahir = input("Tgl Lahir (YYYY-MM-DD): ") # Validasi bisa ditambahkan
-            berat_awal = get_float_input("Berat Awal (kg): ")
-            kandang = input("ID Kandang: ").upper()
-            
-            ternak_baru = {
-                'ternak_id': ternak_id,
-                'jenis_ternak': jenis,
-                'tgl_lahir': tgl_lahir,
-                'berat_sekarang': berat_awal,
-                'status_kesehatan': 'Sehat', # Default
-                'kandang_id': kandang
-            }
-            append_csv_row(LIVESTOCK_FILE, ternak_baru, HEADERS_LIVESTOCK)
-            print(f"Ternak {ternak_id} berhasil ditambahkan.")
-            
-        elif pilihan == '2':
-            # --- UPDATE (READ-MODIFY-OVERWRITE) ---
-            print("\n--- 2. Update Data Ternak ---")
-            print_table(read_csv(LIVESTOCK_FILE), HEADERS_LIVESTOCK)
-            ternak_id = input("\nID Ternak yang akan di-update: ").upper()
-            
-            data = read_csv(LIVESTOCK_FILE)
-            found = False
-            for ternak in data:
-                if ternak['ternak_id'] == ternak_id:
-                    print(f"Mengubah data untuk {ternak_id}...")
-                    print(f"Kandang saat ini: {ternak['kandang_id']}")
-                    ternak['kandang_id'] = input("ID Kandang Baru (kosongi jika tidak berubah): ") or ternak['kandang_id']
-                    
-                    print(f"Status saat ini: {ternak['status_kesehatan']}")
-                    ternak['status_kesehatan'] = input("Status Kesehatan Baru (kosongi jika tidak berubah): ") or ternak['status_kesehatan']
-                    found = True
-                    break
-            
-            if found:
-                write_csv_overwrite(LIVESTOCK_FILE, data, HEADERS_LIVESTOCK)
-                print(f"Data ternak {ternak_id} berhasil di-update.")
-            else:
-                print(f"Ternak {ternak_id} tidak ditemukan.")
-
-        elif pilihan == '3':
-            # --- DELETE (READ-FILTER-OVERWRITE) ---
-            print("\n--- 3. Hapus Data Ternak ---")
-            print_table(read_csv(LIVESTOCK_FILE), HEADERS_LIVESTOCK)
-            ternak_id = input("\nID Ternak yang akan Dihapus: ").upper()
-            
-            data = read_csv(LIVESTOCK_FILE)
-            data_baru_setelah_hapus = []
-            
-            # Algoritma: Baca semua, tulis ulang KECUALI yang ID-nya cocok
-            for ternak in data:
-                if ternak['ternak_id'] != ternak_id:
-                    data_baru_setelah_hapus.append(ternak)
-            
-            if len(data) != len(data_baru_setelah_hapus):
-                write_csv_overwrite(LIVESTOCK_FILE, data_baru_setelah_hapus, HEADERS_LIVESTOCK)
-                print(f"Ternak {ternak_id} berhasil dihapus.")
-            else:
-                print(f"Ternak {ternak_id} tidak ditemukan.")
-                
-        elif pilihan == '4':
-            break
-        else:
-            print("Pilihan tidak valid.")
-        
-        input("\nTekan Enter untuk kembali ke Manajemen Ternak...")
-
-
-def admin_laporan_ternak():
-    """
-    Admin melihat laporan ternak dengan ALGORITMA SORTING.
-    """
-    clear_screen()
-    print("--- Laporan Ternak (Sortir) ---")
-    print("Urutkan berdasarkan:")
-    print("1. Berat Ternak (Ringan -> Berat)")
-    print("2. Berat Ternak (Berat -> Ringan)")
-    print("3. Umur Ternak (Muda -> Tua)")
-    print("4. Umur Ternak (Tua -> Muda)")
-    pilihan = input("Pilihan [1-4]: ")
-    
-    data_ternak = read_csv(LIVESTOCK_FILE)
-    hasil_sortir = []
-    
-    # Panggil Algoritma Bubble Sort
-    if pilihan == '1':
-        hasil_sortir = bubble_sort(data_ternak, key='berat_sekarang', reverse=False)
-    elif pilihan == '2':
-        hasil_sortir = bubble_sort(data_ternak, key='berat_sekarang', reverse=True)
-    elif pilihan == '3':
-        # Tgl lahir terbaru (muda) ke terlama (tua)
-        hasil_sortir = bubble_sort(data_ternak, key='tgl_lahir', reverse=True) 
-    elif pilihan == '4':
-        # Tgl lahir terlama (tua) ke terbaru (muda)
-        hasil_sortir = bubble_sort(data_ternak, key='tgl_lahir', reverse=False)
-    else:
-        print("Pilihan tidak valid. Menampilkan data standar.")
-        hasil_sortir = data_ternak
-
-    print("\n--- Hasil Laporan Terurut ---")
-    print_table(hasil_sortir, HEADERS_LIVESTOCK)
-
-def admin_cari_riwayat_kesehatan():
-    """
-    Admin mencari riwayat kesehatan spesifik.
-    Menggunakan ALGORITMA LINEAR SEARCH.
-    """
-    clear_screen()
-    print("--- Cari Riwayat Kesehatan Ternak ---")
-    
-    # Tampilkan ternak untuk memudahkan
-    print_table(read_csv(LIVESTOCK_FILE), HEADERS_LIVESTOCK)
-    
-    ternak_id = input("\nMasukkan ID Ternak untuk melihat riwayat: ").upper()
-    
-    print(f"\nMenampilkan riwayat kesehatan untuk: {ternak_id}")
-    
-    # 1. Baca data riwayat
-    data_kesehatan = read_csv(HEALTH_FILE)
-    hasil_pencarian = []
-    
-    # 2. Algoritma Linear Search
-    for record in data_kesehatan:
-        if record['ternak_id'] == ternak_id:
-            hasil_pencarian.append(record)
-            
-    # 3. Tampilkan hasil
-    if hasil_pencarian:
-        print_table(hasil_pencarian, HEADERS_HEALTH)
-    else:
-        print(f"\n[ Tidak ditemukan riwayat kesehatan untuk {ternak_id} ]")
-
-def admin_tambah_pekerja():
-    """Admin mendaftarkan akun pekerja baru."""
-    clear_screen()
-    print("--- Tambah Pengguna (Pekerja) Baru ---")
-    username = input("Username baru: ")
-    password = input("Password baru: ")
-    
-    # Validasi (Linear Search) untuk pastikan username unik
-    users = read_csv(USERS_FILE)
-    for user in users:
-        if user['username'] == username:
-            print(f"ERROR: Username '{username}' sudah ada. Registrasi dibatalkan.")
-            return
-            
-    user_baru = {
-        'username': username,
-        'password': password,
-        'role': 'pekerja'
-    }
-    
-    append_csv_row(USERS_FILE, user_baru, HEADERS_USERS)
-    print(f"Akun pekerja '{username}' berhasil didaftarkan.")
-
-# ---------- 9. FUNGSI MENU UTAMA (Navigasi) ----------
-
-def menu_admin(username):
-    """Menampilkan menu utama untuk Admin."""
-    while True:
-        clear_screen()
-        print(f"--- Menu Admin (Login sebagai: {username}) ---")
-        print("1. Manajemen Ternak (Tambah/Update/Hapus)")
-        print("2. Lihat Laporan Ternak (Sortir)")
-        print("3. Lihat Riwayat Kesehatan Ternak (Search)")
-        print("4. Lihat Log Pemberian Pakan")
-        print("5. Manajemen Pengguna (Tambah Pekerja)")
-        print("6. Logout")
-        
-        pilihan = input("Pilihan [1-6]: ")
-        
-        if pilihan == '1':
-            admin_manajemen_ternak()
-        elif pilihan == '2':
-            admin_laporan_ternak()
-        elif pilihan == '3':
-            admin_cari_riwayat_kesehatan()
-        elif pilihan == '4':
-            clear_screen()
-            print("--- Log Pemberian Pakan ---")
-            print_table(read_csv(FEEDING_FILE), HEADERS_FEEDING)
-        elif pilihan == '5':
-            admin_tambah_pekerja()
-        elif pilihan == '6':
-            print("Logout berhasil.")
-            break
-        else:
-            print("Pilihan tidak valid.")
-            
-        input("\nTekan Enter untuk kembali ke menu...")
-
-def menu_pekerja(username):
-    """Menampilkan menu utama untuk Pekerja."""
-    while True:
-        clear_screen()
-        print(f"--- Menu Pekerja (Login sebagai: {username}) ---")
-        print("1. Catat Cek Kesehatan Harian")
-        print("2. Catat Pemberian Pakan")
-        print("3. Update Bobot Ternak (Timbang)")
-        print("4. Lihat Daftar Semua Ternak (Read-only)")
-        print("5. Logout")
-        
-        pilihan = input("Pilihan [1-5]: ")
-        
-        if pilihan == '1':
-            pekerja_catat_kesehatan(username)
-        elif pilihan == '2':
-            pekerja_catat_pakan(username)
-        elif pilihan == '3':
-            pekerja_update_bobot()
-        elif pilihan == '4':
-            pekerja_lihat_ternak()
-        elif pilihan == '5':
-            print("Logout berhasil.")
-            break
-        else:
-            print("Pilihan tidak valid.")
-        
-        input("\nTekan Enter untuk kembali ke menu...")
-
-# ---------- 10. FUNGSI MAIN (Titik Awal Program) ----------
-
-def main():
-    """Fungsi utama untuk menjalankan program."""
-    
-    # 1. Siapkan file CSV (buat jika belum ada)
-    setup_files()
-    
-    # 2. Loop Program Utama
-    while True:
-        clear_screen()
-        print("========================================")
-        print("  Selamat Datang di SimTernak v1.0")
-        print("========================================")
-        print("1. Login")
-        print("2. Exit")
-        
-        pilihan_utama = input("Pilihan [1-2]: ")
-        
-        if pilihan_utama == '1':
-            # 3. Proses Login
-            username, role = fungsi_login()
-            
-            # 4. Arahkan ke menu yang sesuai
-            if role == 'admin':
-                menu_admin(username)
-            elif role == 'pekerja':
-                menu_pekerja(username)
-            else:
-                input("\nTekan Enter untuk mencoba login kembali...")
-                
-        elif pilihan_utama == '2':
-            print("Terima kasih telah menggunakan SimTernak.")
-            break
-        else:
-            print("Pilihan tidak valid.")
-            input("\nTekan Enter untuk melanjutkan...")
-
-# --- Menjalankan Program ---
-if __name__ == "__main__":
+import argparse
+import array
+import atexit
+import base64
+import bisect
+import collections.abc
+import concurrent.futures
+import contextlib
+import csv
+import functools
+import os
+import datetime
+import gzip
+import hashlib
+import heapq
+import hmac
+import io
+import itertools
+import json
+import mmap
+import queue
+import random
+import re
+import secrets
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+try:
+    import fcntl  # Linux / macOS
+    msvcrt = None
+except ImportError:
+    fcntl = None
+    try:
+        import msvcrt  # Windows
+    except ImportError:
+        msvcrt = None
+
+# ---------- KONSTANTA: Nama File dan Headers ----------
+
+USERS_FILE = 'users.csv'
+LIVESTOCK_FILE = 'livestock.csv'
+HEALTH_FILE = 'health_records.csv'
+FEEDING_FILE = 'feeding_log.csv'
+WEIGHT_FILE = 'weight_history.csv'
+
+# Headers (Kepala Kolom) untuk setiap file CSV
+HEADERS_USERS = ['username', 'password', 'role']
+HEADERS_LIVESTOCK = ['ternak_id', 'jenis_ternak', 'tgl_lahir', 'berat_sekarang', 'status_kesehatan', 'kandang_id']
+HEADERS_HEALTH = ['record_id', 'ternak_id', 'tanggal', 'gejala', 'tindakan', 'dicatat_oleh']
+HEADERS_FEEDING = ['log_id', 'kandang_id', 'tanggal', 'jenis_pakan', 'jumlah_kg', 'dicatat_oleh']
+HEADERS_WEIGHT = ['timbang_id', 'ternak_id', 'tanggal', 'berat', 'dicatat_oleh']
+
+# Mode JOURNAL: update/hapus satu baris cukup ditambahkan ke file journal
+# (contoh: livestock.csv.journal) alih-alih menulis ulang seluruh CSV.
+# Journal dilipat kembali ke CSV (kompaksi) setelah ukurannya melewati batas.
+JOURNAL_AKTIF = os.environ.get('SIMTERNAK_JOURNAL', '1') != '0'
+JOURNAL_SUFFIX = '.journal'
+BATAS_KOMPAKSI_JOURNAL = 256 * 1024  # byte
+
+# Backend penyimpanan: 'csv' (default) atau 'sqlite'.
+# Dengan 'sqlite', seluruh tabel disimpan di SQLITE_FILE, tetapi seluruh menu
+# tetap memakai read_csv / write_csv_overwrite / append_csv_row yang sama.
+STORAGE_BACKEND = os.environ.get('SIMTERNAK_BACKEND', 'csv').lower()
+SQLITE_FILE = os.environ.get('SIMTERNAK_DB', 'simternak.db')
+
+# ---------- KONTEKS DATASET (MULTI-FARM) ----------
+
+# Nama tabel (USERS_FILE, LIVESTOCK_FILE, ...) relatif terhadap folder kerja: itu
+# dataset yang dipakai menu, perintah CLI dan server API. Dataset lain (farm lain,
+# data sintetis benchmark/stress test) ditunjuk dengan KonteksData, yang menyimpan
+# path ABSOLUT setiap tabel di foldernya. Fungsi yang memakai lebih dari satu tabel
+# menerima parameter 'konteks' (None = folder kerja); fungsi tabel tunggal (read_csv,
+# append_csv_row, cari_semua, agregat_tabel, ...) cukup diberi path dari konteks.
+# Semua cache & state memakai path absolut sebagai kunci, dan file pendamping, arsip
+# serta database SQLite selalu dicari di folder tabelnya sendiri, jadi beberapa
+# dataset bisa dipakai bersamaan (juga dari thread berbeda) tanpa berpindah folder.
+
+class KonteksData:
+    """Satu dataset SimTernak (folder farm) beserta path absolut tabel-tabelnya."""
+
+    def __init__(self, folder='.'):
+        self.folder = os.path.abspath(folder)
+        self.nama = os.path.basename(self.folder) or self.folder
+        self.users = self.path(USERS_FILE)
+        self.livestock = self.path(LIVESTOCK_FILE)
+        self.health = self.path(HEALTH_FILE)
+        self.feeding = self.path(FEEDING_FILE)
+        self.weight = self.path(WEIGHT_FILE)
+        self.db = self.path(SQLITE_FILE)
+
+    def __repr__(self):
+        return f"KonteksData({self.folder!r})"
+
+    def path(self, filename):
+        # Path absolut satu tabel/file di dataset ini, contoh: konteks.path(LIVESTOCK_FILE).
+        return os.path.join(self.folder, filename)
+
+    def ada(self):
+        # True jika folder berisi data SimTernak untuk backend yang dipakai.
+        if STORAGE_BACKEND == 'sqlite':
+            return os.path.exists(self.db)
+        return os.path.exists(self.livestock)
+
+def _tabel(konteks, filename):
+    # Path tabel 'filename' di dataset 'konteks' (None = folder kerja).
+    return filename if konteks is None else konteks.path(filename)
+
+def _path_saudara(filename, nama):
+    # Path tabel/file 'nama' di folder yang sama dengan 'filename'.
+    return os.path.join(os.path.dirname(filename), nama)
+
+def _reset_state_memori():
+    # Membuang semua cache & state per proses (seperti proses yang baru mulai).
+    hapus_cache_tabel()
+    for state in (_ID_ALLOCATOR, _ID_TERSIMPAN, _INDEKS_TANGGAL, _SORT_CACHE, _TABEL_KOLOM, _AGREGAT,
+                  _OFFSET_MMAP, _PARTISI_TERINDEKS):
+        state.clear()
+
+# ---------- FUNGSI SETUP ----------
+
+def setup_files(konteks=None):
+    # Memeriksa apakah file CSV ada. Jika tidak, buat file dengan headernya.
+    # Untuk backend SQLite, yang disiapkan adalah skema tabel di database.
+    file_headers_map = {
+        _tabel(konteks, USERS_FILE): HEADERS_USERS,
+        _tabel(konteks, LIVESTOCK_FILE): HEADERS_LIVESTOCK,
+        _tabel(konteks, HEALTH_FILE): HEADERS_HEALTH,
+        _tabel(konteks, FEEDING_FILE): HEADERS_FEEDING,
+        _tabel(konteks, WEIGHT_FILE): HEADERS_WEIGHT
+    }
+    
+    if STORAGE_BACKEND == 'sqlite':
+        _sqlite_siapkan_skema(_tabel(konteks, SQLITE_FILE))
+    
+    for filename, headers in file_headers_map.items():
+        if STORAGE_BACKEND == 'sqlite':
+            continue
+        if not os.path.exists(filename):
+            try:
+                with open(filename, mode='w', newline='', encoding='utf-8') as file:
+                    writer = csv.writer(file)
+                    writer.writerow(headers)
+                print(f"File '{filename}' berhasil dibuat.")
+            except IOError as e:
+                print(f"ERROR: Tidak dapat membuat file {filename}. {e}")
+    
+    # Tambahkan admin default jika file users baru dibuat dan kosong
+    users_file = _tabel(konteks, USERS_FILE)
+    if not read_csv(users_file):
+         # Data admin default
+        admin_data = {'username': 'admin', 'password': hash_password('admin'), 'role': 'admin'}
+        append_csv_row(users_file, admin_data, HEADERS_USERS)
+        print("Akun 'admin' (pass: 'admin') default telah ditambahkan.")
+
+
+# ---------- CACHE TABEL (IN-MEMORY) ----------
+
+# Cache tingkat proses untuk hasil parsing CSV, dengan kunci path absolut file.
+# Setiap entri menyimpan:
+#   'tanda' -> (inode, mtime_ns, ukuran) file (dan file journal-nya) saat terakhir
+#              dibaca/ditulis, agar perubahan dari proses lain tetap terdeteksi.
+#   'rows'  -> list of dicts hasil parsing (nilai selalu string, sama seperti DictReader).
+#   'versi' -> nomor unik yang berganti setiap kali isi tabel berubah.
+_TABLE_CACHE = {}
+_VERSI_COUNTER = itertools.count(1)
+
+def _kunci_cache(filename):
+    # Kunci cache: path absolut agar 'livestock.csv' dan './livestock.csv' sama.
+    return os.path.abspath(filename)
+
+def _tanda_file(filename):
+    # Mengembalikan tanda tangan file (inode, mtime, ukuran) atau None jika tidak ada.
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+def _tanda_tabel(filename):
+    # Tanda tangan isi tabel: file CSV utama ditambah file journal-nya (jika ada).
+    # Untuk backend SQLite: nomor versi tabel yang disimpan di database.
+    if _pakai_sqlite(filename):
+        return _tanda_sqlite(filename)
+    return (_tanda_file(filename), _tanda_file(filename + JOURNAL_SUFFIX))
+
+def _normalisasi_baris(row, headers):
+    # Menyamakan bentuk dict dengan hasil DictReader (semua nilai string).
+    # Contoh: berat 75.0 (float) disimpan sebagai '75.0'.
+    baris = {}
+    for header in headers:
+        value = row.get(header, '')
+        baris[header] = '' if value is None else str(value)
+    return baris
+
+def _simpan_cache(filename, rows, tanda=None):
+    # Menyimpan rows ke cache dengan tanda tangan file saat ini
+    # (atau tanda yang diambil SEBELUM rows dibaca, jika diberikan).
+    if tanda is None:
+        tanda = _tanda_tabel(filename)
+    if tanda[0] is None:
+        _TABLE_CACHE.pop(_kunci_cache(filename), None)
+        return None
+    entry = {
+        'tanda': tanda,
+        'rows': rows,
+        'versi': next(_VERSI_COUNTER),
+    }
+    _TABLE_CACHE[_kunci_cache(filename)] = entry
+    return entry
+
+def _sentuh_cache(entry, filename):
+    # Memperbarui tanda tangan dan versi entri cache yang isinya diubah di tempat
+    # (rows dan indeks tetap dipakai, tidak dibangun ulang).
+    entry['tanda'] = _tanda_tabel(filename)
+    entry['versi'] = next(_VERSI_COUNTER)
+
+def _entri_cache_valid(filename):
+    # Mengembalikan entri cache jika masih sesuai dengan file di disk, selain itu None.
+    # Jika proses lain hanya MENAMBAHKAN baris (ke CSV atau journal-nya), ekor
+    # file yang baru dibaca dan diterapkan ke cache tanpa parsing ulang penuh.
+    entry = _TABLE_CACHE.get(_kunci_cache(filename))
+    if entry is None:
+        return None
+    tanda = _tanda_tabel(filename)
+    if entry['tanda'] == tanda:
+        return entry
+    if _pakai_sqlite(filename):
+        return None
+    # Entri dipakai bersama semua thread (dasbor, validator, server API): ekor
+    # diterapkan di bawah kunci tabel dalam proses, yang juga dipegang penulis,
+    # dan tanda dicek ulang agar ekor yang sama tidak diterapkan dua kali.
+    with _kunci_proses(filename):
+        entry = _TABLE_CACHE.get(_kunci_cache(filename))
+        if entry is None:
+            return None
+        tanda = _tanda_tabel(filename)
+        if entry['tanda'] == tanda:
+            return entry
+        if _segarkan_dari_ekor(entry, filename, tanda):
+            return entry
+    return None
+
+def _tumbuh_dari(lama, baru):
+    # Offset awal ekor baru jika file 'baru' adalah file 'lama' yang hanya bertambah,
+    # None jika file diganti/dipotong/ditulis ulang (perlu parsing penuh).
+    if lama == baru:
+        return lama[2] if lama else 0
+    if baru is None:
+        return None
+    if lama is None:
+        return 0
+    if lama[0] == baru[0] and baru[2] > lama[2]:
+        return lama[2]
+    return None
+
+def _baca_ekor_csv(path, offset):
+    # Membaca baris-baris CSV lengkap setelah byte 'offset'.
+    # Mengembalikan None jika offset tidak jatuh di batas baris atau ekor
+    # berakhir dengan baris yang belum selesai ditulis.
+    with open(path, mode='rb') as file:
+        if offset > 0:
+            file.seek(offset - 1)
+            if file.read(1) != b'\n':
+                return None
+        ekor = file.read()
+    if ekor and not ekor.endswith(b'\n'):
+        return None
+    return list(csv.reader(ekor.decode('utf-8').splitlines()))
+
+def _segarkan_dari_ekor(entry, filename, tanda):
+    # Menerapkan baris tambahan dari proses lain ke entri cache secara incremental.
+    # Mengembalikan False jika perubahan tidak bisa diterapkan dengan cara ini.
+    lama_csv, lama_journal = entry['tanda']
+    baru_csv, baru_journal = tanda
+    offset_csv = _tumbuh_dari(lama_csv, baru_csv)
+    offset_journal = _tumbuh_dari(lama_journal, baru_journal)
+    if offset_csv is None or offset_journal is None or _definisi_indeks(filename) is None:
+        return False
+    try:
+        ekor_csv = _baca_ekor_csv(filename, offset_csv) if baru_csv != lama_csv else []
+        ekor_journal = []
+        if baru_journal != lama_journal:
+            ekor_journal = _baca_ekor_csv(filename + JOURNAL_SUFFIX, offset_journal)
+            if ekor_journal and offset_journal == 0:
+                ekor_journal = ekor_journal[1:]  # lewati header journal
+    except (OSError, UnicodeDecodeError, csv.Error):
+        return False
+    if ekor_csv is None or ekor_journal is None:
+        return False
+    if not _entri_cache_terindeks_dari(entry, filename):
+        return False
+    with open(filename, mode='r', newline='', encoding='utf-8') as file:
+        headers = next(csv.reader(file), [])
+    for baris in ekor_csv:
+        row = dict(zip(headers, baris))
+        entry['rows'].append(row)
+        _indeks_tambah(entry, row)
+    for baris in ekor_journal:
+        if len(baris) != len(headers) + 1:
+            continue
+        _terapkan_op_journal(entry, baris[0], dict(zip(headers, baris[1:])))
+    _sentuh_cache(entry, filename)
+    return True
+
+def hapus_cache_tabel(filename=None):
+    # Membuang cache satu tabel (atau semua tabel jika filename None).
+    if filename is None:
+        _TABLE_CACHE.clear()
+    else:
+        _TABLE_CACHE.pop(_kunci_cache(filename), None)
+
+def versi_tabel(filename):
+    # Nomor versi isi tabel saat ini (berubah setiap kali tabel berubah).
+    # Dipakai oleh cache turunan (misal hasil sortir) untuk tahu kapan harus dihitung ulang.
+    entry = _entri_cache(filename)
+    return entry['versi'] if entry else None
+
+# ---------- FUNGSI HELPER CSV (OPERASI FILE) ----------
+
+def read_csv(filename):
+    # Membaca seluruh data dari file CSV dan mengembalikannya sebagai list of dicts.
+    # Hasil parsing disimpan di cache; selama file di disk tidak berubah
+    # (inode, mtime, ukuran sama), pemanggilan berikutnya tidak mem-parsing ulang.
+    # Catatan: dict di dalam list dipakai bersama dengan cache, jadi ubah data
+    # lewat update_csv_row / write_csv_overwrite, jangan langsung di dict-nya.
+    entry = _entri_cache(filename)
+    return list(entry['rows']) if entry is not None else []
+
+def _entri_cache(filename):
+    # Mengembalikan entri cache yang valid; jika belum ada atau sudah usang,
+    # tabel dibaca dari disk lalu disimpan. None jika tabel tidak dapat dibaca.
+    entry = _entri_cache_valid(filename)
+    if entry is not None:
+        return entry
+
+    if _pakai_sqlite(filename):
+        # Tanda diambil sebelum membaca: jika ada commit dari proses lain di
+        # antaranya, tanda yang tersimpan sudah usang dan tabel akan dibaca ulang.
+        tanda = _tanda_tabel(filename)
+        data = _sqlite_baca_semua(filename)
+        return _simpan_cache(filename, data, tanda)
+
+    data = []
+    try:
+        # Kunci bersama (shared): boleh dibaca banyak proses sekaligus,
+        # tapi tidak saat ada proses yang sedang menulis.
+        with kunci_tabel(filename, eksklusif=False):
+            with open(filename, mode='r', newline='', encoding='utf-8') as file:
+                # DictReader otomatis menggunakan baris pertama sebagai keys
+                reader = csv.DictReader(file)
+                for row in reader:
+                    data.append(row)
+            data = _terapkan_journal(filename, data)
+            return _simpan_cache(filename, data)
+    except FileNotFoundError:
+        print(f"ERROR: File {filename} tidak ditemukan.")
+    except Exception as e:
+        print(f"ERROR: Terjadi kesalahan saat membaca {filename}. {e}")
+    return None
+
+# umask proses, dibaca sekali saat start-up (os.umask hanya bisa dibaca dengan mengubahnya)
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+def _samakan_mode(path_sementara, *sumber):
+    # mkstemp membuat file dengan mode 0600: pakai mode file pertama di 'sumber'
+    # yang ada (file lama / file data), atau mode bawaan sesuai umask.
+    for path in sumber:
+        if path and os.path.exists(path):
+            shutil.copymode(path, path_sementara)
+            return
+    os.chmod(path_sementara, 0o666 & ~_UMASK)
+
+def _tulis_file_csv(filename, data, headers):
+    # Menulis ulang isi file CSV secara atomik: tulis ke file sementara di folder
+    # yang sama, fsync, lalu os.replace. Jika program berhenti di tengah jalan,
+    # file lama tetap utuh (tidak pernah kosong). Mengembalikan True jika berhasil.
+    folder = os.path.dirname(os.path.abspath(filename))
+    fd, path_sementara = tempfile.mkstemp(prefix='.' + os.path.basename(filename) + '.',
+                                          suffix='.tmp', dir=folder)
+    try:
+        with os.fdopen(fd, mode='w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=headers)
+            writer.writeheader()  # Menulis header
+            writer.writerows(data) # Menulis semua baris data
+            file.flush()
+            os.fsync(file.fileno())
+        _samakan_mode(path_sementara, filename)
+        os.replace(path_sementara, filename)
+    except (IOError, OSError) as e:
+        print(f"ERROR: Tidak dapat menulis ke file {filename}. {e}")
+        with contextlib.suppress(OSError):
+            os.remove(path_sementara)
+        hapus_cache_tabel(filename)
+        return False
+    return True
+
+def _tulis_json_atomik(path, isi, acuan=None):
+    # Menulis file pendamping JSON secara atomik (file sementara + os.replace).
+    # Mode file mengikuti file lama, atau file data 'acuan' saat pertama kali dibuat.
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, path_sementara = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.',
+                                          suffix='.tmp', dir=folder)
+    try:
+        with os.fdopen(fd, mode='w', encoding='utf-8') as file:
+            # json.dumps memakai encoder C; json.dump ke file memakai encoder Python (jauh lebih lambat)
+            file.write(json.dumps(isi, separators=(',', ':')))
+        _samakan_mode(path_sementara, path, acuan)
+        os.replace(path_sementara, path)
+    except (IOError, OSError) as e:
+        print(f"ERROR: Tidak dapat menyimpan {path}. {e}")
+        with contextlib.suppress(OSError):
+            os.remove(path_sementara)
+
+def write_csv_overwrite(filename, data, headers):
+    # Menulis ulang (overwrite) seluruh file CSV dengan data baru.
+    # bagian dari algoritma READ-MODIFY-WRITE.
+    # Setelah berhasil, cache diperbarui langsung (write-through) tanpa parsing ulang.
+    with kunci_tabel(filename):
+        # Isi lama (jika masih ada di cache) agar pendengar cukup menerima selisihnya
+        lama = _entri_cache_valid(filename) if _PENDENGAR_PERUBAHAN else None
+        tanda_lama = _tanda_sebelum_tulis(filename, lama)
+        rows_lama = list(lama['rows']) if lama is not None else None
+        if _pakai_sqlite(filename):
+            if _sqlite_tulis_semua(filename, data, headers):
+                entry = _simpan_cache(filename, [_normalisasi_baris(row, headers) for row in data])
+                _beritahu_tulis_ulang(filename, tanda_lama, rows_lama, entry['rows'] if entry else data, headers)
+            return
+        if not _tulis_file_csv(filename, data, headers):
+            return
+        # Data baru sudah lengkap di file utama, journal lama tidak berlaku lagi
+        _hapus_journal(filename)
+        entry = _simpan_cache(filename, [_normalisasi_baris(row, headers) for row in data])
+        _sinkron_alokator_setelah_tulis(filename, data, headers)
+        _beritahu_tulis_ulang(filename, tanda_lama, rows_lama, entry['rows'] if entry else data, headers)
+
+def append_csv_row(filename, data_dict, headers):
+    #Menambahkan satu baris data (dict) baru ke akhir file CSV.
+    append_csv_rows(filename, [data_dict], headers)
+
+def append_csv_rows(filename, rows, headers):
+    # Menambahkan banyak baris sekaligus dengan satu kali buka-tulis-tutup file
+    # (buffered bulk append). Jika cache tabel masih valid sebelum menulis,
+    # baris baru langsung ditambahkan ke cache; jika tidak, cache dibuang.
+    if not rows:
+        return
+    with kunci_tabel(filename):
+        entry = _entri_cache_valid(filename)
+        tanda_lama = _tanda_sebelum_tulis(filename, entry)
+        if _pakai_sqlite(filename):
+            if not _sqlite_tambah_baris(filename, rows, headers):
+                hapus_cache_tabel(filename)
+                return
+        else:
+            try:
+                # 'a' (append) untuk menambahkan, bukan 'w' (write)
+                with open(filename, mode='a', newline='', encoding='utf-8') as file:
+                    # fieldnames penting agar urutan penulisan benar
+                    writer = csv.DictWriter(file, fieldnames=headers)
+                    writer.writerows(rows)
+            except IOError as e:
+                print(f"ERROR: Tidak dapat menambahkan data ke file {filename}. {e}")
+                hapus_cache_tabel(filename)
+                return
+        baru = [_normalisasi_baris(data_dict, headers) for data_dict in rows]
+        if entry is None:
+            hapus_cache_tabel(filename)
+        else:
+            for baris in baru:
+                entry['rows'].append(baris)
+                _indeks_tambah(entry, baris)
+            _sentuh_cache(entry, filename)
+        _beritahu_perubahan(filename, tanda_lama, [], baru)
+
+def append_csv_row_dengan_id(filename, prefix, id_column, data_dict, headers):
+    # Membuat ID baru lalu menambahkan baris, dalam SATU bagian terkunci,
+    # sehingga dua terminal yang mencatat bersamaan tidak mendapat ID yang sama.
+    # Mengembalikan ID yang dipakai.
+    return append_csv_rows_dengan_id(filename, prefix, id_column, [data_dict], headers)[0]
+
+def append_csv_rows_dengan_id(filename, prefix, id_column, rows, headers):
+    # Versi banyak baris: satu blok ID dipesan sekaligus, lalu ditulis dengan
+    # satu bulk append. Mengembalikan list ID sesuai urutan rows.
+    if not rows:
+        return []
+    with kunci_tabel(filename):
+        awal = _reservasi_id(prefix, filename, id_column, len(rows))
+        ids = [f"{prefix}{str(awal + i).zfill(3)}" for i in range(len(rows))]
+        append_csv_rows(filename, [dict(row, **{id_column: id_baru}) for row, id_baru in zip(rows, ids)], headers)
+    return ids
+
+def update_csv_row(filename, id_value, perubahan, headers):
+    # Mengubah beberapa kolom pada satu baris yang dicari lewat kunci primer.
+    # Baris ditemukan dengan indeks hash (O(1)), indeks diperbarui di tempat,
+    # lalu perubahan disimpan. Mengembalikan True jika baris ditemukan.
+    # 'perubahan' boleh berupa dict, atau fungsi(row) -> dict yang dijalankan
+    # di dalam kunci terhadap isi baris terbaru (untuk read-modify-write atomik).
+    with kunci_tabel(filename):
+        if callable(perubahan):
+            row = cari_berdasarkan_id(filename, id_value)
+            if row is None:
+                return False
+            perubahan = perubahan(dict(row))
+        return update_csv_rows(filename, {id_value: perubahan}, headers) == 1
+
+def update_csv_rows(filename, perubahan_per_id, headers):
+    # Menerapkan banyak update sekaligus: {id: {kolom: nilai}}.
+    # Semua perubahan disimpan dalam SATU penulisan (satu append journal,
+    # satu transaksi SQLite, atau satu kali tulis ulang CSV).
+    # Mengembalikan jumlah baris yang ditemukan dan diubah.
+    with kunci_tabel(filename):
+        entry = _entri_cache_terindeks(filename)
+        if entry is None:
+            return 0
+        tanda_lama = _tanda_sebelum_tulis(filename, entry)
+        ops = []
+        lama = []
+        for id_value, perubahan in perubahan_per_id.items():
+            row = entry['indeks']['pk'].get(id_value)
+            if row is None:
+                continue
+            lama.append(dict(row))
+            _indeks_ubah(entry, row, {k: '' if v is None else str(v) for k, v in perubahan.items()})
+            ops.append(('U', id_value, row))
+        if not ops:
+            return 0
+        if not _simpan_perubahan_baris(filename, entry, ops, headers):
+            return 0
+        _beritahu_perubahan(filename, tanda_lama, lama, [row for _, _, row in ops])
+        _kompaksi_bila_perlu(filename, headers)
+        return len(ops)
+
+def delete_csv_row(filename, id_value, headers):
+    # Menghapus satu baris berdasarkan kunci primer, lalu menyimpan perubahan.
+    # Mengembalikan True jika baris ditemukan dan dihapus. Baris ditemukan lewat
+    # indeks O(1), tetapi mengeluarkannya dari cache O(n) (lihat _hapus_baris_entri).
+    with kunci_tabel(filename):
+        entry = _entri_cache_terindeks(filename)
+        if entry is None:
+            return False
+        row = entry['indeks']['pk'].get(id_value)
+        if row is None:
+            return False
+        tanda_lama = _tanda_sebelum_tulis(filename, entry)
+        _hapus_baris_entri(entry, row)
+        if not _simpan_perubahan_baris(filename, entry, [('D', id_value, row)], headers):
+            return False
+        _beritahu_perubahan(filename, tanda_lama, [row], [])
+        _kompaksi_bila_perlu(filename, headers)
+        return True
+
+def _simpan_perubahan_baris(filename, entry, ops, headers):
+    # Menyimpan ops (list of (op, id, row)) yang sudah diterapkan ke entri cache:
+    # ke SQLite, ke journal, atau dengan menulis ulang CSV. True jika berhasil.
+    if _pakai_sqlite(filename):
+        return _sqlite_simpan_perubahan(filename, entry, ops, headers)
+    if JOURNAL_AKTIF:
+        return _catat_journal(filename, entry, ops, headers)
+    if not _tulis_file_csv(filename, entry['rows'], headers):
+        return False
+    _sentuh_cache(entry, filename)
+    _sinkron_alokator_setelah_tulis(filename, [row for op, _, row in ops if op == 'U'], headers)
+    return True
+
+def _hapus_baris_entri(entry, row):
+    # Mengeluarkan row (berdasarkan identitas) dari rows dan indeks entri cache.
+    # Catatan: hapus tetap O(n) -- rows adalah list berurutan sesuai file (dipakai
+    # read_csv dan penulisan ulang CSV), jadi posisinya dicari dan list digeser.
+    # Lookup, tambah, dan update tetap O(1); hapus jarang terjadi di aplikasi ini.
+    _indeks_hapus(entry, row)
+    rows = entry['rows']
+    for i, kandidat in enumerate(rows):
+        if kandidat is row:
+            del rows[i]
+            break
+
+# ---------- PENDENGAR PERUBAHAN TABEL ----------
+
+# Fungsi yang dipanggil setelah setiap penulisan tabel berhasil (masih di dalam
+# kunci tabel), dengan tanda tangan:
+#   fungsi(filename, tanda_lama, tanda_baru, dihapus, ditambah)
+# 'dihapus' / 'ditambah' berisi baris lama / baris baru (update = hapus versi
+# lama + tambah versi baru). write_csv_overwrite melaporkan selisih isi lama dan
+# baru dengan cara yang sama jika isi lama ada di cache; jika tidak, dihapus None
+# berarti seluruh isi tabel diganti dengan 'ditambah'. Perubahan dari proses lain
+# TIDAK dilaporkan; pendengar mendeteksinya lewat tanda tabel yang tidak cocok.
+_PENDENGAR_PERUBAHAN = []
+
+def tambah_pendengar_perubahan(fungsi):
+    if fungsi not in _PENDENGAR_PERUBAHAN:
+        _PENDENGAR_PERUBAHAN.append(fungsi)
+
+def hapus_pendengar_perubahan(fungsi):
+    if fungsi in _PENDENGAR_PERUBAHAN:
+        _PENDENGAR_PERUBAHAN.remove(fungsi)
+
+def _tanda_sebelum_tulis(filename, entry=None):
+    # Tanda tabel sebelum ditulis (hanya diambil jika ada pendengar).
+    # Entri cache yang valid sudah menyimpan tanda terkini, jadi tidak perlu stat ulang.
+    if not _PENDENGAR_PERUBAHAN:
+        return None
+    return entry['tanda'] if entry is not None else _tanda_tabel(filename)
+
+def _beritahu_perubahan(filename, tanda_lama, dihapus, ditambah):
+    if not _PENDENGAR_PERUBAHAN:
+        return
+    tanda_baru = _tanda_tabel(filename)
+    for fungsi in list(_PENDENGAR_PERUBAHAN):
+        try:
+            fungsi(filename, tanda_lama, tanda_baru, dihapus, ditambah)
+        except Exception as e:
+            print(f"ERROR: Pendengar perubahan untuk {filename} gagal. {e}")
+
+def _selisih_baris(lama, baru, headers):
+    # (dihapus, ditambah): baris yang hanya ada di isi lama / hanya di isi baru.
+    # Baris yang sama persis di keduanya (berapa pun posisinya) tidak dilaporkan.
+    def nilai(row):
+        return tuple(row.get(h, '') for h in headers)
+
+    sisa_baru = collections.Counter(map(nilai, baru))
+    dihapus = []
+    for row in lama:
+        kunci = nilai(row)
+        if sisa_baru[kunci]:
+            sisa_baru[kunci] -= 1
+        else:
+            dihapus.append(row)
+    sisa_lama = collections.Counter(map(nilai, lama))
+    ditambah = []
+    for row in baru:
+        kunci = nilai(row)
+        if sisa_lama[kunci]:
+            sisa_lama[kunci] -= 1
+        else:
+            ditambah.append(row)
+    return dihapus, ditambah
+
+def _beritahu_tulis_ulang(filename, tanda_lama, lama, baru, headers):
+    # Pemberitahuan setelah seluruh isi tabel diganti (lihat write_csv_overwrite).
+    if lama is None:
+        _beritahu_perubahan(filename, None, None, baru)
+    else:
+        _beritahu_perubahan(filename, tanda_lama, *_selisih_baris(lama, baru, headers))
+
+# ---------- PENGUNCIAN FILE (MULTI-PENGGUNA) ----------
+
+# Setiap tabel punya file kunci sendiri (contoh: livestock.csv.lock) yang dikunci
+# dengan advisory lock (fcntl.flock; msvcrt.locking di Windows).
+# Kunci bersifat re-entrant di dalam satu proses: fungsi yang sudah memegang
+# kunci boleh memanggil fungsi lain yang juga mengunci tabel yang sama.
+# Jika bagian dalam meminta kunci eksklusif sementara bagian luar hanya memegang
+# kunci bersama, kunci dinaikkan ke eksklusif selama bagian dalam, lalu diturunkan
+# lagi. flock tidak menaikkan kunci secara atomik (proses lain bisa menulis di
+# antaranya), jadi bagian dalam harus mengecek ulang tanda tabel sebelum menulis.
+_KUNCI_LOKAL = {}
+_KUNCI_LOKAL_GUARD = threading.Lock()
+
+def _kunci_file(file, eksklusif):
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX if eksklusif else fcntl.LOCK_SH)
+    elif msvcrt is not None:
+        # msvcrt tidak mengenal kunci bersama, jadi selalu eksklusif
+        file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+def _lepas_file(file):
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _state_kunci(filename):
+    path = _kunci_cache(filename) + '.lock'
+    with _KUNCI_LOKAL_GUARD:
+        return _KUNCI_LOKAL.setdefault(path, {'rlock': threading.RLock(), 'file': None, 'depth': 0,
+                                              'eksklusif': False})
+
+def _kunci_proses(filename):
+    # Hanya bagian dalam-proses dari kunci_tabel (tanpa file kunci): dipakai untuk
+    # mengubah entri cache bersama tanpa bentrok dengan thread penulis di proses ini.
+    return _state_kunci(filename)['rlock']
+
+@contextlib.contextmanager
+def kunci_tabel(filename, eksklusif=True):
+    # Context manager untuk bagian kritis pada satu tabel.
+    # eksklusif=True untuk menulis (read-modify-write), False untuk membaca.
+    path = _kunci_cache(filename) + '.lock'
+    state = _state_kunci(filename)
+    with state['rlock']:
+        naik = False
+        if state['depth'] == 0:
+            file = open(path, mode='a+b')
+            try:
+                _kunci_file(file, eksklusif)
+            except BaseException:
+                file.close()
+                raise
+            state['file'] = file
+            # msvcrt selalu mengunci eksklusif
+            state['eksklusif'] = eksklusif or fcntl is None
+        elif eksklusif and not state['eksklusif']:
+            _kunci_file(state['file'], True)
+            state['eksklusif'] = naik = True
+        state['depth'] += 1
+        try:
+            yield
+        finally:
+            state['depth'] -= 1
+            if naik:
+                state['eksklusif'] = False
+                _kunci_file(state['file'], False)
+            if state['depth'] == 0:
+                file, state['file'] = state['file'], None
+                try:
+                    _lepas_file(file)
+                finally:
+                    file.close()
+
+# ---------- JOURNAL PERUBAHAN (APPEND-ONLY) ----------
+
+# Format file journal: CSV dengan kolom '_op' diikuti kolom tabel.
+#   U -> upsert: seluruh isi baris terbaru (menimpa baris dengan kunci primer sama)
+#   D -> delete: hanya kolom kunci primer yang terisi
+# Saat dibaca, journal diterapkan berurutan di atas isi CSV utama.
+
+def _terapkan_journal(filename, data):
+    # Menggabungkan isi journal (jika ada) ke data hasil parsing CSV utama.
+    definisi = _definisi_indeks(filename)
+    path_journal = filename + JOURNAL_SUFFIX
+    if definisi is None or not os.path.exists(path_journal):
+        return data
+    kolom_pk = definisi[0]
+    posisi = {row.get(kolom_pk): i for i, row in enumerate(data)}
+    dihapus = set()
+    try:
+        with open(path_journal, mode='r', newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if not header or header[0] != '_op':
+                return data
+            kolom = header[1:]
+            for baris in reader:
+                # Baris tidak lengkap (misal program berhenti saat menulis) diabaikan
+                if len(baris) != len(header):
+                    continue
+                row = dict(zip(kolom, baris[1:]))
+                kunci = row.get(kolom_pk)
+                if baris[0] == 'U':
+                    if kunci in posisi and posisi[kunci] not in dihapus:
+                        data[posisi[kunci]] = row
+                    else:
+                        posisi[kunci] = len(data)
+                        data.append(row)
+                elif baris[0] == 'D' and kunci in posisi:
+                    dihapus.add(posisi.pop(kunci))
+    except (OSError, csv.Error, UnicodeDecodeError) as e:
+        print(f"ERROR: Terjadi kesalahan saat membaca journal {path_journal}. {e}")
+    if dihapus:
+        data = [row for i, row in enumerate(data) if i not in dihapus]
+    return data
+
+def _catat_journal(filename, entry, ops, headers):
+    # Menambahkan catatan perubahan ke journal (operasi O(1) terhadap ukuran tabel),
+    # lalu menjalankan kompaksi bila journal sudah melewati batas ukuran.
+    # ops: list of (op, id, row) dengan op 'U' atau 'D'.
+    path_journal = filename + JOURNAL_SUFFIX
+    kolom_pk = entry['indeks']['kolom_pk']
+    try:
+        baru = not os.path.exists(path_journal) or os.path.getsize(path_journal) == 0
+        with open(path_journal, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            if baru:
+                writer.writerow(['_op'] + list(headers))
+            for op, _, row in ops:
+                if op == 'D':
+                    writer.writerow([op] + [row.get(h, '') if h == kolom_pk else '' for h in headers])
+                else:
+                    writer.writerow([op] + [row.get(h, '') for h in headers])
+    except IOError as e:
+        print(f"ERROR: Tidak dapat menulis ke journal {path_journal}. {e}")
+        hapus_cache_tabel(filename)
+        return False
+    _sentuh_cache(entry, filename)
+    return True
+
+def _kompaksi_bila_perlu(filename, headers):
+    # Menjalankan kompaksi jika journal sudah melewati batas ukuran.
+    # Dipanggil SETELAH pendengar perubahan diberi tahu, agar tanda tabel
+    # yang mereka simpan berurutan (tulis journal -> kompaksi).
+    path_journal = filename + JOURNAL_SUFFIX
+    with contextlib.suppress(OSError):
+        if os.path.getsize(path_journal) > BATAS_KOMPAKSI_JOURNAL:
+            kompaksi_journal(filename, headers)
+
+def _terapkan_op_journal(entry, op, row):
+    # Menerapkan satu operasi journal ke entri cache yang sudah berindeks.
+    indeks = entry['indeks']
+    lama = indeks['pk'].get(row.get(indeks['kolom_pk']))
+    if op == 'U':
+        if lama is not None:
+            _indeks_ubah(entry, lama, row)
+        else:
+            entry['rows'].append(row)
+            _indeks_tambah(entry, row)
+    elif op == 'D' and lama is not None:
+        _hapus_baris_entri(entry, lama)
+
+def _hapus_journal(filename):
+    # Menghapus file journal (dipakai setelah isi lengkap ditulis ke CSV utama).
+    try:
+        os.remove(filename + JOURNAL_SUFFIX)
+    except FileNotFoundError:
+        pass
+
+def kompaksi_journal(filename, headers):
+    # Melipat journal ke CSV utama: tulis ulang CSV dari isi tabel terkini,
+    # lalu hapus journal. Indeks dan cache tetap dipakai (tidak di-parse ulang).
+    with kunci_tabel(filename):
+        entry = _entri_cache_terindeks(filename)
+        if entry is None:
+            return False
+        tanda_lama = _tanda_sebelum_tulis(filename, entry)
+        if not _tulis_file_csv(filename, entry['rows'], headers):
+            return False
+        _hapus_journal(filename)
+        _sentuh_cache(entry, filename)
+        _sinkron_alokator_setelah_tulis(filename, [], headers)
+        # Isi tabel tidak berubah, hanya tandanya
+        _beritahu_perubahan(filename, tanda_lama, [], [])
+        return True
+
+# ---------- BACKEND SQLITE ----------
+
+# Nama tabel SQLite untuk setiap file CSV, beserta header kolomnya.
+# Semua kolom disimpan sebagai TEXT agar isi baris identik dengan hasil DictReader.
+TABEL_SQLITE = {
+    USERS_FILE: ('users', HEADERS_USERS),
+    LIVESTOCK_FILE: ('livestock', HEADERS_LIVESTOCK),
+    HEALTH_FILE: ('health_records', HEADERS_HEALTH),
+    FEEDING_FILE: ('feeding_log', HEADERS_FEEDING),
+    WEIGHT_FILE: ('weight_history', HEADERS_WEIGHT),
+}
+# Indeks tambahan (selain kunci primer) untuk kolom relasi dan tanggal
+INDEKS_SQLITE = {
+    'livestock': ['kandang_id'],
+    'health_records': ['ternak_id', 'tanggal'],
+    'feeding_log': ['kandang_id', 'tanggal'],
+    'weight_history': ['ternak_id', 'tanggal'],
+}
+
+_SQLITE_KONEKSI = {}
+_SQLITE_GUARD = threading.RLock()
+# Tabel kecil berisi nomor versi per tabel; dinaikkan di dalam setiap transaksi
+# tulis, sehingga cache tiap proses tahu tepat tabel mana yang berubah.
+# (Perubahan langsung lewat tool SQLite lain perlu hapus_cache_tabel().)
+# Baris '<tabel>#tulis_ulang' dinaikkan setiap kali seluruh isi tabel diganti:
+# rowid lalu mulai lagi dari 1, jadi alokator ID harus memindai ulang dari awal.
+TABEL_VERSI_SQLITE = 'simternak_versi'
+SUFFIX_TULIS_ULANG_SQLITE = '#tulis_ulang'
+# Teks SQL per tabel dibuat sekali; sqlite3 menyimpan statement yang sudah
+# dikompilasi (prepared) berdasarkan teks SQL yang sama.
+_SQL_TABEL = {}
+
+def _pakai_sqlite(filename):
+    return STORAGE_BACKEND == 'sqlite' and os.path.basename(filename) in TABEL_SQLITE
+
+def _path_sqlite(filename):
+    # Database SQLite milik dataset tempat 'filename' berada (satu database per folder farm).
+    return _path_saudara(filename, SQLITE_FILE)
+
+def _koneksi_sqlite(filename):
+    # Satu koneksi per proses per file database, dengan mode WAL.
+    # filename: tabel mana pun di dataset itu (atau path database-nya sendiri).
+    path = _path_sqlite(filename)
+    key = (os.getpid(), os.path.abspath(path))
+    conn = _SQLITE_KONEKSI.get(key)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None,
+                               check_same_thread=False, cached_statements=256)
+        conn.execute('PRAGMA journal_mode=WAL').fetchall()
+        conn.execute('PRAGMA synchronous=NORMAL')
+        _SQLITE_KONEKSI[key] = conn
+    return conn
+
+def _sql_tabel(filename):
+    # Mengembalikan (nama tabel, headers, kolom pk, dict teks SQL) untuk satu file.
+    nama, headers = TABEL_SQLITE[os.path.basename(filename)]
+    if nama not in _SQL_TABEL:
+        kolom_pk = INDEX_DEFS[os.path.basename(filename)][0]
+        daftar_kolom = ', '.join(headers)
+        tanda_tanya = ', '.join('?' for _ in headers)
+        _SQL_TABEL[nama] = {
+            'select': f"SELECT {daftar_kolom} FROM {nama} ORDER BY rowid",
+            'insert': f"INSERT INTO {nama} ({daftar_kolom}) VALUES ({tanda_tanya})",
+            'update': f"UPDATE {nama} SET {', '.join(h + ' = ?' for h in headers)} WHERE {kolom_pk} = ?",
+            'delete': f"DELETE FROM {nama} WHERE {kolom_pk} = ?",
+            'delete_semua': f"DELETE FROM {nama}",
+            'id_setelah': f"SELECT rowid, {kolom_pk} FROM {nama} WHERE rowid > ? ORDER BY rowid",
+        }
+    return nama, headers, INDEX_DEFS[os.path.basename(filename)][0], _SQL_TABEL[nama]
+
+def _sqlite_siapkan_skema(filename):
+    # Membuat tabel dan indeks jika belum ada (di database milik dataset 'filename').
+    with _SQLITE_GUARD:
+        conn = _koneksi_sqlite(filename)
+        for filename, (nama, headers) in TABEL_SQLITE.items():
+            kolom_pk = INDEX_DEFS[filename][0]
+            kolom = ', '.join(f"{h} TEXT PRIMARY KEY" if h == kolom_pk else f"{h} TEXT" for h in headers)
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {nama} ({kolom})")
+            for kolom_indeks in INDEKS_SQLITE.get(nama, []):
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{nama}_{kolom_indeks} ON {nama} ({kolom_indeks})")
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {TABEL_VERSI_SQLITE} (tabel TEXT PRIMARY KEY, versi INTEGER)")
+
+def _tanda_sqlite(filename):
+    # fetchall() agar statement selesai dan tidak menahan snapshot baca WAL.
+    nama = TABEL_SQLITE[os.path.basename(filename)][0]
+    with _SQLITE_GUARD:
+        try:
+            hasil = _koneksi_sqlite(filename).execute(
+                f"SELECT versi FROM {TABEL_VERSI_SQLITE} WHERE tabel = ?", [nama]).fetchall()
+        except sqlite3.Error:
+            hasil = []
+    return ('sqlite', hasil[0][0] if hasil else 0)
+
+def _naikkan_versi_sqlite(conn, filename, tulis_ulang=False):
+    # Dipanggil di dalam transaksi tulis yang sedang berjalan.
+    # tulis_ulang=True jika seluruh isi tabel dihapus lalu diisi ulang.
+    nama = TABEL_SQLITE[os.path.basename(filename)][0]
+    for kunci in ([nama, nama + SUFFIX_TULIS_ULANG_SQLITE] if tulis_ulang else [nama]):
+        conn.execute(f"INSERT INTO {TABEL_VERSI_SQLITE} (tabel, versi) VALUES (?, 1) "
+                     f"ON CONFLICT(tabel) DO UPDATE SET versi = versi + 1", [kunci])
+
+def _sqlite_nilai(row, headers):
+    return ['' if row.get(h) is None else str(row.get(h)) for h in headers]
+
+def _sqlite_baca_semua(filename):
+    _, headers, _, sql = _sql_tabel(filename)
+    with _SQLITE_GUARD:
+        try:
+            cursor = _koneksi_sqlite(filename).execute(sql['select'])
+            return [dict(zip(headers, baris)) for baris in cursor]
+        except sqlite3.Error as e:
+            print(f"ERROR: Terjadi kesalahan saat membaca {filename} dari SQLite. {e}")
+            return []
+
+def _sqlite_tulis_semua(filename, data, headers):
+    # Mengganti seluruh isi tabel dalam satu transaksi.
+    _, _, _, sql = _sql_tabel(filename)
+    with _SQLITE_GUARD:
+        conn = _koneksi_sqlite(filename)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(sql['delete_semua'])
+            conn.executemany(sql['insert'], (_sqlite_nilai(row, headers) for row in data))
+            _naikkan_versi_sqlite(conn, filename, tulis_ulang=True)
+            conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            # BEGIN IMMEDIATE sendiri bisa gagal (database sibuk): belum ada transaksi
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            print(f"ERROR: Tidak dapat menulis ke tabel {filename}. {e}")
+            hapus_cache_tabel(filename)
+            return False
+    return True
+
+def _sqlite_tambah_baris(filename, rows, headers):
+    # Menambahkan satu atau banyak baris dalam satu transaksi.
+    _, _, _, sql = _sql_tabel(filename)
+    with _SQLITE_GUARD:
+        conn = _koneksi_sqlite(filename)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany(sql['insert'], (_sqlite_nilai(row, headers) for row in rows))
+            _naikkan_versi_sqlite(conn, filename)
+            conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            # BEGIN IMMEDIATE sendiri bisa gagal (database sibuk): belum ada transaksi
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            print(f"ERROR: Tidak dapat menambahkan data ke tabel {filename}. {e}")
+            return False
+    return True
+
+def _sqlite_simpan_perubahan(filename, entry, ops, headers):
+    # Menyimpan update ('U') / hapus ('D') yang sudah diterapkan ke cache,
+    # semuanya dalam satu transaksi. ops: list of (op, id, row).
+    _, _, _, sql = _sql_tabel(filename)
+    with _SQLITE_GUARD:
+        conn = _koneksi_sqlite(filename)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            for op, id_value, row in ops:
+                if op == 'U':
+                    conn.execute(sql['update'], _sqlite_nilai(row, headers) + [id_value])
+                else:
+                    conn.execute(sql['delete'], [id_value])
+            _naikkan_versi_sqlite(conn, filename)
+            conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            # BEGIN IMMEDIATE sendiri bisa gagal (database sibuk): belum ada transaksi
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            print(f"ERROR: Tidak dapat menyimpan perubahan ke tabel {filename}. {e}")
+            hapus_cache_tabel(filename)
+            return False
+    _sentuh_cache(entry, filename)
+    return True
+
+def _state_alokator_sqlite(prefix, filename, id_column):
+    # Versi SQLite dari alokator ID: hanya baris dengan rowid di atas yang
+    # terakhir dilihat yang dibaca (setara dengan membaca ekor file CSV).
+    # Setelah tabel ditulis ulang (proses mana pun) rowid mulai lagi dari 1:
+    # pemindaian diulang dari awal, 'maks' lama tetap dipertahankan.
+    key = ('sqlite', os.path.abspath(_path_sqlite(filename)), os.path.basename(filename), prefix)
+    state = _ID_ALLOCATOR.setdefault(key, {'maks': 0, 'rowid': 0, 'tulis_ulang': 0})
+    nama, _, _, sql = _sql_tabel(filename)
+    with _SQLITE_GUARD:
+        conn = _koneksi_sqlite(filename)
+        hasil = conn.execute(f"SELECT versi FROM {TABEL_VERSI_SQLITE} WHERE tabel = ?",
+                             [nama + SUFFIX_TULIS_ULANG_SQLITE]).fetchall()
+        tulis_ulang = hasil[0][0] if hasil else 0
+        if tulis_ulang != state['tulis_ulang']:
+            state['rowid'] = 0
+            state['tulis_ulang'] = tulis_ulang
+        for rowid, value in conn.execute(sql['id_setelah'], [state['rowid']]):
+            angka = _angka_id(value, prefix)
+            if angka is not None and angka > state['maks']:
+                state['maks'] = angka
+            state['rowid'] = rowid
+    return state
+
+def _baca_csv_langsung(filename):
+    # Membaca file CSV (beserta journal-nya) tanpa melewati cache/backend.
+    with open(filename, mode='r', newline='', encoding='utf-8') as file:
+        data = list(csv.DictReader(file))
+    return _terapkan_journal(filename, data)
+
+def migrasi_csv_ke_sqlite(konteks=None):
+    # Memindahkan seluruh isi file CSV ke database SQLite (sekali jalan).
+    # Isi tabel SQLite yang lama diganti. ID ganda di CSV hanya disimpan sekali.
+    _sqlite_siapkan_skema(_tabel(konteks, SQLITE_FILE))
+    hasil = {}
+    for nama_file, (nama, headers) in TABEL_SQLITE.items():
+        filename = _tabel(konteks, nama_file)
+        if not os.path.exists(filename):
+            print(f"Lewati {filename}: file tidak ditemukan.")
+            continue
+        # Baris yang sudah diarsipkan per bulan ikut dipindahkan
+        data = list(_baca_arsip(filename)) + _baca_csv_langsung(filename)
+        _, _, _, sql = _sql_tabel(filename)
+        insert_abaikan = sql['insert'].replace('INSERT INTO', 'INSERT OR IGNORE INTO', 1)
+        with _SQLITE_GUARD:
+            conn = _koneksi_sqlite(filename)
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                conn.execute(sql['delete_semua'])
+                conn.executemany(insert_abaikan, (_sqlite_nilai(row, headers) for row in data))
+                jumlah = conn.execute(f"SELECT COUNT(*) FROM {nama}").fetchall()[0][0]
+                _naikkan_versi_sqlite(conn, filename, tulis_ulang=True)
+                conn.execute('COMMIT')
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                print(f"ERROR: Migrasi {filename} gagal. {e}")
+                continue
+            hapus_cache_tabel(filename)
+        hasil[nama] = jumlah
+        print(f"{filename} -> {nama}: {jumlah} baris ({len(data) - jumlah} ID ganda dilewati).")
+    return hasil
+
+def ekspor_sqlite_ke_csv(konteks=None):
+    # Menulis ulang seluruh file CSV dari isi database SQLite.
+    hasil = {}
+    for nama_file, (nama, headers) in TABEL_SQLITE.items():
+        filename = _tabel(konteks, nama_file)
+        _, _, _, sql = _sql_tabel(filename)
+        with _SQLITE_GUARD:
+            data = [dict(zip(headers, baris)) for baris in _koneksi_sqlite(filename).execute(sql['select'])]
+        with kunci_tabel(filename):
+            if _tulis_file_csv(filename, data, headers):
+                _hapus_journal(filename)
+                hasil[nama] = len(data)
+                print(f"{nama} -> {filename}: {len(data)} baris.")
+        hapus_cache_tabel(filename)
+    return hasil
+
+# ---------- PEMBACA CSV MMAP (LOOKUP TERARAH) ----------
+
+# Untuk lookup sekali jalan pada log besar (misal riwayat satu ternak, atau ID
+# maksimum saat alokator mulai), mem-parsing seluruh tabel menjadi dict itu mahal.
+# PembacaMmap memetakan file ke memori (mmap), mencari offset awal tiap baris
+# sekali (disimpan per file dan diperpanjang saat file hanya bertambah), lalu:
+#   - nilai_kolom(kolom)      -> hanya satu kolom yang di-decode (proyeksi),
+#   - saring(kolom, nilai)    -> byte nilai dicari langsung di file (mm.find);
+#                                hanya baris kandidat yang di-decode & dicek,
+#   - baris(i)                -> akses acak ke baris ke-i lewat offset.
+# Pembaca membaca file CSV apa adanya: perubahan di journal TIDAK ikut terbaca,
+# jadi pemanggil hanya memakainya jika tidak ada journal (lihat cari_semua).
+# Map ditutup setelah dipakai (di Windows file yang sedang di-mmap tidak bisa diganti).
+
+# kunci cache -> {'ino', 'ukuran', 'offset'}; 'offset' berisi awal setiap baris
+# (baris 0 = header) ditambah satu penanda akhir.
+_OFFSET_MMAP = {}
+UKURAN_BLOK_OFFSET = 4 * 1024 * 1024
+
+def _offset_baris(mm, mulai, akhir, offset):
+    # Menambahkan awal setiap baris di mm[mulai:akhir] ke 'offset' (tanpa penanda akhir).
+    # Newline di dalam field berkutip bukan akhir baris.
+    if mm.find(b'"', mulai, akhir) != -1:
+        awal_baris = mulai
+        kutip = 0
+        pos = mulai
+        while pos < akhir:
+            nl = mm.find(b'\n', pos, akhir)
+            ujung = akhir if nl == -1 else nl + 1
+            kutip += mm[pos:ujung].count(b'"')
+            if kutip % 2 == 0:
+                offset.append(awal_baris)
+                awal_baris = ujung
+                kutip = 0
+            pos = ujung
+        if awal_baris < akhir:
+            offset.append(awal_baris)
+        return
+    pos = mulai
+    while pos < akhir:
+        # Blok dipotong tepat setelah newline; split + accumulate berjalan di C
+        batas = min(pos + UKURAN_BLOK_OFFSET, akhir)
+        if batas < akhir:
+            nl = mm.rfind(b'\n', pos, batas)
+            batas = nl + 1 if nl != -1 else akhir
+        blok = mm[pos:batas]
+        potongan = blok.split(b'\n')
+        if potongan[-1] == b'':
+            potongan.pop()
+        offset.extend(itertools.accumulate((len(x) + 1 for x in potongan[:-1]), initial=pos))
+        pos = batas
+
+class PembacaMmap:
+    """Pembaca CSV baca-saja berbasis mmap dengan offset baris dan proyeksi kolom."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, mode='rb')
+        try:
+            st = os.fstat(self._file.fileno())
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if st.st_size else b''
+        except BaseException:
+            self._file.close()
+            raise
+        self.offset = self._muat_offset(st)
+        self.headers = self._pecah(self._mentah(-1)) if len(self.offset) > 1 else []
+        self._posisi = {nama: i for i, nama in enumerate(self.headers)}
+
+    def _muat_offset(self, st):
+        kunci = _kunci_cache(self.filename)
+        cached = _OFFSET_MMAP.get(kunci)
+        mm = self._mm
+        if cached is not None and cached['ino'] == st.st_ino and cached['ukuran'] == st.st_size:
+            return cached['offset']
+        offset = array.array('q')
+        mulai = 0
+        if (cached is not None and cached['ino'] == st.st_ino and cached['ukuran'] < st.st_size
+                and cached['ukuran'] > 0 and mm[cached['ukuran'] - 1:cached['ukuran']] == b'\n'):
+            # File hanya bertambah: pakai offset lama, pindai ekornya saja
+            offset = array.array('q', cached['offset'][:-1])
+            mulai = cached['ukuran']
+        _offset_baris(mm, mulai, st.st_size, offset)
+        offset.append(st.st_size)
+        _OFFSET_MMAP[kunci] = {'ino': st.st_ino, 'ukuran': st.st_size, 'offset': offset}
+        return offset
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.tutup()
+
+    def tutup(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+    def __len__(self):
+        # Jumlah baris data (tanpa header)
+        return max(0, len(self.offset) - 2)
+
+    def _mentah(self, i):
+        # Byte baris data ke-i (i = -1 untuk header), tanpa akhir baris.
+        return self._mm[self.offset[i + 1]:self.offset[i + 2]].rstrip(b'\r\n')
+
+    @staticmethod
+    def _pecah(mentah, posisi=None):
+        # Memecah satu baris menjadi field (str). Baris tanpa kutip dipecah di level
+        # byte dan hanya field di 'posisi' (jika diberikan) yang di-decode.
+        if b'"' in mentah:
+            field = next(csv.reader([mentah.decode('utf-8')]), [])
+            return field if posisi is None else [field[p] if p < len(field) else '' for p in posisi]
+        field = mentah.split(b',')
+        if posisi is None:
+            return [f.decode('utf-8') for f in field]
+        return [field[p].decode('utf-8') if p < len(field) else '' for p in posisi]
+
+    def _posisi_kolom(self, kolom):
+        try:
+            return [self._posisi[nama] for nama in kolom]
+        except KeyError as e:
+            raise KeyError(f"kolom {e} tidak ada di {self.filename}")
+
+    def baris(self, i, kolom=None):
+        # Baris data ke-i sebagai dict (hanya kolom yang diminta jika 'kolom' diisi).
+        kolom = list(kolom) if kolom is not None else self.headers
+        return dict(zip(kolom, self._pecah(self._mentah(i), self._posisi_kolom(kolom))))
+
+    def nilai_kolom(self, kolom):
+        # Iterator nilai satu kolom untuk semua baris (proyeksi satu kolom).
+        posisi = self._posisi_kolom([kolom])
+        for i in range(len(self)):
+            mentah = self._mentah(i)
+            if mentah:
+                yield self._pecah(mentah, posisi)[0]
+
+    def saring(self, kolom, nilai, proyeksi=None):
+        # Semua baris dengan kolom == nilai. Nilai dicari dulu sebagai byte beserta
+        # pemisah field-nya (",nilai," / "\nnilai,") di seluruh file; baris yang tidak
+        # memuat pola itu tidak pernah di-decode.
+        posisi = self._posisi_kolom([kolom])[0]
+        proyeksi = list(proyeksi) if proyeksi is not None else self.headers
+        posisi_proyeksi = self._posisi_kolom(proyeksi)
+        target = nilai.encode('utf-8')
+        if not target or len(self) == 0 or any(c in target for c in b',"\r\n'):
+            # Nilai kosong atau yang perlu dikutip di CSV: cek semua baris
+            return [self.baris(i, proyeksi) for i in range(len(self))
+                    if self._pecah(self._mentah(i), [posisi])[0] == nilai]
+        pola = (b'\n' if posisi == 0 else b',') + target
+        if posisi < len(self.headers) - 1:
+            pola += b','
+        hasil = []
+        mm = self._mm
+        pos = self.offset[1] - 1  # newline header ikut, agar pola kolom pertama cocok di baris 1
+        akhir = self.offset[-1]
+        while True:
+            pos = mm.find(pola, pos, akhir)
+            if pos == -1:
+                break
+            i = bisect.bisect_right(self.offset, pos + 1) - 2
+            mentah = self._mentah(i)
+            if self._pecah(mentah, [posisi])[0] == nilai:
+                hasil.append(dict(zip(proyeksi, self._pecah(mentah, posisi_proyeksi))))
+            # Lanjut dari baris berikutnya: satu baris cukup dicek sekali
+            pos = self.offset[i + 2]
+        return hasil
+
+def _bisa_pakai_mmap(filename):
+    # mmap membaca CSV mentah: hanya untuk backend CSV tanpa journal yang tertunda.
+    return (not _pakai_sqlite(filename) and os.path.exists(filename)
+            and not os.path.exists(filename + JOURNAL_SUFFIX))
+
+def cari_mmap(filename, kolom, value, proyeksi=None):
+    # Lookup terarah langsung ke file lewat PembacaMmap. None jika tidak bisa
+    # (file tidak ada, ada journal, kolom tidak dikenal): pemanggil memakai cache.
+    if not _bisa_pakai_mmap(filename):
+        return None
+    try:
+        with kunci_tabel(filename, eksklusif=False), PembacaMmap(filename) as pembaca:
+            return pembaca.saring(kolom, value, proyeksi)
+    except (OSError, ValueError, KeyError, UnicodeDecodeError, csv.Error):
+        return None
+
+# ---------- INDEKS HASH ----------
+
+# Definisi indeks per tabel: (kolom kunci primer, [kolom indeks sekunder]).
+# Indeks primer: nilai -> dict baris. Indeks sekunder: nilai -> list baris (urutan file).
+INDEX_DEFS = {
+    USERS_FILE: ('username', []),
+    LIVESTOCK_FILE: ('ternak_id', ['kandang_id']),
+    HEALTH_FILE: ('record_id', ['ternak_id']),
+    FEEDING_FILE: ('log_id', ['kandang_id']),
+    WEIGHT_FILE: ('timbang_id', ['ternak_id']),
+}
+
+def _definisi_indeks(filename):
+    return INDEX_DEFS.get(os.path.basename(filename))
+
+def _indeks_tambah(entry, row):
+    # Menambahkan satu baris ke indeks entri cache (jika indeks sudah dibangun).
+    indeks = entry.get('indeks')
+    if indeks is None:
+        return
+    # Jika ada ID ganda, baris pertama yang dipakai (sama seperti linear search lama)
+    indeks['pk'].setdefault(row.get(indeks['kolom_pk']), row)
+    for kolom, isi in indeks['sek'].items():
+        isi.setdefault(row.get(kolom), []).append(row)
+
+def _lepas_dari_daftar(isi, kunci, row):
+    # Mengeluarkan row (berdasarkan identitas) dari isi[kunci] pada indeks sekunder.
+    daftar = isi.get(kunci)
+    if not daftar:
+        return
+    for i, kandidat in enumerate(daftar):
+        if kandidat is row:
+            del daftar[i]
+            break
+    if not daftar:
+        del isi[kunci]
+
+def _lepas_dari_pk(entry, row):
+    # Mengeluarkan row dari indeks primer. Jika ada baris lain dengan ID sama
+    # (data ganda), baris itu yang kemudian ditunjuk oleh indeks (pencarian O(n)).
+    indeks = entry['indeks']
+    kunci = row.get(indeks['kolom_pk'])
+    if indeks['pk'].get(kunci) is not row:
+        return
+    del indeks['pk'][kunci]
+    for kandidat in entry['rows']:
+        if kandidat is not row and kandidat.get(indeks['kolom_pk']) == kunci:
+            indeks['pk'][kunci] = kandidat
+            break
+
+def _indeks_hapus(entry, row):
+    # Mengeluarkan satu baris dari indeks entri cache.
+    indeks = entry.get('indeks')
+    if indeks is None:
+        return
+    _lepas_dari_pk(entry, row)
+    for kolom, isi in indeks['sek'].items():
+        _lepas_dari_daftar(isi, row.get(kolom), row)
+
+def _indeks_ubah(entry, row, perubahan):
+    # Menerapkan perubahan kolom pada baris, hanya memindahkan entri indeks
+    # untuk kolom berindeks yang nilainya benar-benar berubah.
+    indeks = entry.get('indeks')
+    if indeks is None:
+        row.update(perubahan)
+        return
+    kolom_pk = indeks['kolom_pk']
+    pk_berubah = kolom_pk in perubahan and perubahan[kolom_pk] != row.get(kolom_pk)
+    if pk_berubah:
+        _lepas_dari_pk(entry, row)
+    for kolom, isi in indeks['sek'].items():
+        if kolom in perubahan and perubahan[kolom] != row.get(kolom):
+            _lepas_dari_daftar(isi, row.get(kolom), row)
+            isi.setdefault(perubahan[kolom], []).append(row)
+    row.update(perubahan)
+    if pk_berubah:
+        indeks['pk'].setdefault(row.get(kolom_pk), row)
+
+def _entri_cache_terindeks(filename):
+    # Mengembalikan entri cache yang valid dan sudah memiliki indeks.
+    # Indeks dibangun sekali per parsing; setelah itu hanya diperbarui incremental.
+    definisi = _definisi_indeks(filename)
+    if definisi is None:
+        return None
+    entry = _entri_cache(filename)
+    if entry is None:
+        return None
+    if not _entri_cache_terindeks_dari(entry, filename):
+        return None
+    return entry
+
+def _entri_cache_terindeks_dari(entry, filename):
+    # Membangun indeks untuk entri cache jika belum ada. False jika tabel tanpa definisi.
+    definisi = _definisi_indeks(filename)
+    if definisi is None:
+        return False
+    if 'indeks' not in entry:
+        # Dibangun di bawah kunci tabel dalam proses, lalu dipasang sekaligus: thread
+        # lain tidak pernah melihat indeks setengah jadi atau baris yang terlewat.
+        with _kunci_proses(filename):
+            if 'indeks' not in entry:
+                kolom_pk, kolom_sek = definisi
+                baru = {'indeks': {'kolom_pk': kolom_pk, 'pk': {}, 'sek': {k: {} for k in kolom_sek}}}
+                for row in entry['rows']:
+                    _indeks_tambah(baru, row)
+                entry['indeks'] = baru['indeks']
+    return True
+
+def cari_berdasarkan_id(filename, id_value):
+    # Mencari satu baris berdasarkan kunci primer tabel dalam O(1).
+    # Mengembalikan dict baris (dipakai bersama dengan cache) atau None.
+    entry = _entri_cache_terindeks(filename)
+    if entry is None:
+        return None
+    return entry['indeks']['pk'].get(id_value)
+
+def cari_semua(filename, kolom, value):
+    # Mencari semua baris dengan nilai tertentu pada kolom berindeks sekunder.
+    # Contoh: cari_semua(HEALTH_FILE, 'ternak_id', 'S005').
+    kunci = _kunci_cache(filename)
+    if kunci not in _TABLE_CACHE and kunci not in _OFFSET_MMAP:
+        # Lookup pertama pada tabel yang belum dimuat: cari langsung via mmap, lebih
+        # murah daripada mem-parsing seluruh tabel untuk satu pencarian. Lookup
+        # berikutnya membangun indeks hash (O(1) per lookup setelahnya).
+        hasil = cari_mmap(filename, kolom, value)
+        if hasil is not None:
+            return hasil
+    entry = _entri_cache_terindeks(filename)
+    if entry is None:
+        return []
+    isi = entry['indeks']['sek'].get(kolom)
+    if isi is None:
+        # Kolom tanpa indeks: kembali ke linear search biasa
+        return [row for row in entry['rows'] if row.get(kolom) == value]
+    return list(isi.get(value, []))
+
+# ---------- ALOKATOR ID ----------
+
+# State alokator per (file, prefix):
+#   'maks'   -> angka ID terbesar yang pernah terlihat/diberikan (tidak pernah turun,
+#               jadi ID ternak yang sudah dihapus tidak dipakai ulang).
+#   'offset' -> ukuran file (byte) yang sudah dipindai; baris setelahnya adalah ekor baru.
+#   'ino'    -> inode file saat dipindai, untuk mendeteksi file yang diganti.
+#   'kolom'  -> posisi kolom ID di dalam header.
+# State juga disimpan di file pendamping (contoh: feeding_log.csv.id.json),
+# sehingga proses baru (misal perintah CLI) cukup membaca ekor file sejak
+# pemindaian terakhir, bukan memindai seluruh log dari awal.
+_ID_ALLOCATOR = {}
+# (ino, offset) state yang terakhir disimpan ke file pendamping, per (file, prefix)
+_ID_TERSIMPAN = {}
+ID_STATE_SUFFIX = '.id.json'
+# State disimpan ulang setelah ekor sebesar ini (byte) dibaca
+BATAS_SIMPAN_STATE_ID = 64 * 1024
+
+def _muat_state_id(filename, prefix):
+    try:
+        with open(filename + ID_STATE_SUFFIX, mode='r', encoding='utf-8') as file:
+            state = json.load(file).get(prefix)
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not isinstance(state, dict) or not {'maks', 'offset', 'ino', 'kolom'} <= set(state):
+        return None
+    return state
+
+def _simpan_state_id(filename, prefix, state):
+    try:
+        with open(filename + ID_STATE_SUFFIX, mode='r', encoding='utf-8') as file:
+            semua = json.load(file)
+    except (OSError, ValueError):
+        semua = {}
+    if not isinstance(semua, dict):
+        semua = {}
+    semua[prefix] = state
+    _tulis_json_atomik(filename + ID_STATE_SUFFIX, semua, filename)
+
+def _angka_id(value, prefix):
+    # Mengambil angka dari ID (contoh: 'S012' -> 12, 'S1000' -> 1000).
+    # Mengembalikan None jika format ID tidak sesuai prefix.
+    if not value or not value.startswith(prefix):
+        return None
+    angka = value[len(prefix):]
+    return int(angka) if angka.isdigit() else None
+
+def _nilai_kolom_id(filename, id_column):
+    # Semua nilai kolom ID: dari cache jika sudah dimuat, selain itu proyeksi satu
+    # kolom lewat mmap (tanpa membuat dict per baris). Journal tidak mengubah ID,
+    # jadi file CSV mentah sudah cukup untuk mencari angka maksimum.
+    entry = _entri_cache_valid(filename)
+    if entry is None and not _pakai_sqlite(filename) and os.path.exists(filename):
+        try:
+            with kunci_tabel(filename, eksklusif=False), PembacaMmap(filename) as pembaca:
+                return list(pembaca.nilai_kolom(id_column))
+        except (OSError, ValueError, KeyError, UnicodeDecodeError, csv.Error):
+            pass
+    return [row.get(id_column) for row in read_csv(filename)]
+
+def _pindai_penuh_id(state, prefix, filename, id_column):
+    # Memindai seluruh kolom ID sekali untuk menemukan angka maksimum yang sebenarnya.
+    # ID di partisi arsip tidak ada lagi di file aktif, tetapi tidak boleh dipakai ulang
+    maks = max(state['maks'], _maks_id_arsip(filename, prefix))
+    for nilai in _nilai_kolom_id(filename, id_column):
+        angka = _angka_id(nilai, prefix)
+        if angka is not None and angka > maks:
+            maks = angka
+    tanda = _tanda_file(filename)
+    state['maks'] = maks
+    state['ino'] = tanda[0] if tanda else None
+    state['offset'] = tanda[2] if tanda else 0
+    state['kolom'] = None
+    try:
+        with open(filename, mode='r', newline='', encoding='utf-8') as file:
+            header = next(csv.reader(file), [])
+        state['kolom'] = header.index(id_column)
+    except (OSError, ValueError):
+        pass
+
+def _pindai_ekor_id(state, prefix, filename, ukuran):
+    # Membaca hanya byte baru di ekor file (setelah 'offset') dan memperbarui 'maks'.
+    # Mengembalikan False jika offset lama tidak jatuh di batas baris (file ditulis ulang).
+    with open(filename, mode='rb') as file:
+        if state['offset'] > 0:
+            file.seek(state['offset'] - 1)
+            if file.read(1) != b'\n':
+                return False
+        ekor = file.read(ukuran - state['offset'])
+    # Hanya proses sampai baris lengkap terakhir; sisa baris yang belum selesai
+    # ditulis proses lain akan dibaca pada panggilan berikutnya.
+    batas = ekor.rfind(b'\n') + 1
+    kolom = state['kolom']
+    for row in csv.reader(ekor[:batas].decode('utf-8').splitlines()):
+        if kolom is not None and kolom < len(row):
+            angka = _angka_id(row[kolom], prefix)
+            if angka is not None and angka > state['maks']:
+                state['maks'] = angka
+    state['offset'] += batas
+    return True
+
+def _state_alokator_id(prefix, filename, id_column):
+    # Mengembalikan state alokator yang sudah sinkron dengan isi file saat ini.
+    # Dipanggil di dalam kunci tabel (lihat _reservasi_id).
+    key = (_kunci_cache(filename), prefix)
+    tanda = _tanda_file(filename)
+    state = _ID_ALLOCATOR.get(key)
+    if state is None:
+        state = _muat_state_id(filename, prefix)
+        if state is not None:
+            _ID_TERSIMPAN[key] = (state['ino'], state['offset'])
+        else:
+            state = {'maks': 0, 'offset': 0, 'ino': None, 'kolom': None}
+            _pindai_penuh_id(state, prefix, filename, id_column)
+        _ID_ALLOCATOR[key] = state
+    if tanda is None:
+        state['offset'] = 0
+    elif tanda[0] != state['ino'] or tanda[2] < state['offset']:
+        # File diganti atau dipotong: pindai ulang (maks lama tetap dipertahankan)
+        _pindai_penuh_id(state, prefix, filename, id_column)
+    elif tanda[2] > state['offset']:
+        try:
+            ok = _pindai_ekor_id(state, prefix, filename, tanda[2])
+        except (OSError, UnicodeDecodeError, csv.Error):
+            ok = False
+        if not ok:
+            _pindai_penuh_id(state, prefix, filename, id_column)
+    tersimpan = _ID_TERSIMPAN.get(key)
+    if tanda is not None and (tersimpan is None or tersimpan[0] != state['ino']
+                              or abs(state['offset'] - tersimpan[1]) >= BATAS_SIMPAN_STATE_ID):
+        _simpan_state_id(filename, prefix, state)
+        _ID_TERSIMPAN[key] = (state['ino'], state['offset'])
+    return state
+
+def _sinkron_alokator_setelah_tulis(filename, data, headers):
+    # Dipanggil setelah write_csv_overwrite: file ditulis ulang di tempat, jadi
+    # offset lama tidak berlaku. Karena seluruh data sudah ada di tangan,
+    # 'maks' diperbarui langsung tanpa membaca file lagi.
+    tanda = _tanda_file(filename)
+    kunci = _kunci_cache(filename)
+    for key, state in _ID_ALLOCATOR.items():
+        # Kunci alokator SQLite berbentuk lain ('sqlite', db, tabel, prefix): lewati
+        if len(key) != 2 or key[0] != kunci or tanda is None:
+            continue
+        prefix = key[1]
+        kolom = state['kolom']
+        if kolom is not None and kolom < len(headers):
+            id_column = headers[kolom]
+            for row in data:
+                angka = _angka_id(str(row.get(id_column, '')), prefix)
+                if angka is not None and angka > state['maks']:
+                    state['maks'] = angka
+        state['ino'] = tanda[0]
+        state['offset'] = tanda[2]
+
+# ---------- FUNGSI HELPER UTILITAS ----------
+
+def clear_screen():
+    # Membersihkan layar terminal dengan kode ANSI (tanpa menjalankan proses shell).
+    # Tidak melakukan apa-apa jika output bukan terminal (misal dialihkan ke file).
+    if not sys.stdout.isatty():
+        return
+    if os.name == 'nt' and 'WT_SESSION' not in os.environ:
+        # Konsol Windows lama belum tentu mendukung kode ANSI
+        os.system('cls')
+        return
+    sys.stdout.write("\033[H\033[2J\033[3J")
+    sys.stdout.flush()
+
+def get_current_date():
+    # Mengembalikan tanggal hari ini dalam format YYYY-MM-DD.
+    return datetime.date.today().strftime('%Y-%m-%d')
+
+def generate_id(prefix, filename, id_column):
+    # Membuat ID unik baru berdasarkan data yang ada (contoh: S001 -> S002).
+    # Angka maksimum dicari sekali per sesi (lihat ALOKATOR ID), setelah itu
+    # hanya bagian ekor file yang baru ditambahkan yang dibaca.
+    angka = _reservasi_id(prefix, filename, id_column, 1)
+    # zfill(3) untuk padding nol (001, 002, ... 010, ... 100, ... 1000)
+    return f"{prefix}{str(angka).zfill(3)}"
+
+def _reservasi_id(prefix, filename, id_column, jumlah):
+    # Memesan 'jumlah' angka ID berurutan sekaligus; mengembalikan angka pertama.
+    with kunci_tabel(filename):
+        if _pakai_sqlite(filename):
+            state = _state_alokator_sqlite(prefix, filename, id_column)
+        else:
+            state = _state_alokator_id(prefix, filename, id_column)
+        awal = state['maks'] + 1
+        state['maks'] += jumlah
+    return awal
+
+
+def print_table(data_list, headers):
+    # Mencetak list of dictionaries sebagai tabel yang rapi.
+    if not data_list:
+        print("\n[ Tidak ada data untuk ditampilkan ]")
+        return
+    
+    # Tentukan lebar kolom (bisa di-improve, tapi ini cara sederhana)
+    col_widths = {header: len(header) for header in headers}
+    for row in data_list:
+        for header in headers:
+            col_widths[header] = max(col_widths[header], len(str(row.get(header, ''))))
+            
+    # Cetak Header
+    header_str = " | ".join(header.ljust(col_widths[header]) for header in headers)
+    print("\n" + header_str)
+    print("-" * len(header_str))
+    
+    # Cetak Data
+    for row in data_list:
+        row_str = " | ".join(str(row.get(header, '')).ljust(col_widths[header]) for header in headers)
+        print(row_str)
+
+# ---------- TAMPILAN TABEL STREAMING & HALAMAN ----------
+
+# Lebar kolom dihitung dari sampel baris pertama (bukan seluruh tabel);
+# nilai yang lebih panjang dari lebar kolom dipotong dan diberi tanda '~'.
+UKURAN_SAMPEL_LEBAR = 200
+BARIS_PER_HALAMAN = 20
+# Setiap LANGKAH_TITIK_CSV baris, posisi byte-nya dicatat agar loncat halaman
+# tidak perlu membaca ulang dari awal file.
+LANGKAH_TITIK_CSV = 1000
+
+def _hitung_lebar(rows, headers):
+    lebar = {header: len(header) for header in headers}
+    for row in rows:
+        for header in headers:
+            lebar[header] = max(lebar[header], len(str(row.get(header, ''))))
+    return lebar
+
+def _format_baris(row, headers, lebar):
+    sel = []
+    for header in headers:
+        value = row.get(header, '')
+        teks = '' if value is None else str(value)
+        if len(teks) > lebar[header]:
+            teks = teks[:max(lebar[header] - 1, 0)] + '~'
+        sel.append(teks.ljust(lebar[header]))
+    return " | ".join(sel)
+
+def print_table_stream(rows, headers, lebar_kolom=None, sampel=UKURAN_SAMPEL_LEBAR, out=None, ukuran_chunk=500):
+    # Mencetak tabel dari iterator baris apa pun tanpa memuat seluruhnya ke memori.
+    # Lebar kolom diambil dari lebar_kolom (tetap) atau dari 'sampel' baris pertama.
+    # Output ditulis per blok 'ukuran_chunk' baris. Mengembalikan (jumlah baris, lebar).
+    out = out or sys.stdout
+    rows = iter(rows)
+    if lebar_kolom is None:
+        contoh = list(itertools.islice(rows, sampel))
+        lebar = _hitung_lebar(contoh, headers)
+        rows = itertools.chain(contoh, rows)
+    else:
+        lebar = {header: max(len(header), lebar_kolom.get(header, 0)) for header in headers}
+
+    header_str = " | ".join(header.ljust(lebar[header]) for header in headers)
+    blok = ["", header_str, "-" * len(header_str)]
+    jumlah = 0
+    for row in rows:
+        blok.append(_format_baris(row, headers, lebar))
+        jumlah += 1
+        if len(blok) >= ukuran_chunk:
+            out.write("\n".join(blok) + "\n")
+            blok = []
+    if jumlah == 0:
+        out.write("\n[ Tidak ada data untuk ditampilkan ]\n")
+        return 0, lebar
+    if blok:
+        out.write("\n".join(blok) + "\n")
+    out.flush()
+    return jumlah, lebar
+
+def _baca_rekaman_csv(file):
+    # Membaca satu rekaman CSV dari file biner (bisa lebih dari satu baris fisik
+    # jika ada teks berkutip yang berisi enter). None jika sudah di akhir file.
+    line = file.readline()
+    if not line:
+        return None
+    while line.count(b'"') % 2 == 1:
+        lanjut = file.readline()
+        if not lanjut:
+            break
+        line += lanjut
+    return line
+
+def sumber_csv(filename):
+    # Sumber halaman yang membaca langsung dari file CSV: hanya baris yang
+    # dibutuhkan halaman itu yang di-parse. Mengembalikan fungsi ambil(mulai, jumlah).
+    state = {'tanda': None, 'headers': [], 'titik': []}
+
+    def ambil(mulai, jumlah):
+        tanda = _tanda_file(filename)
+        if tanda is None:
+            return []
+        lama = state['tanda']
+        # File diganti/dipotong: posisi byte lama tidak berlaku lagi
+        if lama is None or lama[0] != tanda[0] or tanda[2] < lama[2]:
+            state['titik'] = []
+        state['tanda'] = tanda
+        titik = state['titik']
+        hasil = []
+        with open(filename, mode='rb') as file:
+            if not titik:
+                header = _baca_rekaman_csv(file) or b''
+                state['headers'] = next(csv.reader([header.decode('utf-8')]), [])
+                titik.append(file.tell())
+            j = min(mulai // LANGKAH_TITIK_CSV, len(titik) - 1)
+            file.seek(titik[j])
+            nomor = j * LANGKAH_TITIK_CSV
+            while len(hasil) < jumlah:
+                rekaman = _baca_rekaman_csv(file)
+                if rekaman is None:
+                    break
+                if nomor >= mulai:
+                    nilai = next(csv.reader([rekaman.decode('utf-8')]), [])
+                    hasil.append(dict(zip(state['headers'], nilai)))
+                nomor += 1
+                if nomor % LANGKAH_TITIK_CSV == 0 and nomor // LANGKAH_TITIK_CSV == len(titik):
+                    titik.append(file.tell())
+        return hasil
+
+    return ambil
+
+def sumber_tabel(filename):
+    # Memilih sumber halaman terbaik untuk sebuah tabel:
+    #   - SQLite: LIMIT/OFFSET langsung di database,
+    #   - tabel yang sudah ada di cache atau punya journal: dari memori,
+    #   - selain itu: streaming dari file CSV tanpa memuat seluruh tabel.
+    if _pakai_sqlite(filename):
+        _, headers, _, sql = _sql_tabel(filename)
+
+        def ambil(mulai, jumlah):
+            with _SQLITE_GUARD:
+                try:
+                    cursor = _koneksi_sqlite(filename).execute(sql['select'] + " LIMIT ? OFFSET ?", [jumlah, mulai])
+                    return [dict(zip(headers, baris)) for baris in cursor.fetchall()]
+                except sqlite3.Error as e:
+                    print(f"ERROR: Terjadi kesalahan saat membaca {filename} dari SQLite. {e}")
+                    return []
+        return ambil
+    if _entri_cache_valid(filename) is not None or os.path.exists(filename + JOURNAL_SUFFIX):
+        return lambda mulai, jumlah: read_csv(filename)[mulai:mulai + jumlah]
+    return sumber_csv(filename)
+
+def tampilkan_berhalaman(ambil, headers, per_halaman=BARIS_PER_HALAMAN, lebar_kolom=None):
+    # Menampilkan tabel per halaman: [n] berikutnya, [p] sebelumnya,
+    # angka untuk loncat ke halaman tertentu, [q] selesai.
+    # Hanya satu halaman (+1 baris untuk cek halaman berikutnya) yang dibaca setiap kali.
+    halaman = 0
+    terakhir = 0
+    lebar = lebar_kolom
+    while True:
+        baris = ambil(halaman * per_halaman, per_halaman + 1)
+        if not baris and halaman > 0:
+            print(f"\n[ Halaman {halaman + 1} tidak ada ]")
+            halaman = terakhir if halaman != terakhir else 0
+            continue
+        terakhir = halaman
+        ada_berikut = len(baris) > per_halaman
+        baris = baris[:per_halaman]
+        if lebar is None and baris:
+            lebar = _hitung_lebar(baris, headers)
+        print_table_stream(baris, headers, lebar_kolom=lebar)
+        if not ada_berikut and halaman == 0:
+            return
+        print(f"\nHalaman {halaman + 1}" + ("" if ada_berikut else " (terakhir)"))
+        perintah = input("[n] berikutnya, [p] sebelumnya, nomor halaman, [q] selesai: ").strip().lower()
+        if perintah in ('q', ''):
+            return
+        if perintah == 'n' and ada_berikut:
+            halaman += 1
+        elif perintah == 'p' and halaman > 0:
+            halaman -= 1
+        elif perintah.isdigit() and int(perintah) > 0:
+            halaman = int(perintah) - 1
+
+# ---------- INDEKS RENTANG TANGGAL (LOG) ----------
+
+# Log kesehatan dan pakan ditulis berurutan menurut tanggal. Indeks jarang
+# (sparse) ini hanya mencatat posisi byte setiap kali nilai 'tanggal' berganti
+# (satu "run"), jadi ukurannya sebanding dengan jumlah hari, bukan jumlah baris.
+# Query rentang tanggal cukup loncat (seek) ke run yang cocok lalu mem-parsing
+# baris di dalamnya saja. Jika urutan tanggal pernah mundur (misal impor data
+# lama), run tetap dipakai tetapi dipilih satu per satu tanpa binary search.
+# Indeks disimpan di file pendamping (contoh: feeding_log.csv.tanggal.json)
+# dan diperpanjang dari ekor file saat log bertambah.
+INDEKS_TANGGAL_SUFFIX = '.tanggal.json'
+KOLOM_INDEKS_TANGGAL = 'tanggal'
+
+# Indeks yang sudah dimuat di proses ini: path absolut -> dict indeks
+_INDEKS_TANGGAL = {}
+
+def _indeks_tanggal_kosong(ino):
+    # 'tanggal'/'posisi': awal setiap run; 'akhir': byte terakhir yang sudah diindeks.
+    return {'ino': ino, 'akhir': 0, 'kolom': None, 'headers': [],
+            'tanggal': [], 'posisi': [], 'terurut': True}
+
+def _perpanjang_indeks_tanggal(idx, filename):
+    # Membaca baris setelah idx['akhir'] dan mencatat run tanggal yang baru.
+    # Mengembalikan True jika indeks berubah.
+    berubah = False
+    with open(filename, mode='rb') as file:
+        if idx['akhir'] > 0:
+            file.seek(idx['akhir'] - 1)
+            if file.read(1) != b'\n':
+                return None  # bukan batas baris: file sudah diganti
+        else:
+            header = _baca_rekaman_csv(file) or b''
+            idx['headers'] = next(csv.reader([header.decode('utf-8')]), [])
+            if KOLOM_INDEKS_TANGGAL in idx['headers']:
+                idx['kolom'] = idx['headers'].index(KOLOM_INDEKS_TANGGAL)
+            idx['akhir'] = file.tell()
+            berubah = True
+        if idx['kolom'] is None:
+            return berubah
+        kolom = idx['kolom']
+        daftar_tanggal, daftar_posisi = idx['tanggal'], idx['posisi']
+        while True:
+            posisi = file.tell()
+            rekaman = _baca_rekaman_csv(file)
+            if rekaman is None or not rekaman.endswith(b'\n'):
+                break
+            nilai = next(csv.reader([rekaman.decode('utf-8')]), [])
+            tanggal = nilai[kolom] if kolom < len(nilai) else ''
+            if not daftar_tanggal or tanggal != daftar_tanggal[-1]:
+                if daftar_tanggal and tanggal < daftar_tanggal[-1]:
+                    idx['terurut'] = False
+                daftar_tanggal.append(tanggal)
+                daftar_posisi.append(posisi)
+            idx['akhir'] = file.tell()
+            berubah = True
+    return berubah
+
+def _indeks_tanggal(filename):
+    # Mengembalikan indeks tanggal yang sesuai dengan isi file saat ini
+    # (dipanggil di dalam kunci tabel). None jika file tidak ada.
+    tanda = _tanda_file(filename)
+    if tanda is None:
+        return None
+    kunci = _kunci_cache(filename)
+    idx = _INDEKS_TANGGAL.get(kunci)
+    if idx is None:
+        try:
+            with open(filename + INDEKS_TANGGAL_SUFFIX, mode='r', encoding='utf-8') as file:
+                idx = json.load(file)
+        except (OSError, ValueError):
+            idx = None
+    if idx is None or idx.get('ino') != tanda[0] or tanda[2] < idx.get('akhir', 0):
+        idx = _indeks_tanggal_kosong(tanda[0])
+    berubah = _perpanjang_indeks_tanggal(idx, filename)
+    if berubah is None:
+        idx = _indeks_tanggal_kosong(tanda[0])
+        berubah = _perpanjang_indeks_tanggal(idx, filename)
+    _INDEKS_TANGGAL[kunci] = idx
+    if berubah:
+        _tulis_json_atomik(filename + INDEKS_TANGGAL_SUFFIX, idx, filename)
+    return idx
+
+def _run_dalam_rentang(idx, awal, akhir):
+    # Daftar (byte awal, byte akhir) wilayah file yang tanggalnya di dalam rentang.
+    # Run yang bersebelahan digabung menjadi satu wilayah.
+    daftar_tanggal, daftar_posisi = idx['tanggal'], idx['posisi']
+    batas = daftar_posisi[1:] + [idx['akhir']]
+    if idx['terurut']:
+        i = bisect.bisect_left(daftar_tanggal, awal)
+        j = bisect.bisect_right(daftar_tanggal, akhir)
+        return [(daftar_posisi[i], batas[j - 1])] if i < j else []
+    wilayah = []
+    for tanggal, mulai, selesai in zip(daftar_tanggal, daftar_posisi, batas):
+        if awal <= tanggal <= akhir:
+            if wilayah and wilayah[-1][1] == mulai:
+                wilayah[-1] = (wilayah[-1][0], selesai)
+            else:
+                wilayah.append((mulai, selesai))
+    return wilayah
+
+def _baca_wilayah_csv(file, mulai, selesai):
+    # Membaca baris-baris CSV di antara dua posisi byte, satu per satu.
+    file.seek(mulai)
+    baris = iter(lambda: file.readline() if file.tell() < selesai else b'', b'')
+    return csv.reader(line.decode('utf-8') for line in baris)
+
+def cari_rentang_tanggal(filename, awal=None, akhir=None, saring=None):
+    # Mengambil baris log dengan awal <= tanggal <= akhir (format YYYY-MM-DD,
+    # None = tanpa batas), opsional disaring lagi dengan {kolom: nilai}.
+    # CSV: hanya wilayah file yang cocok menurut indeks tanggal yang dibaca.
+    # SQLite: query WHERE tanggal BETWEEN memakai indeks kolom tanggal.
+    awal = awal or ''
+    akhir = akhir or '\uffff'
+    saring = saring or {}
+    if _pakai_sqlite(filename):
+        _, headers, _, sql = _sql_tabel(filename)
+        kolom = [k for k in saring if k in headers]
+        query = sql['select'].replace(' ORDER BY', f" WHERE {KOLOM_INDEKS_TANGGAL} BETWEEN ? AND ?"
+                                      + ''.join(f" AND {k} = ?" for k in kolom) + ' ORDER BY')
+        with _SQLITE_GUARD:
+            try:
+                cursor = _koneksi_sqlite(filename).execute(query, [awal, akhir] + [saring[k] for k in kolom])
+                return [dict(zip(headers, baris)) for baris in cursor.fetchall()]
+            except sqlite3.Error as e:
+                print(f"ERROR: Terjadi kesalahan saat membaca {filename} dari SQLite. {e}")
+                return []
+
+    def cocok(row):
+        return (awal <= row.get(KOLOM_INDEKS_TANGGAL, '') <= akhir
+                and all(row.get(k) == v for k, v in saring.items()))
+
+    # Partisi arsip hanya dibuka jika rentang bulannya beririsan dengan [awal, akhir]
+    arsip = [row for row in baris_arsip(filename, awal, akhir) if cocok(row)]
+    hasil = []
+    try:
+        with kunci_tabel(filename, eksklusif=False):
+            idx = _indeks_tanggal(filename)
+            if idx is None or idx['kolom'] is None:
+                return arsip + [row for row in read_csv(filename) if cocok(row)]
+            headers = idx['headers']
+            with open(filename, mode='rb') as file:
+                for mulai, selesai in _run_dalam_rentang(idx, awal, akhir):
+                    for nilai in _baca_wilayah_csv(file, mulai, selesai):
+                        row = dict(zip(headers, nilai))
+                        if all(row.get(k) == v for k, v in saring.items()):
+                            hasil.append(row)
+            if os.path.exists(filename + JOURNAL_SUFFIX):
+                # Perubahan yang belum dikompaksi: terapkan journal, lalu saring ulang
+                # (baris yang tanggalnya diubah bisa masuk atau keluar dari rentang).
+                hasil = [row for row in _terapkan_journal(filename, hasil) if cocok(row)]
+    except FileNotFoundError:
+        print(f"ERROR: File {filename} tidak ditemukan.")
+    except (OSError, csv.Error, UnicodeDecodeError) as e:
+        print(f"ERROR: Terjadi kesalahan saat membaca {filename}. {e}")
+    return arsip + hasil
+
+def get_float_input(prompt):
+    # Memvalidasi input agar pasti float.
+    while True:
+        try:
+            value = float(input(prompt))
+            return value
+        except ValueError:
+            print("Input tidak valid. Masukkan angka (contoh: 150.5)")
+
+# ---------- PARTISI LOG BULANAN (ARSIP) ----------
+
+# feeding_log.csv dan health_records.csv hanya menyimpan bulan berjalan.
+# Baris bulan-bulan sebelumnya dipindahkan (rotasi) ke satu file per bulan:
+#   arsip/feeding_log.2025-11.csv.gz
+# dan dicatat di manifest (contoh: feeding_log.csv.manifest.json) beserta jumlah
+# baris, rentang ID dan rentang tanggal tiap partisi, serta daftar nilai kolom di
+# KOLOM_NILAI_ARSIP yang ada di arsip (contoh: semua ternak_id yang punya catatan
+# kesehatan terarsip), agar cek keberadaan tidak perlu membuka partisi. read_csv, generate_id dan
+# indeks hash hanya menyentuh file aktif; query rentang tanggal membuka partisi
+# arsip yang rentangnya beririsan saja. Partisi arsip bersifat baca-saja.
+# Rotasi hanya berjalan di jalur tulis: saat menu interaktif atau server API
+# dimulai, sebelum perintah CLI yang mencatat log (pakan log, kesehatan log, impor),
+# atau manual dengan perintah 'rotasi-log'. Perintah baca tidak pernah memindahkan
+# data. Cek awalnya murah (baris pertama file aktif). Tidak berlaku untuk backend SQLite.
+
+PARTISI_AKTIF = os.environ.get('SIMTERNAK_PARTISI', '1') != '0'
+ARSIP_GZIP = os.environ.get('SIMTERNAK_ARSIP_GZIP', '1') != '0'
+ARSIP_FOLDER = 'arsip'
+MANIFEST_SUFFIX = '.manifest.json'
+# file log -> (prefix ID, kolom ID, headers)
+TABEL_PARTISI = {
+    FEEDING_FILE: ('F', 'log_id', HEADERS_FEEDING),
+    HEALTH_FILE: ('H', 'record_id', HEADERS_HEALTH),
+}
+# file log -> kolom yang himpunan nilainya di arsip dicatat di manifest ('nilai')
+KOLOM_NILAI_ARSIP = {
+    HEALTH_FILE: ['ternak_id'],
+}
+
+# Cache manifest per proses: kunci -> (mtime_ns, isi)
+_MANIFEST = {}
+# Partisi yang sudah dibuka, terindeks per kolom: (path, kolom) -> (tanda file, {nilai: [baris]}).
+# Partisi hanya berubah saat rotasi menggabungkan baris ke bulan yang sama (file
+# diganti), jadi tanda file cukup untuk tahu kapan isinya harus dibaca ulang.
+# Dibatasi BATAS_CACHE_PARTISI partisi (LRU) agar memori tidak tumbuh tanpa batas.
+BATAS_CACHE_PARTISI = 24
+_PARTISI_TERINDEKS = collections.OrderedDict()
+_KUNCI_PARTISI = threading.Lock()
+# (kunci, kolom) -> (list 'nilai' di manifest yang di-cache, frozenset-nya)
+_NILAI_ARSIP = {}
+
+def baca_manifest(filename):
+    # Mengembalikan manifest partisi sebuah log ({'partisi': [...]}, urut bulan).
+    path = filename + MANIFEST_SUFFIX
+    kunci = _kunci_cache(filename)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        _MANIFEST.pop(kunci, None)
+        return {'partisi': []}
+    cached = _MANIFEST.get(kunci)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, mode='r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        manifest = None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('partisi'), list):
+        print(f"Warning: Manifest {path} rusak, partisi arsip diabaikan.")
+        manifest = {'partisi': []}
+    _MANIFEST[kunci] = (mtime, manifest)
+    return manifest
+
+def _path_partisi(filename, relatif):
+    return os.path.join(os.path.dirname(os.path.abspath(filename)), relatif)
+
+def _baca_partisi(filename, info):
+    path = _path_partisi(filename, info['file'])
+    pembuka = gzip.open if path.endswith('.gz') else open
+    with pembuka(path, mode='rt', newline='', encoding='utf-8') as file:
+        yield from csv.DictReader(file)
+
+def _baca_arsip(filename, awal=None, akhir=None):
+    # Baris dari partisi arsip yang rentang tanggalnya beririsan dengan [awal, akhir].
+    for info in baca_manifest(filename)['partisi']:
+        if (akhir and info['tgl_awal'] > akhir) or (awal and info['tgl_akhir'] < awal):
+            continue
+        try:
+            yield from _baca_partisi(filename, info)
+        except (OSError, EOFError, csv.Error, UnicodeDecodeError) as e:
+            print(f"ERROR: Partisi arsip {info['file']} tidak dapat dibaca. {e}")
+
+def baris_arsip(filename, awal=None, akhir=None):
+    # Seperti _baca_arsip, tetapi kosong untuk backend SQLite (semua baris ada di database).
+    if _pakai_sqlite(filename) or os.path.basename(filename) not in TABEL_PARTISI:
+        return iter(())
+    return _baca_arsip(filename, awal, akhir)
+
+def _indeks_partisi(filename, info, kolom):
+    # {nilai kolom: [baris]} untuk satu partisi; dekompresi hanya sekali per isi file.
+    path = _path_partisi(filename, info['file'])
+    tanda = _tanda_file(path)
+    kunci = (path, kolom)
+    with _KUNCI_PARTISI:
+        cached = _PARTISI_TERINDEKS.get(kunci)
+        if cached is not None and cached[0] == tanda:
+            _PARTISI_TERINDEKS.move_to_end(kunci)
+            return cached[1]
+    indeks = {}
+    for row in _baca_partisi(filename, info):
+        indeks.setdefault(row.get(kolom), []).append(row)
+    with _KUNCI_PARTISI:
+        _PARTISI_TERINDEKS[kunci] = (tanda, indeks)
+        _PARTISI_TERINDEKS.move_to_end(kunci)
+        while len(_PARTISI_TERINDEKS) > BATAS_CACHE_PARTISI:
+            _PARTISI_TERINDEKS.popitem(last=False)
+    return indeks
+
+def cari_arsip(filename, kolom, value):
+    # Semua baris arsip dengan kolom == value (salinan, urut bulan). Lookup berulang
+    # (misal riwayat satu ternak) tidak mendekompresi ulang partisi yang sama.
+    if _pakai_sqlite(filename) or os.path.basename(filename) not in TABEL_PARTISI:
+        return []
+    hasil = []
+    for info in baca_manifest(filename)['partisi']:
+        try:
+            hasil.extend(dict(row) for row in _indeks_partisi(filename, info, kolom).get(value, ()))
+        except (OSError, EOFError, csv.Error, UnicodeDecodeError) as e:
+            print(f"ERROR: Partisi arsip {info['file']} tidak dapat dibaca. {e}")
+    return hasil
+
+def _daftar_nilai_arsip(filename, manifest, kolom):
+    # Daftar nilai 'kolom' di semua partisi: dari manifest, atau (manifest yang dibuat
+    # sebelum nilai dicatat) dihitung dengan membaca partisinya.
+    daftar = manifest.get('nilai', {}).get(kolom)
+    if daftar is None:
+        daftar = sorted({row.get(kolom) or '' for row in _baca_arsip(filename)})
+    return daftar
+
+def nilai_arsip(filename, kolom):
+    # Himpunan nilai 'kolom' di arsip (contoh: ternak_id yang punya catatan kesehatan
+    # terarsip), tanpa membuka partisi. Manifest lama dilengkapi sekali lalu disimpan.
+    if _pakai_sqlite(filename) or kolom not in KOLOM_NILAI_ARSIP.get(os.path.basename(filename), ()):
+        return frozenset()
+    manifest = baca_manifest(filename)
+    if manifest['partisi'] and kolom not in manifest.get('nilai', {}):
+        with kunci_tabel(filename):
+            manifest = baca_manifest(filename)
+            if kolom not in manifest.get('nilai', {}):
+                nilai = dict(manifest.get('nilai', {}), **{kolom: _daftar_nilai_arsip(filename, manifest, kolom)})
+                _tulis_json_atomik(filename + MANIFEST_SUFFIX, dict(manifest, nilai=nilai), filename)
+                manifest = baca_manifest(filename)
+    daftar = manifest.get('nilai', {}).get(kolom, [])
+    kunci = (_kunci_cache(filename), kolom)
+    cached = _NILAI_ARSIP.get(kunci)
+    if cached is None or cached[0] is not daftar:
+        cached = (daftar, frozenset(daftar))
+        _NILAI_ARSIP[kunci] = cached
+    return cached[1]
+
+def _maks_id_arsip(filename, prefix):
+    # Angka ID terbesar di semua partisi arsip (0 jika tidak ada).
+    if os.path.basename(filename) not in TABEL_PARTISI:
+        return 0
+    return max((_angka_id(info.get('id_akhir'), prefix) or 0
+                for info in baca_manifest(filename)['partisi']), default=0)
+
+def _tulis_partisi(path, rows, headers, acuan=None):
+    # Menulis satu partisi secara atomik (gzip jika nama berakhiran .gz).
+    # Mode file mengikuti partisi lama atau file log aktif 'acuan'.
+    fd, path_sementara = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp',
+                                          dir=os.path.dirname(path))
+    try:
+        with open(fd, mode='wb') as mentah:
+            if path.endswith('.gz'):
+                # mtime=0: isi file arsip hanya bergantung pada barisnya
+                with gzip.GzipFile(fileobj=mentah, mode='wb', mtime=0) as gz, \
+                        io.TextIOWrapper(gz, encoding='utf-8', newline='') as teks:
+                    writer = csv.DictWriter(teks, fieldnames=headers, extrasaction='ignore')
+                    writer.writeheader()
+                    writer.writerows(rows)
+            else:
+                with io.TextIOWrapper(mentah, encoding='utf-8', newline='') as teks:
+                    writer = csv.DictWriter(teks, fieldnames=headers, extrasaction='ignore')
+                    writer.writeheader()
+                    writer.writerows(rows)
+        _samakan_mode(path_sementara, path, acuan)
+        os.replace(path_sementara, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(path_sementara)
+        raise
+
+def _info_partisi(bulan, relatif, rows, prefix, id_column, path):
+    ids = sorted((_angka_id(row.get(id_column), prefix) or 0, row.get(id_column, '')) for row in rows)
+    tanggal = [row.get(KOLOM_INDEKS_TANGGAL, '') for row in rows]
+    return {
+        'bulan': bulan,
+        'file': relatif,
+        'baris': len(rows),
+        'id_awal': ids[0][1] if ids else None,
+        'id_akhir': ids[-1][1] if ids else None,
+        'tgl_awal': min(tanggal) if tanggal else None,
+        'tgl_akhir': max(tanggal) if tanggal else None,
+        'gzip': relatif.endswith('.gz'),
+        'byte': os.path.getsize(path),
+    }
+
+def rotasi_log(filename, bulan_aktif=None, kompres=ARSIP_GZIP):
+    # Memindahkan baris dengan bulan < bulan_aktif (YYYY-MM, default bulan ini)
+    # dari file aktif ke partisi arsip per bulan, lalu memperbarui manifest.
+    # Baris untuk bulan yang sudah punya partisi digabung ke partisi itu (ID yang
+    # sama tidak digandakan). Mengembalikan {bulan: jumlah baris dipindahkan}.
+    prefix, id_column, headers = TABEL_PARTISI[os.path.basename(filename)]
+    bulan_aktif = bulan_aktif or get_current_date()[:7]
+    with kunci_tabel(filename):
+        entry = _entri_cache_terindeks(filename)
+        if entry is None:
+            return {}
+        per_bulan = {}
+        tetap = []
+        for row in entry['rows']:
+            bulan = row.get(KOLOM_INDEKS_TANGGAL, '')[:7]
+            if bulan and bulan < bulan_aktif:
+                per_bulan.setdefault(bulan, []).append(row)
+            else:
+                tetap.append(row)
+        if not per_bulan:
+            return {}
+
+        folder = _path_partisi(filename, ARSIP_FOLDER)
+        os.makedirs(folder, exist_ok=True)
+        manifest = baca_manifest(filename)
+        partisi = {info['bulan']: info for info in manifest['partisi']}
+        # Daftar nilai hanya digabung dengan baris yang dipindah. Baris yang menggantikan
+        # versi lamanya di partisi bisa meninggalkan nilai yang tidak terpakai lagi:
+        # daftar boleh berlebih, dipakai sebagai saringan cepat sebelum membuka arsip.
+        nilai = {kolom: set(_daftar_nilai_arsip(filename, manifest, kolom))
+                 for kolom in KOLOM_NILAI_ARSIP.get(os.path.basename(filename), ())}
+        nama_dasar = os.path.splitext(os.path.basename(filename))[0]
+        for bulan, rows in sorted(per_bulan.items()):
+            lama = partisi.get(bulan)
+            if lama is not None:
+                gabung = {row[id_column]: row for row in _baca_partisi(filename, lama)}
+                gabung.update((row[id_column], row) for row in rows)
+                rows = list(gabung.values())
+            relatif = os.path.join(ARSIP_FOLDER, f"{nama_dasar}.{bulan}.csv" + ('.gz' if kompres else ''))
+            path = _path_partisi(filename, relatif)
+            _tulis_partisi(path, rows, headers, filename)
+            if lama is not None and lama['file'] != relatif:
+                with contextlib.suppress(OSError):
+                    os.remove(_path_partisi(filename, lama['file']))
+            partisi[bulan] = _info_partisi(bulan, relatif, rows, prefix, id_column, path)
+            for kolom, himpunan in nilai.items():
+                himpunan.update(row.get(kolom) or '' for row in rows)
+        # Manifest ditulis SEBELUM file aktif dipotong: jika proses mati di antaranya,
+        # baris hanya muncul dua kali (digabung lagi oleh rotasi berikutnya), tidak hilang.
+        _tulis_json_atomik(filename + MANIFEST_SUFFIX,
+                           {'partisi': [partisi[b] for b in sorted(partisi)],
+                            'nilai': {kolom: sorted(himpunan) for kolom, himpunan in nilai.items()}}, filename)
+
+        tanda_lama = _tanda_sebelum_tulis(filename, entry)
+        if not _tulis_file_csv(filename, tetap, headers):
+            return {}
+        _hapus_journal(filename)
+        _simpan_cache(filename, tetap)
+        _sinkron_alokator_setelah_tulis(filename, [], headers)
+        # Isi riwayat tidak berubah (baris hanya pindah tempat): ringkasan tetap dipakai
+        _beritahu_perubahan(filename, tanda_lama, [], [])
+    return {bulan: len(rows) for bulan, rows in per_bulan.items()}
+
+def _perlu_rotasi(filename, bulan_aktif):
+    # Cek murah: baris data pertama file aktif sudah dari bulan yang lewat?
+    try:
+        with open(filename, mode='r', newline='', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            row = next(reader, None)
+    except (OSError, csv.Error, UnicodeDecodeError):
+        return False
+    return row is not None and '' < (row.get(KOLOM_INDEKS_TANGGAL) or '')[:7] < bulan_aktif
+
+def rotasi_log_bila_perlu(bulan_aktif=None, kompres=ARSIP_GZIP, konteks=None):
+    if not PARTISI_AKTIF or STORAGE_BACKEND == 'sqlite':
+        return {}
+    bulan_aktif = bulan_aktif or get_current_date()[:7]
+    hasil = {}
+    for nama in TABEL_PARTISI:
+        filename = _tabel(konteks, nama)
+        if _perlu_rotasi(filename, bulan_aktif):
+            dipindah = rotasi_log(filename, bulan_aktif, kompres)
+            if dipindah:
+                hasil[filename] = dipindah
+                # Ke stderr: stdout perintah CLI berisi data (JSON/CSV)
+                print(f"Arsip {filename}: {sum(dipindah.values())} baris dari "
+                      f"{len(dipindah)} bulan dipindahkan ke folder '{ARSIP_FOLDER}'.", file=sys.stderr)
+    return hasil
+
+# ---------- FUNGSI ALGORITMA (SORTING) ----------
+
+def bubble_sort(data_list, key, reverse=False):
+    # Implementasi Algoritma Bubble Sort untuk daftar ternak.
+    # Dapat mengurutkan berdasarkan 'berat_sekarang' (float) atau 'tgl_lahir' (string).
+    n = len(data_list)
+    sorted_list = list(data_list) 
+    
+    for i in range(n - 1):
+        swapped = False
+        for j in range(0, n - i - 1):
+            try:
+                # Ambil nilai
+                val_a = sorted_list[j][key]
+                val_b = sorted_list[j+1][key]
+                
+                # Konversi jika perlu
+                if key == 'berat_sekarang':
+                    val_a = float(val_a)
+                    val_b = float(val_b)
+                
+                # Tentukan kondisi pembanding
+                condition = (val_a > val_b) if not reverse else (val_a < val_b)
+                
+                if condition:
+                    # Tukar (Swap)
+                    sorted_list[j], sorted_list[j+1] = sorted_list[j+1], sorted_list[j]
+                    swapped = True
+            except (KeyError, ValueError):
+                print(f"Warning: Gagal membandingkan data pada key '{key}'.")
+                continue # Lanjut ke iterasi berikutnya
+                
+        if not swapped:
+            break # Jika tidak ada yang ditukar, list sudah terurut
+            
+    return sorted_list
+
+# Kolom dengan tipe khusus untuk sorting; kolom lain diurutkan sebagai teks,
+# kecuali nilainya angka bulat (contoh kandang_id '9' < '24').
+KOLOM_ANGKA = {'berat_sekarang', 'jumlah_kg', 'berat'}
+KOLOM_TANGGAL = {'tgl_lahir', 'tanggal'}
+
+# Cache permutasi hasil sortir: (path tabel, kunci sortir) -> (versi tabel, urutan indeks)
+_SORT_CACHE = {}
+
+def _dekor_nilai(value, kolom):
+    # Mengubah nilai mentah menjadi kunci pembanding SEKALI per baris.
+    # Mengembalikan None jika nilai tidak dapat diparsing (akan ditaruh di akhir).
+    if value is None:
+        return None
+    if kolom in KOLOM_ANGKA:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    if kolom in KOLOM_TANGGAL:
+        try:
+            return datetime.date.fromisoformat(value).toordinal()
+        except ValueError:
+            return None
+    value = str(value)
+    # Angka bulat diurutkan sebagai angka, teks biasa setelahnya
+    return (0, int(value), '') if value.isdigit() else (1, 0, value)
+
+def urutan_sortir(data_list, kunci):
+    # Menghitung permutasi indeks hasil sortir (stabil, O(n log n) per kunci).
+    # kunci: list of (kolom, reverse), contoh [('kandang_id', False), ('berat_sekarang', True)].
+    # Teknik: dekorasi nilai sekali per kolom, lalu sortir stabil dari kunci
+    # terakhir ke kunci pertama. Nilai yang tidak valid selalu di akhir.
+    urutan = list(range(len(data_list)))
+    for kolom, reverse in reversed(kunci):
+        dekor = [_dekor_nilai(row.get(kolom), kolom) for row in data_list]
+        valid = [i for i in urutan if dekor[i] is not None]
+        tidak_valid = [i for i in urutan if dekor[i] is None]
+        valid.sort(key=dekor.__getitem__, reverse=reverse)
+        urutan = valid + tidak_valid
+    return urutan
+
+def sortir_data(data_list, kunci):
+    # Mengembalikan list baru yang sudah terurut sesuai kunci (lihat urutan_sortir).
+    return [data_list[i] for i in urutan_sortir(data_list, kunci)]
+
+def sortir_tabel(filename, kunci):
+    # Sortir seluruh isi tabel dengan cache permutasi.
+    # Permutasi disimpan per kunci sortir dan dipakai ulang sampai tabel berubah.
+    entry = _entri_cache(filename)
+    if entry is None:
+        return []
+    data, versi = list(entry['rows']), entry['versi']
+    cache_key = (_kunci_cache(filename), tuple(kunci))
+    cached = _SORT_CACHE.get(cache_key)
+    if cached is None or cached[0] != versi or len(cached[1]) != len(data):
+        cached = (versi, urutan_sortir(data, kunci))
+        _SORT_CACHE[cache_key] = cached
+    return [data[i] for i in cached[1]]
+
+# ---------- MODEL KOLOM TERNAK (COLUMNAR) ----------
+
+# Representasi tabel ternak per kolom untuk kawanan besar:
+#   berat_sekarang   -> array('d'), NaN jika tidak valid
+#   tgl_lahir        -> array('l') berisi ordinal tanggal, 0 jika tidak valid
+#   jenis_ternak, status_kesehatan, kandang_id -> kode kategori array('I')
+#   ternak_id        -> list string (di-intern)
+# Nilai asli yang tidak dapat diparsing disimpan terpisah agar tetap tampil apa adanya.
+# Baris dibaca lewat BarisTernak yang berperilaku seperti dict (read-only),
+# sehingga print_table dan kode menu tetap bisa dipakai tanpa perubahan.
+KOLOM_KATEGORI_TERNAK = ('jenis_ternak', 'status_kesehatan', 'kandang_id')
+
+class BarisTernak(collections.abc.Mapping):
+    """Tampilan satu baris TabelTernak sebagai mapping read-only."""
+    __slots__ = ('_tabel', '_i')
+
+    def __init__(self, tabel, i):
+        self._tabel = tabel
+        self._i = i
+
+    def __getitem__(self, kolom):
+        return self._tabel.nilai(self._i, kolom)
+
+    def __iter__(self):
+        return iter(HEADERS_LIVESTOCK)
+
+    def __len__(self):
+        return len(HEADERS_LIVESTOCK)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class TabelTernak:
+    """Tabel ternak dalam bentuk kolom (lihat penjelasan di atas)."""
+
+    def __init__(self, rows=()):
+        self.ternak_id = []
+        self.berat = array.array('d')
+        self.tgl_lahir = array.array('l')
+        self.kode = {kolom: array.array('I') for kolom in KOLOM_KATEGORI_TERNAK}
+        self.kategori = {kolom: [] for kolom in KOLOM_KATEGORI_TERNAK}
+        self._kode_dari_teks = {kolom: {} for kolom in KOLOM_KATEGORI_TERNAK}
+        self._teks_asli = {}  # (kolom, indeks) -> teks yang tidak dapat diparsing
+        for row in rows:
+            self.tambah(row)
+
+    def _kode_kategori(self, kolom, teks):
+        peta = self._kode_dari_teks[kolom]
+        kode = peta.get(teks)
+        if kode is None:
+            kode = peta[teks] = len(self.kategori[kolom])
+            self.kategori[kolom].append(sys.intern(teks))
+        return kode
+
+    def tambah(self, row):
+        i = len(self.ternak_id)
+        self.ternak_id.append(sys.intern(str(row.get('ternak_id', ''))))
+        berat = _dekor_nilai(row.get('berat_sekarang'), 'berat_sekarang')
+        if berat is None:
+            berat = float('nan')
+            self._teks_asli[('berat_sekarang', i)] = '' if row.get('berat_sekarang') is None else str(row['berat_sekarang'])
+        self.berat.append(berat)
+        ordinal = _dekor_nilai(row.get('tgl_lahir'), 'tgl_lahir')
+        if ordinal is None:
+            ordinal = 0
+            self._teks_asli[('tgl_lahir', i)] = '' if row.get('tgl_lahir') is None else str(row['tgl_lahir'])
+        self.tgl_lahir.append(ordinal)
+        for kolom in KOLOM_KATEGORI_TERNAK:
+            value = row.get(kolom)
+            self.kode[kolom].append(self._kode_kategori(kolom, '' if value is None else str(value)))
+
+    def __len__(self):
+        return len(self.ternak_id)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return BarisTernak(self, i)
+
+    def __iter__(self):
+        return (BarisTernak(self, i) for i in range(len(self)))
+
+    def nilai(self, i, kolom):
+        # Nilai satu sel dalam bentuk teks (seperti hasil read_csv).
+        if kolom == 'ternak_id':
+            return self.ternak_id[i]
+        if kolom == 'berat_sekarang':
+            berat = self.berat[i]
+            return self._teks_asli.get((kolom, i), '') if berat != berat else repr(berat)
+        if kolom == 'tgl_lahir':
+            ordinal = self.tgl_lahir[i]
+            return datetime.date.fromordinal(ordinal).isoformat() if ordinal else self._teks_asli.get((kolom, i), '')
+        if kolom in self.kode:
+            return self.kategori[kolom][self.kode[kolom][i]]
+        raise KeyError(kolom)
+
+    def _dekor_kolom(self, kolom):
+        # Kunci pembanding per baris (sequence) dan daftar indeks yang nilainya valid.
+        n = len(self)
+        if kolom == 'berat_sekarang':
+            return self.berat, [i for i in range(n) if self.berat[i] == self.berat[i]]
+        if kolom == 'tgl_lahir':
+            return self.tgl_lahir, [i for i in range(n) if self.tgl_lahir[i]]
+        if kolom in self.kode:
+            # Urutan kategori dihitung sekali per kategori, bukan per baris
+            dekor_kategori = [_dekor_nilai(teks, kolom) for teks in self.kategori[kolom]]
+            valid_kategori = [kode for kode, d in enumerate(dekor_kategori) if d is not None]
+            valid_kategori.sort(key=dekor_kategori.__getitem__)
+            peringkat = [None] * len(dekor_kategori)
+            for posisi, kode in enumerate(valid_kategori):
+                peringkat[kode] = posisi
+            dekor = [peringkat[kode] for kode in self.kode[kolom]]
+        else:
+            dekor = [_dekor_nilai(value, kolom) for value in self.ternak_id]
+        return dekor, [i for i in range(n) if dekor[i] is not None]
+
+    def urutan(self, kunci):
+        # Permutasi indeks hasil sortir; aturan sama dengan urutan_sortir
+        # (stabil, nilai tidak valid selalu di akhir) tanpa parsing ulang nilai.
+        urutan = list(range(len(self)))
+        for kolom, reverse in reversed(kunci):
+            dekor, valid_indeks = self._dekor_kolom(kolom)
+            valid_set = set(valid_indeks) if len(valid_indeks) != len(urutan) else None
+            if valid_set is None:
+                valid, tidak_valid = urutan, []
+            else:
+                valid = [i for i in urutan if i in valid_set]
+                tidak_valid = [i for i in urutan if i not in valid_set]
+            valid.sort(key=dekor.__getitem__, reverse=reverse)
+            urutan = valid + tidak_valid
+        return urutan
+
+    def sortir(self, kunci):
+        return [BarisTernak(self, i) for i in self.urutan(kunci)]
+
+    def rata_rata_berat(self, kolom):
+        # {kategori: (jumlah ternak dengan berat valid, rata-rata berat)} per kolom kategori.
+        kategori = self.kategori[kolom]
+        jumlah = [0] * len(kategori)
+        total = [0.0] * len(kategori)
+        for kode, berat in zip(self.kode[kolom], self.berat):
+            if berat == berat:
+                jumlah[kode] += 1
+                total[kode] += berat
+        return {kategori[k]: (jumlah[k], total[k] / jumlah[k]) for k in range(len(kategori)) if jumlah[k]}
+
+# Model kolom per tabel: path absolut -> (versi tabel, TabelTernak)
+_TABEL_KOLOM = {}
+
+def tabel_ternak_kolom(filename=LIVESTOCK_FILE):
+    # TabelTernak untuk isi tabel terkini; dibangun ulang hanya jika tabel berubah.
+    entry = _entri_cache(filename)
+    if entry is None:
+        return TabelTernak()
+    kunci = _kunci_cache(filename)
+    cached = _TABEL_KOLOM.get(kunci)
+    if cached is None or cached[0] != entry['versi']:
+        cached = (entry['versi'], TabelTernak(entry['rows']))
+        _TABEL_KOLOM[kunci] = cached
+    return cached[1]
+
+# ---------- AGREGAT LAPORAN (INCREMENTAL) ----------
+
+# Ringkasan per tabel dijaga tetap terkini lewat pendengar perubahan:
+#   feeding_log.csv    -> total jumlah_kg per kandang per hari / minggu (ISO) / bulan
+#   livestock.csv      -> jumlah ternak, jumlah sakit dan statistik berat per jenis & kandang
+#   health_records.csv -> jumlah catatan dan ternak yang diperiksa per bulan
+# Setiap ringkasan disimpan di dua file pendamping (sama seperti indeks teks):
+#   feeding_log.csv.agregat.json   -> snapshot ringkasan + tanda tabel saat snapshot
+#   feeding_log.csv.agregat.jsonl  -> baris yang berubah sesudah snapshot, satu baris per penulisan
+# Jadi setiap penulisan hanya menambah satu baris kecil (O(baris yang berubah)), bukan
+# menulis ulang ringkasan yang ukurannya sebanding dengan jumlah ternak. Jika file
+# perubahan melewati batas, snapshot ditulis ulang (kompaksi). Selama rantai tanda
+# cocok, laporan dibuka tanpa membaca tabelnya sama sekali; jika putus (misal tabel
+# diubah dari luar program), ringkasan dibangun ulang sekali dari tabel.
+AGREGAT_AKTIF = os.environ.get('SIMTERNAK_AGREGAT', '1') != '0'
+AGREGAT_SUFFIX = '.agregat.json'
+AGREGAT_DELTA_SUFFIX = '.agregat.jsonl'
+BATAS_DELTA_AGREGAT = 256 * 1024  # byte; lebih dari ini snapshot ditulis ulang
+
+# Ringkasan yang sudah dimuat di proses ini: path absolut -> {'tanda', 'data', 'ukuran_delta'}
+_AGREGAT = {}
+
+def _tanda_json(tanda):
+    # Tanda tabel dalam bentuk yang sama dengan hasil baca JSON (tuple -> list).
+    return json.loads(json.dumps(tanda))
+
+def _tambah_nilai(isi, kunci, delta):
+    # Menambahkan delta ke isi[kunci]; kunci dibuang jika nilainya kembali nol.
+    nilai = round(isi.get(kunci, 0) + delta, 6)
+    if abs(nilai) < 1e-9:
+        isi.pop(kunci, None)
+    else:
+        isi[kunci] = nilai
+
+def _agregat_kosong_pakan():
+    return {'hari': {}, 'minggu': {}, 'bulan': {}}
+
+def _agregat_tambah_pakan(data, row, arah):
+    # arah +1 untuk baris yang ditambahkan, -1 untuk baris yang dihapus.
+    kg = _dekor_nilai(row.get('jumlah_kg'), 'jumlah_kg')
+    ordinal = _dekor_nilai(row.get('tanggal'), 'tanggal')
+    if kg is None or ordinal is None:
+        return
+    tanggal = datetime.date.fromordinal(ordinal)
+    tahun, minggu, _ = tanggal.isocalendar()
+    kandang = row.get('kandang_id', '')
+    for periode, kunci in (('hari', tanggal.isoformat()),
+                           ('minggu', f"{tahun}-W{minggu:02d}"),
+                           ('bulan', tanggal.strftime('%Y-%m'))):
+        per_kandang = data[periode].setdefault(kandang, {})
+        _tambah_nilai(per_kandang, kunci, arah * kg)
+        if not per_kandang:
+            del data[periode][kandang]
+
+def _agregat_kosong_ternak():
+    return {'jenis': {}, 'kandang': {}}
+
+def _agregat_tambah_ternak(data, row, arah):
+    berat = _dekor_nilai(row.get('berat_sekarang'), 'berat_sekarang')
+    sakit = 1 if str(row.get('status_kesehatan', '')).strip().lower() == 'sakit' else 0
+    for kelompok, kunci in (('jenis', row.get('jenis_ternak', '')), ('kandang', row.get('kandang_id', ''))):
+        statistik = data[kelompok].setdefault(kunci, {'jumlah': 0, 'sakit': 0, 'n_berat': 0,
+                                                      'total_berat': 0.0, 'total_kuadrat': 0.0})
+        statistik['jumlah'] += arah
+        statistik['sakit'] += arah * sakit
+        if berat is not None:
+            statistik['n_berat'] += arah
+            statistik['total_berat'] = round(statistik['total_berat'] + arah * berat, 6)
+            statistik['total_kuadrat'] = round(statistik['total_kuadrat'] + arah * berat * berat, 6)
+        if statistik['jumlah'] <= 0:
+            del data[kelompok][kunci]
+
+def _agregat_kosong_kesehatan():
+    return {'bulan': {}}
+
+def _agregat_tambah_kesehatan(data, row, arah):
+    # Per bulan: jumlah catatan dan berapa catatan untuk tiap ternak,
+    # agar jumlah ternak berbeda tetap benar saat catatan dihapus.
+    ordinal = _dekor_nilai(row.get('tanggal'), 'tanggal')
+    if ordinal is None:
+        return
+    bulan = datetime.date.fromordinal(ordinal).strftime('%Y-%m')
+    isi = data['bulan'].setdefault(bulan, {'catatan': 0, 'ternak': {}})
+    isi['catatan'] += arah
+    _tambah_nilai(isi['ternak'], row.get('ternak_id', ''), arah)
+    if isi['catatan'] <= 0:
+        del data['bulan'][bulan]
+
+def _agregat_kosong_penimbangan():
+    return {'ternak': {}}
+
+def _agregat_tambah_penimbangan(data, row, arah):
+    # Keadaan berjalan per ternak: penimbangan pertama, sebelum terakhir, dan
+    # terakhir (menurut tanggal, bukan urutan file) serta jumlah penimbangan.
+    # Riwayat bobot hanya ditambah; menghapus baris membuat ringkasan dibangun ulang.
+    if arah < 0:
+        return False
+    ordinal = _dekor_nilai(row.get('tanggal'), 'tanggal')
+    berat = _dekor_nilai(row.get('berat'), 'berat')
+    if ordinal is None or berat is None:
+        return None
+    s = data['ternak'].get(row.get('ternak_id', ''))
+    if s is None:
+        data['ternak'][row.get('ternak_id', '')] = {
+            'awal_tgl': ordinal, 'awal_berat': berat, 'sebelum_tgl': None, 'sebelum_berat': None,
+            'akhir_tgl': ordinal, 'akhir_berat': berat, 'jumlah': 1}
+        return None
+    s['jumlah'] += 1
+    if ordinal >= s['akhir_tgl']:
+        s['sebelum_tgl'], s['sebelum_berat'] = s['akhir_tgl'], s['akhir_berat']
+        s['akhir_tgl'], s['akhir_berat'] = ordinal, berat
+    elif s['sebelum_tgl'] is None or ordinal >= s['sebelum_tgl']:
+        s['sebelum_tgl'], s['sebelum_berat'] = ordinal, berat
+    if ordinal < s['awal_tgl']:
+        s['awal_tgl'], s['awal_berat'] = ordinal, berat
+    return None
+
+# Nama file -> (fungsi ringkasan kosong, fungsi tambah/kurangi satu baris).
+# Fungsi tambah boleh mengembalikan False jika baris tidak bisa dikurangi.
+AGREGAT_DEFS = {
+    FEEDING_FILE: (_agregat_kosong_pakan, _agregat_tambah_pakan),
+    LIVESTOCK_FILE: (_agregat_kosong_ternak, _agregat_tambah_ternak),
+    HEALTH_FILE: (_agregat_kosong_kesehatan, _agregat_tambah_kesehatan),
+    WEIGHT_FILE: (_agregat_kosong_penimbangan, _agregat_tambah_penimbangan),
+}
+
+def _definisi_agregat(filename):
+    return AGREGAT_DEFS.get(os.path.basename(filename))
+
+def _simpan_agregat(filename, state):
+    # Snapshot baru menggantikan snapshot lama + semua perubahannya (panggil di dalam kunci eksklusif).
+    _tulis_json_atomik(filename + AGREGAT_SUFFIX, {'tanda': state['tanda'], 'data': state['data']}, filename)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(filename + AGREGAT_DELTA_SUFFIX)
+    state['ukuran_delta'] = 0
+
+def _terapkan_perubahan_agregat(filename, state, perubahan):
+    # Menerapkan satu baris perubahan ke ringkasan. False jika ringkasan tidak
+    # bisa dikurangi per baris (harus dibangun ulang).
+    tambah = _definisi_agregat(filename)[1]
+    for row in perubahan['hapus']:
+        if tambah(state['data'], row, -1) is False:
+            return False
+    for row in perubahan['tambah']:
+        tambah(state['data'], row, 1)
+    state['tanda'] = perubahan['baru']
+    return True
+
+def _muat_agregat(filename):
+    # Snapshot + perubahan dari file pendamping, atau None jika belum ada / harus dibangun ulang.
+    try:
+        with open(filename + AGREGAT_SUFFIX, mode='r', encoding='utf-8') as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or 'tanda' not in state or 'data' not in state:
+        return None
+    state['ukuran_delta'] = 0
+    try:
+        with open(filename + AGREGAT_DELTA_SUFFIX, mode='r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    perubahan = json.loads(line)
+                except ValueError:
+                    continue  # baris terpotong (program berhenti saat menulis)
+                # Baris yang tandanya tidak menyambung sudah ada di snapshot: dilewati
+                if perubahan.get('lama') == state['tanda']:
+                    if not _terapkan_perubahan_agregat(filename, state, perubahan):
+                        return None
+            state['ukuran_delta'] = file.tell()
+    except FileNotFoundError:
+        pass
+    return state
+
+def _bangun_agregat(filename):
+    # Menghitung ringkasan dari seluruh isi tabel (dipakai jika belum ada / usang).
+    kosong, tambah = _definisi_agregat(filename)
+    entry = _entri_cache(filename)
+    if entry is None:
+        return None
+    data = kosong()
+    # Baris yang sudah diarsipkan tetap bagian dari riwayat (laporan tidak berubah setelah rotasi)
+    for row in itertools.chain(baris_arsip(filename), entry['rows']):
+        tambah(data, row, 1)
+    return {'tanda': _tanda_json(entry['tanda']), 'data': data, 'ukuran_delta': 0}
+
+def _agregat_pada_perubahan(filename, tanda_lama, tanda_baru, dihapus, ditambah):
+    # Pendengar perubahan: mencatat baris yang berubah ke file .jsonl dan ke
+    # ringkasan di memori (jika sedang dimuat), tanpa menulis ulang snapshot.
+    definisi = _definisi_agregat(filename)
+    if definisi is None:
+        return
+    kosong, tambah = definisi
+    kunci = _kunci_cache(filename)
+    if dihapus is None:
+        # Seluruh isi tabel diganti: snapshot baru dari arsip + isi baru
+        data = kosong()
+        for row in itertools.chain(baris_arsip(filename), ditambah):
+            tambah(data, row, 1)
+        state = {'tanda': _tanda_json(tanda_baru), 'data': data}
+        _simpan_agregat(filename, state)
+        _AGREGAT[kunci] = state
+        return
+    if not os.path.exists(filename + AGREGAT_SUFFIX):
+        _AGREGAT.pop(kunci, None)
+        return  # ringkasan belum pernah dibuat: dibangun saat laporan pertama
+    perubahan = {
+        'lama': _tanda_json(tanda_lama),
+        'baru': _tanda_json(tanda_baru),
+        'hapus': [dict(row) for row in dihapus],
+        'tambah': [dict(row) for row in ditambah],
+    }
+    baris = json.dumps(perubahan, ensure_ascii=False, separators=(',', ':'), default=str) + "\n"
+    try:
+        with open(filename + AGREGAT_DELTA_SUFFIX, mode='a', encoding='utf-8') as file:
+            file.write(baris)
+            ukuran_delta = file.tell()
+    except OSError as e:
+        print(f"ERROR: Tidak dapat memperbarui ringkasan {filename}. {e}")
+        _AGREGAT.pop(kunci, None)
+        return
+    state = _AGREGAT.get(kunci)
+    if state is not None:
+        if state['tanda'] != perubahan['lama'] or not _terapkan_perubahan_agregat(filename, state, perubahan):
+            # Ringkasan di memori tidak menyambung / tidak bisa dikurangi: muat ulang nanti
+            _AGREGAT.pop(kunci, None)
+            state = None
+        else:
+            state['ukuran_delta'] = ukuran_delta
+    if ukuran_delta > BATAS_DELTA_AGREGAT:
+        # Kompaksi (sekali setiap BATAS_DELTA_AGREGAT byte perubahan), masih di dalam kunci tabel
+        state = state or _muat_agregat(filename)
+        if state is not None and state['tanda'] == perubahan['baru']:
+            _simpan_agregat(filename, state)
+            _AGREGAT[kunci] = state
+
+if AGREGAT_AKTIF:
+    tambah_pendengar_perubahan(_agregat_pada_perubahan)
+
+def agregat_tabel(filename):
+    # Mengembalikan ringkasan terkini satu tabel (dict, jangan diubah langsung).
+    # Biaya normal: satu pengecekan tanda tabel + (sekali per proses) baca file pendamping.
+    kunci = _kunci_cache(filename)
+    tanda = _tanda_json(_tanda_tabel(filename))
+    state = _AGREGAT.get(kunci)
+    if state is None or state['tanda'] != tanda:
+        with kunci_tabel(filename, eksklusif=False):
+            state = _muat_agregat(filename)
+    if state is None or state['tanda'] != tanda or state['ukuran_delta'] > BATAS_DELTA_AGREGAT:
+        # Dibangun ulang / dipadatkan di dalam kunci eksklusif agar tidak menimpa
+        # ringkasan atau perubahan yang baru saja disimpan oleh proses penulis.
+        with kunci_tabel(filename):
+            if state is None or state['tanda'] != _tanda_json(_tanda_tabel(filename)):
+                state = _bangun_agregat(filename)
+                if state is None:
+                    return _definisi_agregat(filename)[0]()
+            _simpan_agregat(filename, state)
+    _AGREGAT[kunci] = state
+    return state['data']
+
+def laporan_pakan(periode='bulan', konteks=None):
+    # Total pakan (kg) per kandang: {kandang_id: {periode: kg}}.
+    # periode: 'hari' (YYYY-MM-DD), 'minggu' (YYYY-Www) atau 'bulan' (YYYY-MM).
+    return agregat_tabel(_tabel(konteks, FEEDING_FILE))[periode]
+
+def laporan_bobot(kelompok='jenis', konteks=None):
+    # Statistik ternak per 'jenis' atau 'kandang':
+    # {kunci: {jumlah, sakit, persen_sakit, rata_rata, simpangan, n_berat}}.
+    return {kunci: _statistik_bobot(statistik)
+            for kunci, statistik in agregat_tabel(_tabel(konteks, LIVESTOCK_FILE))[kelompok].items()}
+
+def _statistik_bobot(statistik):
+    # Jumlah mentah agregat ternak (jumlah, sakit, n_berat, total_berat,
+    # total_kuadrat) -> statistik yang ditampilkan. Jumlah mentah dari beberapa
+    # farm boleh dijumlahkan dulu (lihat laporan_konsolidasi).
+    n = statistik['n_berat']
+    rata_rata = statistik['total_berat'] / n if n else None
+    simpangan = None
+    if n:
+        varians = statistik['total_kuadrat'] / n - rata_rata * rata_rata
+        simpangan = max(varians, 0.0) ** 0.5
+    return {
+        'jumlah': statistik['jumlah'],
+        'sakit': statistik['sakit'],
+        'persen_sakit': 100.0 * statistik['sakit'] / statistik['jumlah'] if statistik['jumlah'] else None,
+        'rata_rata': rata_rata,
+        'simpangan': simpangan,
+        'n_berat': n,
+    }
+
+def laporan_kesehatan(konteks=None):
+    # Per bulan: {bulan: {catatan, ternak_diperiksa, persen_ternak}}.
+    # persen_ternak dihitung terhadap jumlah ternak saat ini.
+    jumlah_ternak = sum(s['jumlah'] for s in agregat_tabel(_tabel(konteks, LIVESTOCK_FILE))['jenis'].values())
+    hasil = {}
+    for bulan, isi in agregat_tabel(_tabel(konteks, HEALTH_FILE))['bulan'].items():
+        diperiksa = len(isi['ternak'])
+        hasil[bulan] = {
+            'catatan': isi['catatan'],
+            'ternak_diperiksa': diperiksa,
+            'persen_ternak': 100.0 * diperiksa / jumlah_ternak if jumlah_ternak else None,
+        }
+    return hasil
+
+# ---------- RIWAYAT BOBOT & PERTUMBUHAN (ADG) ----------
+
+# Setiap penimbangan dicatat di weight_history.csv (hanya ditambah, tidak diubah).
+# Keadaan berjalan per ternak dijaga oleh agregat WEIGHT_FILE (lihat
+# _agregat_tambah_penimbangan), sehingga ADG dan perkiraan hari ke target
+# adalah O(1) per ternak, dan peringkat top-k O(n log k) dengan heapq.
+# ADG (average daily gain) = kenaikan berat (kg) / jumlah hari.
+
+def _baris_penimbangan(ternak_id, berat, tanggal, dicatat_oleh):
+    return {'ternak_id': ternak_id, 'tanggal': tanggal, 'berat': berat, 'dicatat_oleh': dicatat_oleh}
+
+def catat_penimbangan(ternak_id, berat, dicatat_oleh, tanggal=None, konteks=None):
+    # Mencatat hasil timbang ke riwayat bobot, lalu memperbarui berat_sekarang
+    # ternak jika penimbangan ini yang paling baru. Mengembalikan timbang_id.
+    tanggal = tanggal or get_current_date()
+    weight_file = _tabel(konteks, WEIGHT_FILE)
+    timbang_id = append_csv_row_dengan_id(weight_file, 'W', 'timbang_id',
+                                          _baris_penimbangan(ternak_id, berat, tanggal, dicatat_oleh),
+                                          HEADERS_WEIGHT)
+    terakhir = agregat_tabel(weight_file)['ternak'].get(ternak_id)
+    if terakhir is None or terakhir['akhir_tgl'] <= datetime.date.fromisoformat(tanggal).toordinal():
+        update_csv_row(_tabel(konteks, LIVESTOCK_FILE), ternak_id, {'berat_sekarang': berat}, HEADERS_LIVESTOCK)
+    return timbang_id
+
+def _statistik_pertumbuhan(ternak_id, s):
+    hari = s['akhir_tgl'] - s['awal_tgl']
+    hari_terakhir = s['akhir_tgl'] - s['sebelum_tgl'] if s['sebelum_tgl'] is not None else 0
+    return {
+        'ternak_id': ternak_id,
+        'jumlah_timbang': s['jumlah'],
+        'tgl_awal': datetime.date.fromordinal(s['awal_tgl']).isoformat(),
+        'tgl_terakhir': datetime.date.fromordinal(s['akhir_tgl']).isoformat(),
+        'berat_terakhir': s['akhir_berat'],
+        'kenaikan': s['akhir_berat'] - s['awal_berat'],
+        'adg': (s['akhir_berat'] - s['awal_berat']) / hari if hari > 0 else None,
+        'adg_terakhir': (s['akhir_berat'] - s['sebelum_berat']) / hari_terakhir if hari_terakhir > 0 else None,
+    }
+
+def pertumbuhan_ternak(ternak_id):
+    # Statistik pertumbuhan satu ternak (O(1)), None jika belum pernah ditimbang.
+    s = agregat_tabel(WEIGHT_FILE)['ternak'].get(ternak_id)
+    return _statistik_pertumbuhan(ternak_id, s) if s is not None else None
+
+def hari_menuju_target(ternak_id, berat_target):
+    # Perkiraan jumlah hari sampai berat_target dengan ADG keseluruhan ternak.
+    # 0 jika target sudah tercapai, None jika ADG belum ada atau tidak naik.
+    statistik = pertumbuhan_ternak(ternak_id)
+    if statistik is None:
+        return None
+    sisa = berat_target - statistik['berat_terakhir']
+    if sisa <= 0:
+        return 0.0
+    adg = statistik['adg']
+    return sisa / adg if adg and adg > 0 else None
+
+def peringkat_adg(k=10, terbesar=True):
+    # k ternak dengan ADG tertinggi (atau terendah). Ternak dengan kurang dari
+    # dua tanggal penimbangan dilewati. O(n log k) dengan heapq.
+    ternak = agregat_tabel(WEIGHT_FILE)['ternak']
+    kandidat = ((ternak_id, s) for ternak_id, s in ternak.items() if s['akhir_tgl'] > s['awal_tgl'])
+    pilih = heapq.nlargest if terbesar else heapq.nsmallest
+    teratas = pilih(k, kandidat, key=lambda item: (item[1]['akhir_berat'] - item[1]['awal_berat'])
+                                                  / (item[1]['akhir_tgl'] - item[1]['awal_tgl']))
+    return [_statistik_pertumbuhan(ternak_id, s) for ternak_id, s in teratas]
+
+def kurva_pertumbuhan(ternak_ids=None):
+    # Kurva pertumbuhan seluruh kawanan sekaligus (jalur batch):
+    # riwayat dibaca sekali ke array kolom, diurutkan SEKALI per (ternak, tanggal),
+    # lalu kenaikan kumulatif dan ADG antar-penimbangan dihitung dalam satu lintasan.
+    # Mengembalikan {ternak_id: [{tanggal, berat, kenaikan_kumulatif, adg_segmen}, ...]}.
+    if ternak_ids is not None:
+        ternak_ids = set(ternak_ids)
+        rows = [row for ternak_id in ternak_ids for row in cari_semua(WEIGHT_FILE, 'ternak_id', ternak_id)]
+    else:
+        rows = read_csv(WEIGHT_FILE)
+    kode_ternak = {}
+    daftar_id = []
+    kode = array.array('l')
+    tanggal = array.array('l')
+    berat = array.array('d')
+    for row in rows:
+        ordinal = _dekor_nilai(row.get('tanggal'), 'tanggal')
+        nilai = _dekor_nilai(row.get('berat'), 'berat')
+        if ordinal is None or nilai is None:
+            continue
+        ternak_id = row.get('ternak_id', '')
+        if ternak_id not in kode_ternak:
+            kode_ternak[ternak_id] = len(daftar_id)
+            daftar_id.append(ternak_id)
+        kode.append(kode_ternak[ternak_id])
+        tanggal.append(ordinal)
+        berat.append(nilai)
+
+    # Ordinal tanggal < 10^7, jadi (kode, tanggal) bisa digabung menjadi satu kunci integer
+    kunci = array.array('q', (k * 10_000_000 + t for k, t in zip(kode, tanggal)))
+    urutan = sorted(range(len(kunci)), key=kunci.__getitem__)
+
+    kurva = {}
+    sebelum = None
+    for i in urutan:
+        if sebelum is None or kode[sebelum] != kode[i]:
+            titik = kurva[daftar_id[kode[i]]] = []
+            awal = berat[i]
+            adg = None
+        else:
+            hari = tanggal[i] - tanggal[sebelum]
+            adg = (berat[i] - berat[sebelum]) / hari if hari > 0 else None
+        titik.append({'tanggal': datetime.date.fromordinal(tanggal[i]).isoformat(), 'berat': berat[i],
+                      'kenaikan_kumulatif': berat[i] - awal, 'adg_segmen': adg})
+        sebelum = i
+    return kurva
+
+# ---------- INDEKS TEKS KESEHATAN (GEJALA & TINDAKAN) ----------
+
+# Indeks terbalik: kata (casefold) -> daftar record_id (posting), terpisah untuk kolom
+# gejala dan tindakan. Isi catatan tidak disalin ke indeks: baris hasil pencarian
+# diambil lewat indeks kunci primer file aktif, atau dari partisi arsip yang rentang
+# ID-nya memuat record_id tersebut (lihat _baris_kesehatan).
+# Disimpan di dua file pendamping:
+#   health_records.csv.teks.json   -> snapshot indeks + tanda tabel saat snapshot
+#   health_records.csv.teks.jsonl  -> perubahan sesudah snapshot, satu baris per penulisan
+# Pendengar perubahan menambahkan satu baris .jsonl pada setiap penulisan (masih di dalam
+# kunci tabel, jadi urut antar proses), bukan menulis ulang seluruh indeks. Saat dimuat,
+# perubahan diterapkan di atas snapshot; jika rantai tanda putus (misal tabel ditulis
+# saat fitur ini nonaktif) indeks dibangun ulang dari tabel.
+INDEKS_TEKS_AKTIF = os.environ.get('SIMTERNAK_INDEKS_TEKS', '1') != '0'
+INDEKS_TEKS_SUFFIX = '.teks.json'
+INDEKS_TEKS_DELTA_SUFFIX = '.teks.jsonl'
+# Naik jika format snapshot berubah: snapshot versi lain dibangun ulang
+VERSI_INDEKS_TEKS = 2
+KOLOM_INDEKS_TEKS = ['gejala', 'tindakan']
+# Kolom per catatan di file perubahan (.jsonl): cukup untuk menambah/membuang posting
+KOLOM_PERUBAHAN_TEKS = ['record_id'] + KOLOM_INDEKS_TEKS
+BATAS_DELTA_INDEKS_TEKS = 256 * 1024  # byte; lebih dari ini snapshot ditulis ulang
+AMBANG_FUZZY = 0.75                   # kemiripan minimal (difflib) untuk mode 'fuzzy'
+_POLA_KATA = re.compile(r'\w+')
+# Bentuk ID ternak (prefix 'S' + angka, lihat tambah_ternak)
+_POLA_ID_TERNAK = re.compile(r'S\d+')
+# kunci cache -> {'tanda', 'data': {'kata'}, 'ukuran_delta'}
+_INDEKS_TEKS = {}
+
+def _token(teks):
+    # 'Demam, Batuk-kering' -> ['demam', 'batuk', 'kering']
+    return _POLA_KATA.findall(str(teks or '').casefold())
+
+def _indeks_teks_kosong():
+    return {'kata': {kolom: {} for kolom in KOLOM_INDEKS_TEKS}}
+
+def _indeks_teks_ubah(data, row, arah):
+    # Menambah (arah 1) atau membuang (arah -1) posting satu catatan kesehatan.
+    # Untuk membuang, 'row' berisi teks LAMA catatan itu (baris yang dihapus/diganti).
+    record_id = row.get('record_id')
+    for kolom in KOLOM_INDEKS_TEKS:
+        per_kata = data['kata'][kolom]
+        for kata in set(_token(row.get(kolom))):
+            if arah > 0:
+                per_kata.setdefault(kata, []).append(record_id)
+                continue
+            daftar = per_kata.get(kata, [])
+            if record_id in daftar:
+                daftar.remove(record_id)
+            if not daftar:
+                per_kata.pop(kata, None)
+
+def _bangun_indeks_teks(filename):
+    # Membangun indeks dari seluruh isi tabel + partisi arsip.
+    entry = _entri_cache(filename)
+    if entry is None:
+        return None
+    data = _indeks_teks_kosong()
+    for row in itertools.chain(baris_arsip(filename), entry['rows']):
+        _indeks_teks_ubah(data, row, 1)
+    return {'tanda': _tanda_json(entry['tanda']), 'data': data, 'ukuran_delta': 0}
+
+def _simpan_indeks_teks(filename, state):
+    # Snapshot baru menggantikan snapshot lama + semua perubahannya (panggil di dalam kunci eksklusif).
+    _tulis_json_atomik(filename + INDEKS_TEKS_SUFFIX,
+                       {'versi': VERSI_INDEKS_TEKS, 'tanda': state['tanda'], 'data': state['data']}, filename)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(filename + INDEKS_TEKS_DELTA_SUFFIX)
+    state['ukuran_delta'] = 0
+
+def _terapkan_perubahan_teks(state, perubahan):
+    for nilai in perubahan['hapus']:
+        _indeks_teks_ubah(state['data'], dict(zip(KOLOM_PERUBAHAN_TEKS, nilai)), -1)
+    for nilai in perubahan['tambah']:
+        _indeks_teks_ubah(state['data'], dict(zip(KOLOM_PERUBAHAN_TEKS, nilai)), 1)
+    state['tanda'] = perubahan['baru']
+
+def _muat_indeks_teks(filename):
+    # Snapshot + perubahan dari file pendamping, atau None jika belum ada
+    # (atau masih berformat lama, misalnya menyalin isi catatan di 'dok').
+    try:
+        with open(filename + INDEKS_TEKS_SUFFIX, mode='r', encoding='utf-8') as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('versi') != VERSI_INDEKS_TEKS \
+            or 'tanda' not in state or 'data' not in state:
+        return None
+    state['ukuran_delta'] = 0
+    try:
+        with open(filename + INDEKS_TEKS_DELTA_SUFFIX, mode='r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    perubahan = json.loads(line)
+                except ValueError:
+                    continue  # baris terpotong (program berhenti saat menulis)
+                # Baris yang tandanya tidak menyambung sudah ada di snapshot: dilewati
+                if perubahan.get('lama') == state['tanda']:
+                    _terapkan_perubahan_teks(state, perubahan)
+            state['ukuran_delta'] = file.tell()
+    except FileNotFoundError:
+        pass
+    return state
+
+def _indeks_teks_pada_perubahan(filename, tanda_lama, tanda_baru, dihapus, ditambah):
+    # Pendengar perubahan: mencatat perubahan health_records.csv ke file .jsonl
+    # (O(baris yang berubah)) dan ke indeks di memori jika sedang dimuat.
+    if os.path.basename(filename) != HEALTH_FILE:
+        return
+    kunci = _kunci_cache(filename)
+    if dihapus is None:
+        # Seluruh isi tabel diganti: dibangun ulang saat pencarian berikutnya
+        _INDEKS_TEKS.pop(kunci, None)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(filename + INDEKS_TEKS_SUFFIX)
+        return
+    if not os.path.exists(filename + INDEKS_TEKS_SUFFIX):
+        return  # indeks belum pernah dibangun: dibangun saat pencarian pertama
+    perubahan = {
+        'lama': _tanda_json(tanda_lama),
+        'baru': _tanda_json(tanda_baru),
+        'hapus': [list(_normalisasi_baris(row, KOLOM_PERUBAHAN_TEKS).values()) for row in dihapus],
+        'tambah': [list(_normalisasi_baris(row, KOLOM_PERUBAHAN_TEKS).values()) for row in ditambah],
+    }
+    baris = json.dumps(perubahan, ensure_ascii=False) + "\n"
+    try:
+        with open(filename + INDEKS_TEKS_DELTA_SUFFIX, mode='a', encoding='utf-8') as file:
+            file.write(baris)
+    except OSError as e:
+        print(f"ERROR: Tidak dapat memperbarui indeks teks {filename}. {e}")
+        return
+    state = _INDEKS_TEKS.get(kunci)
+    if state is not None:
+        if state['tanda'] == perubahan['lama']:
+            _terapkan_perubahan_teks(state, perubahan)
+            state['ukuran_delta'] += len(baris.encode('utf-8'))
+        else:
+            _INDEKS_TEKS.pop(kunci, None)
+
+if INDEKS_TEKS_AKTIF:
+    tambah_pendengar_perubahan(_indeks_teks_pada_perubahan)
+
+def indeks_teks_kesehatan(konteks=None):
+    # Indeks teks terkini {'kata': {kolom: {kata: [record_id]}}} (jangan diubah langsung).
+    # Biaya normal: satu pengecekan tanda tabel; sekali per proses: baca file pendamping.
+    filename = _tabel(konteks, HEALTH_FILE)
+    kunci = _kunci_cache(filename)
+    tanda = _tanda_json(_tanda_tabel(filename))
+    state = _INDEKS_TEKS.get(kunci)
+    if state is None or state['tanda'] != tanda:
+        with kunci_tabel(filename, eksklusif=False):
+            state = _muat_indeks_teks(filename)
+    if state is None or state['tanda'] != tanda or state['ukuran_delta'] > BATAS_DELTA_INDEKS_TEKS:
+        # Dibangun ulang / dipadatkan di dalam kunci eksklusif: tidak ada penulis yang
+        # menambah perubahan di antara snapshot ditulis dan file .jsonl dihapus.
+        with kunci_tabel(filename):
+            if state is None or state['tanda'] != _tanda_json(_tanda_tabel(filename)):
+                state = _bangun_indeks_teks(filename)
+                if state is None:
+                    return _indeks_teks_kosong()
+            _simpan_indeks_teks(filename, state)
+    _INDEKS_TEKS[kunci] = state
+    return state['data']
+
+def _baris_kesehatan(filename, record_ids):
+    # Baris (salinan) untuk record_id hasil indeks teks: file aktif lewat indeks kunci
+    # primer; sisanya dari partisi arsip yang rentang ID-nya (di manifest) memuatnya.
+    hasil = []
+    sisa = set()
+    with kunci_tabel(filename, eksklusif=False):
+        for record_id in record_ids:
+            row = cari_berdasarkan_id(filename, record_id)
+            if row is None:
+                sisa.add(record_id)
+            else:
+                hasil.append(dict(row))
+    if not sisa or _pakai_sqlite(filename):
+        return hasil
+    prefix = TABEL_PARTISI[HEALTH_FILE][0]
+    for info in baca_manifest(filename)['partisi']:
+        if not sisa:
+            break
+        if info.get('id_awal') is None:
+            continue
+        id_awal = _angka_id(info['id_awal'], prefix) or 0
+        id_akhir = _angka_id(info['id_akhir'], prefix) or 0
+        cocok = [record_id for record_id in sisa if id_awal <= (_angka_id(record_id, prefix) or 0) <= id_akhir]
+        if not cocok:
+            continue
+        try:
+            indeks = _indeks_partisi(filename, info, 'record_id')
+        except (OSError, EOFError, csv.Error, UnicodeDecodeError) as e:
+            print(f"ERROR: Partisi arsip {info['file']} tidak dapat dibaca. {e}")
+            continue
+        for record_id in cocok:
+            rows = indeks.get(record_id)
+            if rows:
+                hasil.append(dict(rows[0]))
+                sisa.discard(record_id)
+    return hasil
+
+def _kata_cocok(per_kata, kata, mode):
+    # Kata di indeks yang cocok dengan satu kata query.
+    if mode == 'tepat':
+        return [kata] if kata in per_kata else []
+    cocok = [token for token in per_kata if token.startswith(kata)]
+    if mode == 'fuzzy':
+        # Diimpor di sini agar start-up program tetap cepat
+        import difflib
+        cocok += [token for token in difflib.get_close_matches(kata, per_kata, n=10, cutoff=AMBANG_FUZZY)
+                  if token not in cocok]
+    return cocok
+
+def cari_teks_kesehatan(query, kolom=None, mode='awalan', awal=None, akhir=None, semua_kata=False, konteks=None):
+    # Catatan kesehatan yang gejala/tindakannya memuat kata di 'query', urut tanggal.
+    #   kolom: 'gejala', 'tindakan' atau None (keduanya)
+    #   mode : 'tepat' (kata sama), 'awalan' (kata diawali query, default),
+    #          'fuzzy' (awalan + kata mirip, toleran salah ketik)
+    #   Beberapa kata: cocok salah satu (OR), atau semuanya jika semua_kata=True.
+    # Contoh: cari_teks_kesehatan('demam diare', awal='2025-11-01'),
+    #         cari_teks_kesehatan('vaksin', kolom='tindakan').
+    filename = _tabel(konteks, HEALTH_FILE)
+    data = indeks_teks_kesehatan(konteks)
+    daftar_kolom = [kolom] if kolom else KOLOM_INDEKS_TEKS
+    record_ids = None
+    for kata in _token(query):
+        cocok = set()
+        for k in daftar_kolom:
+            per_kata = data['kata'][k]
+            for token in _kata_cocok(per_kata, kata, mode):
+                cocok.update(per_kata[token])
+        if record_ids is None:
+            record_ids = cocok
+        else:
+            record_ids = record_ids & cocok if semua_kata else record_ids | cocok
+    hasil = []
+    for row in _baris_kesehatan(filename, record_ids or ()):
+        if (awal and row['tanggal'] < awal) or (akhir and row['tanggal'] > akhir):
+            continue
+        hasil.append(row)
+    hasil.sort(key=lambda row: (row['tanggal'], _angka_id(row['record_id'], 'H') or 0))
+    return hasil
+
+# ---------- KEAMANAN PASSWORD ----------
+
+# Password disimpan sebagai hash PBKDF2-SHA256 bergaram (salted) dengan format:
+#   pbkdf2_sha256$<iterasi>$<salt hex>$<hash hex>
+# Baris lama yang masih berisi password teks biasa tetap bisa login, lalu
+# langsung diganti dengan hash (migrasi transparan). Hash dengan iterasi lebih
+# kecil dari PASSWORD_ITERASI juga diperbarui saat login berhasil.
+# Iterasi (work factor) bisa diatur lewat SIMTERNAK_PBKDF2_ITER; gunakan
+# 'benchmark-password' untuk memilih nilai yang sesuai dengan mesin.
+PASSWORD_ALGORITMA = 'pbkdf2_sha256'
+PASSWORD_ITERASI = int(os.environ.get('SIMTERNAK_PBKDF2_ITER', '200000'))
+# Catatan: hasil verifikasi password sengaja TIDAK di-cache. Setiap tebakan
+# password harus membayar biaya PBKDF2 penuh, dan waktu respons tidak boleh
+# membedakan akun yang baru saja login.
+
+def hash_password(password, iterasi=None):
+    iterasi = iterasi or PASSWORD_ITERASI
+    salt = secrets.token_hex(16)
+    hasil = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('ascii'), iterasi)
+    return f"{PASSWORD_ALGORITMA}${iterasi}${salt}${hasil.hex()}"
+
+def verifikasi_password(password, tersimpan):
+    # Mengembalikan (cocok, perlu_diperbarui). Perbandingan selalu waktu-konstan.
+    bagian = tersimpan.split('$')
+    if len(bagian) == 4 and bagian[0] == PASSWORD_ALGORITMA and bagian[1].isdigit():
+        iterasi = int(bagian[1])
+        hasil = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), bagian[2].encode('ascii'), iterasi)
+        cocok = hmac.compare_digest(hasil.hex(), bagian[3])
+        return cocok, cocok and iterasi < PASSWORD_ITERASI
+    # Format lama: teks biasa
+    cocok = hmac.compare_digest(password.encode('utf-8'), tersimpan.encode('utf-8'))
+    return cocok, cocok
+
+# Hash pengganti untuk username yang tidak ada, agar waktu respons login
+# tidak membocorkan apakah sebuah username terdaftar.
+_HASH_PENGGANTI = None
+
+def _cek_login(username, password, kunci=None):
+    # Mengembalikan dict user jika username & password benar, selain itu None.
+    # kunci (opsional, misal _KUNCI_API) hanya dipegang selama lookup/ubah tabel
+    # users, tidak selama PBKDF2, agar login lambat tidak menahan thread lain.
+    global _HASH_PENGGANTI
+    kunci = kunci or contextlib.nullcontext()
+    with kunci:
+        user = cari_berdasarkan_id(USERS_FILE, username)
+        user = dict(user) if user is not None else None
+    if user is None:
+        if _HASH_PENGGANTI is None:
+            _HASH_PENGGANTI = hash_password(secrets.token_hex(8))
+        verifikasi_password(password, _HASH_PENGGANTI)
+        return None
+    tersimpan = user['password']
+    cocok, perlu_diperbarui = verifikasi_password(password, tersimpan)
+    if not cocok:
+        return None
+    if perlu_diperbarui:
+        hash_baru = hash_password(password)
+        with kunci:
+            # Hanya diganti jika password belum diubah oleh terminal lain
+            update_csv_row(USERS_FILE, username,
+                           lambda row: {'password': hash_baru} if row['password'] == tersimpan else {},
+                           HEADERS_USERS)
+            terbaru = cari_berdasarkan_id(USERS_FILE, username)
+            user = dict(terbaru) if terbaru is not None else user
+    return user
+
+def migrasi_password():
+    # Meng-hash semua password teks biasa di users.csv sekaligus (sekali jalan).
+    # Password yang sudah berupa hash tidak disentuh. Mengembalikan jumlah baris diubah.
+    perubahan = {}
+    with kunci_tabel(USERS_FILE):
+        for user in read_csv(USERS_FILE):
+            if not user['password'].startswith(PASSWORD_ALGORITMA + '$'):
+                perubahan[user['username']] = {'password': hash_password(user['password'])}
+        jumlah = update_csv_rows(USERS_FILE, perubahan, HEADERS_USERS) if perubahan else 0
+    print(f"{jumlah} password teks biasa telah di-hash.")
+    return jumlah
+
+# ---------- FUNGSI LOGIKA: LOGIN ----------
+
+def fungsi_login():
+    # Menangani login pengguna.
+    # Menggunakan INDEKS HASH (username) untuk mencari user dalam O(1),
+    # lalu memverifikasi hash PBKDF2 password dengan perbandingan waktu-konstan.
+    print("--- LOGIN SimTernak ---")
+    username = input("Username: ")
+    password = input("Password: ")
+    
+    # ALGORITMA: Hash Lookup + verifikasi hash password
+    user = _cek_login(username, password)
+    if user is not None:
+        print(f"Login berhasil! Selamat datang, {user['username']} ({user['role']})")
+        return user['username'], user['role']
+            
+    print("Username atau password salah.")
+    return None, None
+
+# ---------- FUNGSI BISNIS (TANPA INPUT) ----------
+
+# Operasi inti yang dipakai bersama oleh menu interaktif dan mode perintah (CLI).
+# Tidak ada input() maupun print() hasil di sini; nilai dikembalikan ke pemanggil.
+
+def tambah_ternak(jenis_ternak, tgl_lahir, berat, kandang_id, status_kesehatan='Sehat'):
+    # Menambahkan ternak baru. Mengembalikan ternak_id yang dibuat.
+    ternak_baru = {
+        'jenis_ternak': jenis_ternak,
+        'tgl_lahir': tgl_lahir,
+        'berat_sekarang': berat,
+        'status_kesehatan': status_kesehatan,
+        'kandang_id': kandang_id
+    }
+    return append_csv_row_dengan_id(LIVESTOCK_FILE, 'S', 'ternak_id', ternak_baru, HEADERS_LIVESTOCK)
+
+def ubah_ternak(ternak_id, perubahan):
+    # Mengubah kolom data ternak (kecuali ternak_id). True jika ternak ditemukan.
+    perubahan = {k: v for k, v in perubahan.items() if k in HEADERS_LIVESTOCK and k != 'ternak_id'}
+    return update_csv_row(LIVESTOCK_FILE, ternak_id, perubahan, HEADERS_LIVESTOCK)
+
+def hapus_ternak(ternak_id):
+    return delete_csv_row(LIVESTOCK_FILE, ternak_id, HEADERS_LIVESTOCK)
+
+def catat_pakan(kandang_id, jenis_pakan, jumlah_kg, username, tanggal=None):
+    # Mencatat pemberian pakan. Mengembalikan log_id yang dibuat.
+    log_data = {
+        'kandang_id': kandang_id,
+        'tanggal': tanggal or get_current_date(),
+        'jenis_pakan': jenis_pakan,
+        'jumlah_kg': jumlah_kg,
+        'dicatat_oleh': username
+    }
+    return append_csv_row_dengan_id(FEEDING_FILE, 'F', 'log_id', log_data, HEADERS_FEEDING)
+
+def catat_kesehatan(ternak_id, gejala, tindakan, username, tanggal=None, konteks=None):
+    # Mencatat cek kesehatan; jika ada gejala, status ternak diubah menjadi 'Sakit'.
+    # Mengembalikan (record_id, status_diubah) dengan status_diubah None jika tidak ada gejala.
+    record_data = {
+        'ternak_id': ternak_id,
+        'tanggal': tanggal or get_current_date(),
+        'gejala': gejala if gejala else "Cek Rutin",
+        'tindakan': tindakan,
+        'dicatat_oleh': username
+    }
+    record_id = append_csv_row_dengan_id(_tabel(konteks, HEALTH_FILE), 'H', 'record_id', record_data,
+                                         HEADERS_HEALTH)
+    status_diubah = None
+    if gejala:
+        status_diubah = update_csv_row(_tabel(konteks, LIVESTOCK_FILE), ternak_id, {'status_kesehatan': "Sakit"},
+                                       HEADERS_LIVESTOCK)
+    return record_id, status_diubah
+
+def _rentang_hari_terakhir(jumlah_hari):
+    # (awal, akhir) untuk 'jumlah_hari' terakhir termasuk hari ini.
+    hari_ini = datetime.date.fromisoformat(get_current_date())
+    return (hari_ini - datetime.timedelta(days=jumlah_hari - 1)).isoformat(), hari_ini.isoformat()
+
+def riwayat_kesehatan(ternak_id, awal=None, akhir=None, konteks=None):
+    # Riwayat kesehatan satu ternak, opsional dibatasi rentang tanggal.
+    health_file = _tabel(konteks, HEALTH_FILE)
+    if awal or akhir:
+        return cari_rentang_tanggal(health_file, awal, akhir, {'ternak_id': ternak_id})
+    # Seluruh riwayat: partisi arsip ikut dibaca, bulan berjalan lewat indeks hash
+    return riwayat_arsip_kesehatan(ternak_id, konteks) + cari_semua(health_file, 'ternak_id', ternak_id)
+
+def riwayat_arsip_kesehatan(ternak_id, konteks=None):
+    # Catatan kesehatan satu ternak yang sudah dipindahkan ke partisi arsip.
+    return cari_arsip(_tabel(konteks, HEALTH_FILE), 'ternak_id', ternak_id)
+
+def laporan_sortir(kunci, konteks=None):
+    # Data ternak terurut (list of dict) untuk kunci [(kolom, reverse), ...].
+    return [dict(baris) for baris in tabel_ternak_kolom(_tabel(konteks, LIVESTOCK_FILE)).sortir(kunci)]
+
+# ---------- FUNGSI FITUR: PEKERJA ----------
+
+def pekerja_catat_kesehatan(username):
+    # Pekerja mencatat cek kesehatan harian.
+    clear_screen()
+    print(f"--- Catat Cek Kesehatan Harian (Dicatat oleh: {username}) ---")
+    
+    # Tampilkan ternak untuk memudahkan (per halaman, tidak seluruh tabel sekaligus)
+    tampilkan_berhalaman(sumber_tabel(LIVESTOCK_FILE), HEADERS_LIVESTOCK)
+    
+    ternak_id = input("\nID Ternak yang dicek: ").upper()
+    gejala = input("Gejala (kosongi jika sehat): ")
+    tindakan = input("Tindakan yang diberikan: ")
+    
+    # 1. Simpan ke health_records.csv (APPEND, ID dibuat di dalam kunci tabel)
+    # 2. (Fitur Tambahan) Update status di livestock.csv jika sakit
+    record_id, status_diubah = catat_kesehatan(ternak_id, gejala, tindakan, username)
+    print(f"Catatan kesehatan {record_id} untuk {ternak_id} berhasil disimpan.")
+    if status_diubah:
+        print(f"Status ternak {ternak_id} telah di-update menjadi 'Sakit'.")
+    elif status_diubah is False:
+        print(f"Warning: Gagal update status, ternak {ternak_id} tidak ditemukan.")
+
+def pekerja_update_status_ternak(ternak_id, status_baru):
+    # Fungsi helper untuk update status ternak.
+    # Baris dicari lewat indeks hash ternak_id, lalu diubah dan disimpan.
+    if update_csv_row(LIVESTOCK_FILE, ternak_id, {'status_kesehatan': status_baru}, HEADERS_LIVESTOCK):
+        print(f"Status ternak {ternak_id} telah di-update menjadi '{status_baru}'.")
+    else:
+        print(f"Warning: Gagal update status, ternak {ternak_id} tidak ditemukan.")
+
+def pekerja_catat_pakan(username):
+    # Pekerja mencatat pemberian pakan.
+    clear_screen()
+    print(f"--- Catat Pemberian Pakan (Dicatat oleh: {username}) ---")
+    
+    kandang_id = input("ID Kandang yang diberi pakan: ").upper()
+    jenis_pakan = input("Jenis Pakan (Misal: Konsentrat / Rumput): ")
+    jumlah_kg = get_float_input("Jumlah (kg): ")
+    
+    # Simpan ke feeding_log.csv (APPEND, ID dibuat di dalam kunci tabel)
+    log_id = catat_pakan(kandang_id, jenis_pakan, jumlah_kg, username)
+    print(f"Catatan pakan {log_id} untuk kandang {kandang_id} berhasil disimpan.")
+
+def pekerja_update_bobot(username):
+    """
+    Pekerja meng-update bobot ternak setelah ditimbang.
+    Hasil timbang juga dicatat ke RIWAYAT BOBOT (untuk ADG / kurva pertumbuhan).
+    """
+    clear_screen()
+    print("--- Update Bobot Timbang Ternak ---")
+    
+    # Tampilkan data ternak agar mudah dilihat (per halaman)
+    tampilkan_berhalaman(sumber_tabel(LIVESTOCK_FILE), HEADERS_LIVESTOCK)
+    
+    ternak_id = input("\nID Ternak yang ditimbang: ").upper()
+    
+    # 1. CARI (Indeks hash ternak_id, O(1))
+    ternak = cari_berdasarkan_id(LIVESTOCK_FILE, ternak_id)
+            
+    # 2. MODIFY & SIMPAN
+    if ternak is not None:
+        print(f"Bobot saat ini untuk {ternak_id}: {ternak['berat_sekarang']} kg")
+        berat_baru = get_float_input("Masukkan bobot baru (kg): ")
+        catat_penimbangan(ternak_id, berat_baru, username)
+        print(f"Bobot ternak {ternak_id} berhasil di-update.")
+        statistik = pertumbuhan_ternak(ternak_id)
+        if statistik and statistik['adg'] is not None:
+            print(f"ADG sejak {statistik['tgl_awal']}: {statistik['adg']:.3f} kg/hari")
+    else:
+        print(f"ERROR: Ternak dengan ID {ternak_id} tidak ditemukan.")
+
+def pekerja_lihat_ternak():
+    """Pekerja melihat daftar ternak (Read-only)."""
+    clear_screen()
+    print("--- Daftar Semua Ternak (Read-Only) ---")
+    tampilkan_berhalaman(sumber_tabel(LIVESTOCK_FILE), HEADERS_LIVESTOCK)
+
+
+# ---------- DASBOR ADMIN (SNAPSHOT LATAR BELAKANG) ----------
+
+# Dasbor admin dibaca dari snapshot yang disiapkan thread latar belakang, jadi
+# membuka dasbor tidak pernah menunggu I/O. Snapshot dibangun ulang jika:
+#   - ada penulisan di proses ini (pendengar perubahan membangunkan thread), atau
+#   - tanda tabel berubah (penulisan proses lain, dicek tiap DASBOR_INTERVAL detik).
+# Ternak yang baru berstatus 'Sakit' ditandai: langsung dari pendengar perubahan
+# untuk penulisan di proses ini, dan dari selisih snapshot untuk proses lain.
+DASBOR_INTERVAL = float(os.environ.get('SIMTERNAK_DASBOR_INTERVAL', '2'))
+DASBOR_JUMLAH_KEJADIAN = 10
+TABEL_DASBOR = (LIVESTOCK_FILE, FEEDING_FILE, HEALTH_FILE)
+
+def _status_sakit(row):
+    return str(row.get('status_kesehatan', '')).strip().lower() == 'sakit'
+
+def hitung_snapshot_dasbor(hari_ini=None, konteks=None):
+    # Menghitung isi dasbor dari tabel (dipanggil di thread latar belakang).
+    # Setiap tabel dibaca di bawah kuncinya agar tidak bertabrakan dengan penulis di thread lain.
+    hari_ini = (hari_ini or datetime.date.today()).isoformat()
+    livestock_file, feeding_file, health_file = (_tabel(konteks, f) for f in TABEL_DASBOR)
+    snapshot = {'waktu': time.time(), 'tanggal': hari_ini,
+                'tanda': {filename: _tanda_tabel(_tabel(konteks, filename)) for filename in TABEL_DASBOR}}
+    with kunci_tabel(livestock_file, eksklusif=False):
+        ternak = read_csv(livestock_file)
+        per_status = {}
+        per_kandang = {}
+        sakit = []
+        for row in ternak:
+            status = str(row.get('status_kesehatan', '')).strip().capitalize() or '-'
+            per_status[status] = per_status.get(status, 0) + 1
+            kandang = per_kandang.setdefault(row.get('kandang_id', ''), {'jumlah': 0, 'sakit': 0})
+            kandang['jumlah'] += 1
+            if _status_sakit(row):
+                kandang['sakit'] += 1
+                sakit.append({kolom: row.get(kolom, '') for kolom in
+                              ('ternak_id', 'jenis_ternak', 'kandang_id', 'berat_sekarang')})
+    snapshot.update(jumlah_ternak=len(ternak), per_status=per_status, per_kandang=per_kandang, sakit=sakit)
+    with kunci_tabel(feeding_file, eksklusif=False):
+        # Pakan hari ini dari agregat harian (tanpa membaca ulang log pakan)
+        pakan = {kandang: per_hari[hari_ini] for kandang, per_hari in laporan_pakan('hari', konteks).items()
+                 if hari_ini in per_hari}
+    snapshot['pakan_hari_ini'] = pakan
+    with kunci_tabel(health_file, eksklusif=False):
+        # Log kesehatan ditulis berurutan, jadi baris terakhir = kejadian terbaru
+        kesehatan = read_csv(health_file)
+        if len(kesehatan) < DASBOR_JUMLAH_KEJADIAN:
+            # Awal bulan: sisa kejadian terbaru ada di partisi arsip terakhir
+            awal = max((info['tgl_awal'] for info in baca_manifest(health_file)['partisi']), default=None)
+            if awal is not None:
+                kesehatan = list(baris_arsip(health_file, awal))[-DASBOR_JUMLAH_KEJADIAN:] + kesehatan
+        snapshot['kejadian_kesehatan'] = [dict(row) for row in reversed(kesehatan[-DASBOR_JUMLAH_KEJADIAN:])]
+    return snapshot
+
+class DasborAdmin:
+    """Snapshot dasbor admin yang diperbarui oleh thread latar belakang."""
+
+    def __init__(self, interval=DASBOR_INTERVAL, konteks=None):
+        self.interval = interval
+        self.konteks = konteks
+        self._kunci = threading.Lock()
+        self._snapshot = None
+        self._galat = None
+        self._sakit_dikenal = None    # ternak_id berstatus Sakit menurut snapshot/perubahan terakhir
+        self._sakit_baru = {}         # ternak_id -> waktu terdeteksi, sampai dilihat admin
+        self._status_tertunda = {}    # ternak_id -> (waktu, sakit) dari pendengar, belum ada di snapshot
+        self._bangunkan = threading.Event()
+        self._berhenti = threading.Event()
+        self._thread = None
+
+    def mulai(self):
+        tambah_pendengar_perubahan(self._pada_perubahan)
+        self._bangunkan.set()  # snapshot pertama langsung dibangun
+        self._thread = threading.Thread(target=self._jalan, name='simternak-dasbor', daemon=True)
+        self._thread.start()
+        return self
+
+    def hentikan(self):
+        hapus_pendengar_perubahan(self._pada_perubahan)
+        self._berhenti.set()
+        self._bangunkan.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _pada_perubahan(self, filename, tanda_lama, tanda_baru, dihapus, ditambah):
+        # Dipanggil penulis (masih memegang kunci tabel): hanya mencatat, tidak membaca file.
+        kunci = _kunci_cache(filename)
+        if not any(kunci == _kunci_cache(_tabel(self.konteks, tabel)) for tabel in TABEL_DASBOR):
+            return
+        if kunci == _kunci_cache(_tabel(self.konteks, LIVESTOCK_FILE)) and dihapus is not None:
+            sekarang = time.time()
+            sebelumnya = {row.get('ternak_id') for row in dihapus if _status_sakit(row)}
+            status = {row.get('ternak_id'): False for row in dihapus}
+            status.update((row.get('ternak_id'), _status_sakit(row)) for row in ditambah)
+            with self._kunci:
+                for ternak_id, sakit in status.items():
+                    self._status_tertunda[ternak_id] = (sekarang, sakit)
+                    if sakit and ternak_id not in sebelumnya:
+                        self._sakit_baru.setdefault(ternak_id, sekarang)
+                    elif not sakit:
+                        self._sakit_baru.pop(ternak_id, None)
+        self._bangunkan.set()
+
+    def _jalan(self):
+        tanda = None
+        while not self._berhenti.is_set():
+            dibangunkan = self._bangunkan.wait(self.interval)
+            self._bangunkan.clear()
+            if self._berhenti.is_set():
+                break
+            try:
+                tanda_kini = {filename: _tanda_tabel(_tabel(self.konteks, filename)) for filename in TABEL_DASBOR}
+                if not dibangunkan and tanda_kini == tanda and self._snapshot is not None:
+                    continue
+                snapshot = hitung_snapshot_dasbor(konteks=self.konteks)
+            except Exception as e:
+                with self._kunci:
+                    self._galat = str(e)
+                continue
+            tanda = snapshot['tanda']
+            self._pasang(snapshot)
+
+    def _pasang(self, snapshot):
+        sakit = {row['ternak_id'] for row in snapshot['sakit']}
+        with self._kunci:
+            # Perubahan yang dilaporkan pendengar setelah snapshot mulai dihitung
+            # belum tentu terlihat di snapshot ini: statusnya tetap diambil dari pendengar.
+            for ternak_id, (waktu, status) in list(self._status_tertunda.items()):
+                if waktu < snapshot['waktu']:
+                    del self._status_tertunda[ternak_id]
+                elif status:
+                    sakit.add(ternak_id)
+                else:
+                    sakit.discard(ternak_id)
+            if self._sakit_dikenal is not None:
+                # Perubahan dari proses lain hanya terlihat sebagai selisih snapshot
+                for ternak_id in sakit - self._sakit_dikenal:
+                    self._sakit_baru.setdefault(ternak_id, snapshot['waktu'])
+            for ternak_id in list(self._sakit_baru):
+                if ternak_id not in sakit:
+                    del self._sakit_baru[ternak_id]
+            self._sakit_dikenal = sakit
+            self._snapshot = snapshot
+            self._galat = None
+
+    def perbarui(self):
+        # Meminta snapshot dibangun ulang secepatnya (tidak menunggu hasilnya).
+        self._bangunkan.set()
+
+    def snapshot(self):
+        # Snapshot terakhir (None jika belum siap) dan pesan galat terakhir (jika ada).
+        with self._kunci:
+            return self._snapshot, self._galat
+
+    def sakit_baru(self, tandai_dilihat=False):
+        # {ternak_id: waktu terdeteksi} untuk ternak yang baru berstatus Sakit.
+        with self._kunci:
+            hasil = dict(self._sakit_baru)
+            if tandai_dilihat:
+                self._sakit_baru.clear()
+        return hasil
+
+# ---------- 8. FUNGSI FITUR: ADMIN ----------
+
+def admin_manajemen_ternak():
+    """Sub-menu untuk Admin mengelola data master ternak (CRUD)."""
+    while True:
+        clear_screen()
+        print("--- Manajemen Ternak ---")
+        print("1. Tambah Ternak Baru")
+        print("2. Update Data Ternak")
+        print("3. Hapus Data Ternak (Terjual/Mati)")
+        print("4. Kembali ke Menu Admin")
+        pilihan = input("Pilihan [1-4]: ")
+        
+        if pilihan == '1':
+            # --- CREATE (APPEND) ---
+            print("\n--- 1. Tambah Ternak Baru ---")
+            print("ID Ternak Baru dibuat otomatis setelah data disimpan.")
+            jenis = input("Jenis Ternak (Misal: Limosin): ")
+            tgl_lahir = input("Tgl Lahir (YYYY-MM-DD): ") # Validasi bisa ditambahkan
+            berat_awal = get_float_input("Berat Awal (kg): ")
+            kandang = input("ID Kandang: ").upper()
+            
+            # Status kesehatan default: 'Sehat'
+            ternak_id = tambah_ternak(jenis, tgl_lahir, berat_awal, kandang)
+            print(f"Ternak {ternak_id} berhasil ditambahkan.")
+            
+        elif pilihan == '2':
+            # --- UPDATE (CARI DENGAN INDEKS, LALU SIMPAN) ---
+            print("\n--- 2. Update Data Ternak ---")
+            tampilkan_berhalaman(sumber_tabel(LIVESTOCK_FILE), HEADERS_LIVESTOCK)
+            ternak_id = input("\nID Ternak yang akan di-update: ").upper()
+            
+            ternak = cari_berdasarkan_id(LIVESTOCK_FILE, ternak_id)
+            if ternak is not None:
+                print(f"Mengubah data untuk {ternak_id}...")
+                print(f"Kandang saat ini: {ternak['kandang_id']}")
+                kandang_baru = input("ID Kandang Baru (kosongi jika tidak berubah): ") or ternak['kandang_id']
+                
+                print(f"Status saat ini: {ternak['status_kesehatan']}")
+                status_baru = input("Status Kesehatan Baru (kosongi jika tidak berubah): ") or ternak['status_kesehatan']
+                
+                ubah_ternak(ternak_id, {'kandang_id': kandang_baru, 'status_kesehatan': status_baru})
+                print(f"Data ternak {ternak_id} berhasil di-update.")
+            else:
+                print(f"Ternak {ternak_id} tidak ditemukan.")
+
+        elif pilihan == '3':
+            # --- DELETE (CARI DENGAN INDEKS, LALU HAPUS) ---
+            print("\n--- 3. Hapus Data Ternak ---")
+            tampilkan_berhalaman(sumber_tabel(LIVESTOCK_FILE), HEADERS_LIVESTOCK)
+            ternak_id = input("\nID Ternak yang akan Dihapus: ").upper()
+            
+            if hapus_ternak(ternak_id):
+                print(f"Ternak {ternak_id} berhasil dihapus.")
+            else:
+                print(f"Ternak {ternak_id} tidak ditemukan.")
+                
+        elif pilihan == '4':
+            break
+        else:
+            print("Pilihan tidak valid.")
+        
+        input("\nTekan Enter untuk kembali ke Manajemen Ternak...")
+
+
+def admin_laporan_ternak():
+    """
+    Admin melihat laporan ternak dengan ALGORITMA SORTING.
+    """
+    clear_screen()
+    print("--- Laporan Ternak (Sortir) ---")
+    print("Urutkan berdasarkan:")
+    print("1. Berat Ternak (Ringan -> Berat)")
+    print("2. Berat Ternak (Berat -> Ringan)")
+    print("3. Umur Ternak (Muda -> Tua)")
+    print("4. Umur Ternak (Tua -> Muda)")
+    print("5. Kandang, lalu Berat (Berat -> Ringan)")
+    pilihan = input("Pilihan [1-5]: ")
+    
+    # Sortir stabil O(n log n) dengan cache permutasi per pilihan
+    pilihan_kunci = {
+        '1': [('berat_sekarang', False)],
+        '2': [('berat_sekarang', True)],
+        # Tgl lahir terbaru (muda) ke terlama (tua)
+        '3': [('tgl_lahir', True)],
+        # Tgl lahir terlama (tua) ke terbaru (muda)
+        '4': [('tgl_lahir', False)],
+        '5': [('kandang_id', False), ('berat_sekarang', True)],
+    }
+    if pilihan in pilihan_kunci:
+        # Model kolom: berat dan tanggal sudah berupa angka, tidak diparsing ulang
+        hasil_sortir = laporan_sortir(pilihan_kunci[pilihan])
+    else:
+        print("Pilihan tidak valid. Menampilkan data standar.")
+        hasil_sortir = read_csv(LIVESTOCK_FILE)
+
+    print("\n--- Hasil Laporan Terurut ---")
+    tampilkan_berhalaman(lambda mulai, jumlah: hasil_sortir[mulai:mulai + jumlah], HEADERS_LIVESTOCK)
+
+def admin_laporan_ringkasan():
+    """
+    Admin melihat ringkasan pakan, bobot dan kesehatan.
+    Memakai AGREGAT INCREMENTAL, jadi tidak membaca ulang seluruh log.
+    """
+    clear_screen()
+    print("--- Laporan Ringkasan ---")
+    print("1. Konsumsi Pakan per Kandang (Harian)")
+    print("2. Konsumsi Pakan per Kandang (Mingguan)")
+    print("3. Konsumsi Pakan per Kandang (Bulanan)")
+    print("4. Statistik Bobot per Jenis Ternak")
+    print("5. Statistik Bobot per Kandang")
+    print("6. Tingkat Pemeriksaan Kesehatan per Bulan")
+    print("7. Peringkat Pertumbuhan Harian (ADG) Tertinggi")
+    print("8. Kurva Pertumbuhan & Perkiraan Hari ke Target (per Ternak)")
+    pilihan = input("Pilihan [1-8]: ")
+
+    def angka(value):
+        return '-' if value is None else f"{value:.2f}"
+
+    periode = {'1': 'hari', '2': 'minggu', '3': 'bulan'}
+    kelompok = {'4': ('jenis', 'jenis_ternak'), '5': ('kandang', 'kandang_id')}
+    if pilihan in periode:
+        data = [{'kandang_id': kandang, 'periode': kunci, 'total_kg': angka(kg)}
+                for kandang, per_periode in laporan_pakan(periode[pilihan]).items()
+                for kunci, kg in per_periode.items()]
+        print_table(sortir_data(data, [('kandang_id', False), ('periode', False)]),
+                    ['kandang_id', 'periode', 'total_kg'])
+    elif pilihan in kelompok:
+        nama, kolom = kelompok[pilihan]
+        data = [{kolom: kunci, 'jumlah': s['jumlah'], 'sakit': s['sakit'],
+                 'persen_sakit': angka(s['persen_sakit']), 'rata_berat': angka(s['rata_rata']),
+                 'simpangan': angka(s['simpangan'])}
+                for kunci, s in laporan_bobot(nama).items()]
+        print_table(sortir_data(data, [(kolom, False)]),
+                    [kolom, 'jumlah', 'sakit', 'persen_sakit', 'rata_berat', 'simpangan'])
+    elif pilihan == '6':
+        data = [{'bulan': bulan, 'catatan': s['catatan'], 'ternak_diperiksa': s['ternak_diperiksa'],
+                 'persen_ternak': angka(s['persen_ternak'])}
+                for bulan, s in sorted(laporan_kesehatan().items())]
+        print_table(data, ['bulan', 'catatan', 'ternak_diperiksa', 'persen_ternak'])
+    elif pilihan == '7':
+        data = [{'ternak_id': s['ternak_id'], 'adg_kg_hari': f"{s['adg']:.3f}", 'kenaikan': angka(s['kenaikan']),
+                 'berat_terakhir': angka(s['berat_terakhir']), 'tgl_terakhir': s['tgl_terakhir'],
+                 'jumlah_timbang': s['jumlah_timbang']}
+                for s in peringkat_adg(10)]
+        print_table(data, ['ternak_id', 'adg_kg_hari', 'kenaikan', 'berat_terakhir', 'tgl_terakhir', 'jumlah_timbang'])
+    elif pilihan == '8':
+        ternak_id = input("ID Ternak: ").strip().upper()
+        kurva = kurva_pertumbuhan([ternak_id]).get(ternak_id, [])
+        print_table([{'tanggal': t['tanggal'], 'berat': angka(t['berat']),
+                      'kenaikan_kumulatif': angka(t['kenaikan_kumulatif']), 'adg_segmen': angka(t['adg_segmen'])}
+                     for t in kurva], ['tanggal', 'berat', 'kenaikan_kumulatif', 'adg_segmen'])
+        if kurva:
+            target = input("Berat target (kg, kosong = lewati): ").strip()
+            try:
+                hari = hari_menuju_target(ternak_id, float(target)) if target else None
+            except ValueError:
+                print("Error: Input harus berupa angka.")
+                return
+            if target:
+                if hari is None:
+                    print("Perkiraan tidak tersedia (butuh minimal dua penimbangan dengan berat yang naik).")
+                else:
+                    print(f"Perkiraan {hari:.0f} hari lagi untuk mencapai {float(target):.1f} kg.")
+    else:
+        print("Pilihan tidak valid.")
+
+def admin_statistik_performa():
+    """
+    Admin melihat statistik performa (jumlah panggilan, waktu, byte & baris per tabel)
+    dari INSTRUMENTASI, dan menyalakan profil cProfile per aksi menu.
+    """
+    while True:
+        clear_screen()
+        print("--- Statistik Performa ---")
+        print(f"Instrumentasi : {'AKTIF' if instrumentasi_aktif() else 'NONAKTIF'}")
+        print(f"Profil cProfile per aksi menu: {'AKTIF (folder ' + FOLDER_PROFIL + ')' if profil_aktif() else 'NONAKTIF'}")
+        statistik = ringkasan_statistik()
+        print("\nWaktu per fungsi:")
+        print_table([{
+            'fungsi': nama,
+            'panggilan': s['panggilan'],
+            'total': f"{s['total_detik'] * 1000:.1f}ms",
+            'rata_rata': f"{s['total_detik'] / s['panggilan'] * 1000:.3f}ms",
+            'maks': f"{s['maks_detik'] * 1000:.1f}ms",
+            'baris': s['baris'],
+            'histogram': ' '.join(f"{label}:{n}" for label, n in zip(LABEL_HISTOGRAM, s['histogram']) if n),
+        } for nama, s in sorted(statistik['fungsi'].items(), key=lambda item: -item[1]['total_detik'])],
+            ['fungsi', 'panggilan', 'total', 'rata_rata', 'maks', 'baris', 'histogram'])
+        print("\nI/O per tabel:")
+        print_table([dict({'tabel': nama}, **t) for nama, t in sorted(statistik['tabel'].items())],
+                    ['tabel'] + KOLOM_STATISTIK_TABEL)
+        print("\n1. Aktifkan/Nonaktifkan Instrumentasi")
+        print("2. Aktifkan/Nonaktifkan Profil cProfile per Aksi Menu")
+        print("3. Reset Statistik")
+        print("4. Simpan Statistik ke File (JSON)")
+        print("5. Kembali ke Menu Admin")
+        pilihan = input("Pilihan [1-5]: ")
+        if pilihan == '1':
+            if instrumentasi_aktif():
+                nonaktifkan_instrumentasi()
+            else:
+                aktifkan_instrumentasi()
+        elif pilihan == '2':
+            if profil_aktif():
+                nonaktifkan_profil()
+            else:
+                aktifkan_profil()
+        elif pilihan == '3':
+            reset_statistik()
+        elif pilihan == '4':
+            path = input("Nama file [statistik_simternak.json]: ").strip() or 'statistik_simternak.json'
+            simpan_statistik(path)
+            print(f"Statistik disimpan ke {path}.")
+            input("\nTekan Enter untuk melanjutkan...")
+        elif pilihan == '5':
+            break
+        else:
+            print("Pilihan tidak valid.")
+            input("\nTekan Enter untuk melanjutkan...")
+
+def admin_dasbor(dasbor):
+    """
+    Admin melihat dasbor: jumlah ternak per status & kandang, ternak sakit,
+    pakan hari ini dan kejadian kesehatan terbaru.
+    Ditampilkan dari SNAPSHOT thread latar belakang, jadi tidak menunggu I/O.
+    """
+    clear_screen()
+    print("--- Dasbor Peternakan ---")
+    snapshot, galat = dasbor.snapshot()
+    if galat:
+        print(f"Warning: Pembaruan dasbor terakhir gagal. {galat}")
+    if snapshot is None:
+        print("Dasbor sedang disiapkan, coba beberapa detik lagi.")
+        return
+    sakit_baru = dasbor.sakit_baru(tandai_dilihat=True)
+    umur = max(0.0, time.time() - snapshot['waktu'])
+    print(f"Snapshot {umur:.0f} detik yang lalu | Tanggal: {snapshot['tanggal']} | "
+          f"Total ternak: {snapshot['jumlah_ternak']}")
+    if sakit_baru:
+        print(f"\n[!] Ternak BARU berstatus Sakit: {', '.join(sorted(sakit_baru))}")
+    print("\nJumlah ternak per status:")
+    print_table([{'status_kesehatan': status, 'jumlah': jumlah}
+                 for status, jumlah in sorted(snapshot['per_status'].items())], ['status_kesehatan', 'jumlah'])
+    print("\nJumlah ternak per kandang:")
+    print_table(sortir_data([{'kandang_id': kandang, 'jumlah': s['jumlah'], 'sakit': s['sakit']}
+                             for kandang, s in snapshot['per_kandang'].items()], [('kandang_id', False)]),
+                ['kandang_id', 'jumlah', 'sakit'])
+    print("\nTernak sakit:")
+    print_table([dict(row, baru='BARU' if row['ternak_id'] in sakit_baru else '') for row in snapshot['sakit']],
+                ['ternak_id', 'jenis_ternak', 'kandang_id', 'berat_sekarang', 'baru'])
+    print("\nPakan hari ini:")
+    pakan = snapshot['pakan_hari_ini']
+    print_table(sortir_data([{'kandang_id': kandang, 'total_kg': f"{kg:.2f}"} for kandang, kg in pakan.items()],
+                            [('kandang_id', False)]), ['kandang_id', 'total_kg'])
+    print(f"Total: {sum(pakan.values()):.2f} kg")
+    print("\nKejadian kesehatan terbaru:")
+    print_table(snapshot['kejadian_kesehatan'], HEADERS_HEALTH)
+    pelanggaran = pelanggaran_terbaru(kosongkan=True)
+    if pelanggaran:
+        print(f"\nPelanggaran validasi data sejak dasbor terakhir dibuka ({len(pelanggaran)}):")
+        print_table(pelanggaran[-DASBOR_JUMLAH_KEJADIAN:], ['tabel', 'id', 'kolom', 'jenis', 'pesan'])
+
+def _adalah_id_riwayat(ternak_id):
+    # True jika ternak_id berbentuk ID ternak atau punya catatan di log kesehatan:
+    # indeks ternak_id file aktif, lalu daftar ternak_id arsip di manifest (partisi tidak dibuka).
+    return bool(_POLA_ID_TERNAK.fullmatch(ternak_id) or cari_semua(HEALTH_FILE, 'ternak_id', ternak_id)
+                or ternak_id in nilai_arsip(HEALTH_FILE, 'ternak_id'))
+
+def admin_cari_riwayat_kesehatan():
+    """
+    Admin mencari riwayat kesehatan spesifik.
+    Menggunakan INDEKS SEKUNDER (ternak_id -> daftar catatan).
+    """
+    clear_screen()
+    print("--- Cari Riwayat Kesehatan Ternak ---")
+    
+    # Tampilkan ternak untuk memudahkan (per halaman, tidak seluruh tabel sekaligus)
+    tampilkan_berhalaman(sumber_tabel(LIVESTOCK_FILE), HEADERS_LIVESTOCK)
+    
+    query = input("\nMasukkan ID Ternak, atau kata gejala/tindakan (contoh: demam diare): ").strip()
+    ternak_id = query.upper()
+    jumlah_hari = input("Tampilkan berapa hari terakhir? (kosong = semua): ").strip()
+    awal, akhir = None, None
+    if jumlah_hari.isdigit() and int(jumlah_hari) > 0:
+        awal, akhir = _rentang_hari_terakhir(int(jumlah_hari))
+    
+    # 1. Ambil riwayat: rentang tanggal lewat indeks tanggal log, seluruh riwayat
+    #    lewat indeks sekunder ternak_id, atau kata gejala/tindakan lewat INDEKS TEKS.
+    #    Input dianggap ID jika berbentuk ID ternak atau ada di indeks ternak_id log
+    #    kesehatan (juga ternak yang sudah dihapus/terjual), bukan dari livestock.csv.
+    if _token(query) and not _adalah_id_riwayat(ternak_id):
+        print(f"\nMenampilkan catatan kesehatan dengan gejala/tindakan: {query}")
+        hasil_pencarian = cari_teks_kesehatan(query, mode='fuzzy', awal=awal, akhir=akhir)
+    else:
+        print(f"\nMenampilkan riwayat kesehatan untuk: {ternak_id}")
+        hasil_pencarian = riwayat_kesehatan(ternak_id, awal, akhir)
+            
+    # 2. Tampilkan hasil
+    if hasil_pencarian:
+        tampilkan_berhalaman(lambda mulai, jumlah: hasil_pencarian[mulai:mulai + jumlah], HEADERS_HEALTH)
+    else:
+        print(f"\n[ Tidak ditemukan riwayat kesehatan untuk {query} ]")
+
+def admin_lihat_log_pakan():
+    """
+    Admin melihat log pemberian pakan, seluruhnya atau per rentang tanggal.
+    Rentang tanggal memakai INDEKS TANGGAL, jadi hanya bagian log yang cocok dibaca.
+    """
+    clear_screen()
+    print("--- Log Pemberian Pakan ---")
+    awal = input("Dari tanggal (YYYY-MM-DD, kosong = semua): ").strip()
+    if not awal:
+        # Streaming per halaman: log besar tidak dimuat seluruhnya ke memori
+        tampilkan_berhalaman(sumber_tabel(FEEDING_FILE), HEADERS_FEEDING)
+        return
+    akhir = input("Sampai tanggal (YYYY-MM-DD, kosong = hari ini): ").strip() or get_current_date()
+    try:
+        datetime.date.fromisoformat(awal)
+        datetime.date.fromisoformat(akhir)
+    except ValueError:
+        print("Error: Tanggal harus dalam format YYYY-MM-DD.")
+        return
+    kandang_id = input("ID Kandang (kosong = semua): ").strip()
+    hasil = cari_rentang_tanggal(FEEDING_FILE, awal, akhir, {'kandang_id': kandang_id} if kandang_id else None)
+    print(f"\n{len(hasil)} catatan pakan dari {awal} sampai {akhir}.")
+    tampilkan_berhalaman(lambda mulai, jumlah: hasil[mulai:mulai + jumlah], HEADERS_FEEDING)
+
+def admin_tambah_pekerja():
+    """Admin mendaftarkan akun pekerja baru."""
+    clear_screen()
+    print("--- Tambah Pengguna (Pekerja) Baru ---")
+    username = input("Username baru: ")
+    password = input("Password baru: ")
+    
+    user_baru = {
+        'username': username,
+        'password': hash_password(password),
+        'role': 'pekerja'
+    }
+    
+    # Cek unik + simpan dalam satu bagian terkunci (aman untuk banyak terminal)
+    with kunci_tabel(USERS_FILE):
+        # Validasi (Hash Lookup) untuk pastikan username unik
+        if cari_berdasarkan_id(USERS_FILE, username) is not None:
+            print(f"ERROR: Username '{username}' sudah ada. Registrasi dibatalkan.")
+            return
+        append_csv_row(USERS_FILE, user_baru, HEADERS_USERS)
+    print(f"Akun pekerja '{username}' berhasil didaftarkan.")
+
+def admin_impor_batch(username):
+    """Admin mengimpor file data timbangan / dispenser pakan sekaligus."""
+    clear_screen()
+    print("--- Impor Data Batch ---")
+    print("Format file: CSV (dengan header) atau JSON Lines (.jsonl)")
+    jenis = input("Jenis data [pakan/kesehatan/bobot]: ").strip().lower()
+    if jenis not in JENIS_IMPOR:
+        print("Jenis data tidak valid.")
+        return
+    path = input("Path file: ").strip()
+    impor_batch(path, jenis, username)
+
+# ---------- IMPOR BATCH ----------
+
+# Kolom yang boleh ada di file impor per jenis event, beserta tabel tujuan.
+# Kolom file impor = kolom tabel, jadi hasil ekspor tabel bisa diimpor kembali.
+# Kolom ID (log_id / record_id / timbang_id) boleh ada tetapi diabaikan: ID selalu dibuat sistem.
+JENIS_IMPOR = {
+    'pakan': (FEEDING_FILE, HEADERS_FEEDING, 'F', 'log_id'),
+    'kesehatan': (HEALTH_FILE, HEADERS_HEALTH, 'H', 'record_id'),
+    'bobot': (WEIGHT_FILE, HEADERS_WEIGHT, 'W', 'timbang_id'),
+}
+# Nama kolom lama yang masih diterima: file impor bobot versi awal memakai 'berat_sekarang'
+KOLOM_LAMA_IMPOR = {'bobot': {'berat_sekarang': 'berat'}}
+# Jumlah baris yang ditampung sebelum ditulis dengan satu bulk append
+UKURAN_CHUNK_IMPOR = 5000
+
+def _baca_baris_impor(path):
+    # Membaca file impor baris demi baris (streaming, tidak dimuat seluruhnya).
+    # Menghasilkan (nomor_baris, dict atau None, pesan_error atau None).
+    if path.lower().endswith(('.jsonl', '.ndjson', '.json')):
+        with open(path, mode='r', encoding='utf-8') as file:
+            for nomor, line in enumerate(file, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield nomor, None, f"JSON tidak valid ({e})"
+                    continue
+                if not isinstance(row, dict):
+                    yield nomor, None, "Baris JSON harus berupa object"
+                    continue
+                yield nomor, row, None
+    else:
+        with open(path, mode='r', newline='', encoding='utf-8') as file:
+            # Baris data pertama adalah baris ke-2 file (setelah header)
+            for nomor, row in enumerate(csv.DictReader(file), 2):
+                yield nomor, row, None
+
+def _teks(row, kolom):
+    value = row.get(kolom)
+    return '' if value is None else str(value).strip()
+
+def _validasi_tanggal(value):
+    # Tanggal kosong berarti hari ini; selain itu harus YYYY-MM-DD.
+    if not value:
+        return get_current_date(), None
+    try:
+        return datetime.date.fromisoformat(value).isoformat(), None
+    except ValueError:
+        return None, f"tanggal '{value}' bukan format YYYY-MM-DD"
+
+def _validasi_angka_positif(value, kolom):
+    try:
+        angka = float(value)
+    except (TypeError, ValueError):
+        return None, f"{kolom} '{value}' bukan angka"
+    if not angka > 0:
+        return None, f"{kolom} harus lebih dari 0"
+    return angka, None
+
+def _validasi_baris_impor(jenis, row, username):
+    # Memvalidasi satu baris impor. Mengembalikan (baris_bersih, None) atau (None, alasan).
+    _, headers, _, _ = JENIS_IMPOR[jenis]
+    for lama, baru in KOLOM_LAMA_IMPOR.get(jenis, {}).items():
+        if lama in row and baru not in row:
+            row = dict(row)
+            row[baru] = row.pop(lama)
+    kolom_asing = [str(k) for k in row if k not in headers]
+    if kolom_asing:
+        return None, f"kolom tidak dikenal: {', '.join(kolom_asing)}"
+    tanggal, alasan = _validasi_tanggal(_teks(row, 'tanggal'))
+    if alasan:
+        return None, alasan
+    dicatat_oleh = _teks(row, 'dicatat_oleh') or username
+
+    if jenis == 'pakan':
+        kandang_id = _teks(row, 'kandang_id').upper()
+        jenis_pakan = _teks(row, 'jenis_pakan')
+        jumlah_kg, alasan = _validasi_angka_positif(row.get('jumlah_kg'), 'jumlah_kg')
+        if not kandang_id:
+            return None, "kandang_id kosong"
+        if not jenis_pakan:
+            return None, "jenis_pakan kosong"
+        if alasan:
+            return None, alasan
+        return {'kandang_id': kandang_id, 'tanggal': tanggal, 'jenis_pakan': jenis_pakan,
+                'jumlah_kg': jumlah_kg, 'dicatat_oleh': dicatat_oleh}, None
+
+    ternak_id = _teks(row, 'ternak_id').upper()
+    if cari_berdasarkan_id(LIVESTOCK_FILE, ternak_id) is None:
+        return None, f"ternak '{ternak_id}' tidak ditemukan"
+
+    if jenis == 'kesehatan':
+        return {'ternak_id': ternak_id, 'tanggal': tanggal,
+                'gejala': _teks(row, 'gejala') or "Cek Rutin",
+                'tindakan': _teks(row, 'tindakan'), 'dicatat_oleh': dicatat_oleh}, None
+
+    berat, alasan = _validasi_angka_positif(row.get('berat'), 'berat')
+    if alasan:
+        return None, alasan
+    return _baris_penimbangan(ternak_id, berat, tanggal, dicatat_oleh), None
+
+def impor_batch(path, jenis, username='impor', tampilkan=True):
+    # Mengimpor file event (pakan / kesehatan / bobot) dalam satu jalan:
+    #   1. baris dibaca streaming dan divalidasi terhadap HEADERS_*,
+    #   2. ID dipesan per blok dan baris ditulis dengan bulk append per chunk,
+    #   3. perubahan status/berat ternak dikumpulkan lalu disimpan SEKALI di akhir.
+    # Mengembalikan ringkasan hasil (dict), atau None jika file tidak bisa dibaca.
+    filename, headers, prefix, id_column = JENIS_IMPOR[jenis]
+    mulai = time.perf_counter()
+    diterima = 0
+    ditolak = []
+    buffer = []
+    perubahan_ternak = {}
+
+    def simpan_buffer():
+        if buffer:
+            append_csv_rows_dengan_id(filename, prefix, id_column, buffer, headers)
+            buffer.clear()
+
+    try:
+        for nomor, row, error in _baca_baris_impor(path):
+            if error is None:
+                bersih, error = _validasi_baris_impor(jenis, row, username)
+            if error is not None:
+                ditolak.append({'baris': nomor, 'alasan': error, 'data': row})
+                continue
+            diterima += 1
+            if jenis == 'kesehatan' and bersih['gejala'] != "Cek Rutin":
+                perubahan_ternak.setdefault(bersih['ternak_id'], {})['status_kesehatan'] = "Sakit"
+            elif jenis == 'bobot':
+                # berat_sekarang ikut penimbangan dengan tanggal paling baru
+                lama = perubahan_ternak.get(bersih['ternak_id'])
+                if lama is None or lama['_tanggal'] <= bersih['tanggal']:
+                    perubahan_ternak[bersih['ternak_id']] = {'berat_sekarang': bersih['berat'],
+                                                             '_tanggal': bersih['tanggal']}
+            buffer.append(bersih)
+            if len(buffer) >= UKURAN_CHUNK_IMPOR:
+                simpan_buffer()
+        simpan_buffer()
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        print(f"ERROR: Tidak dapat membaca file impor {path}. {e}")
+        return None
+
+    ternak_diubah = 0
+    if jenis == 'bobot':
+        # Lewati ternak yang sudah punya penimbangan lebih baru di riwayat
+        riwayat = agregat_tabel(WEIGHT_FILE)['ternak']
+        for ternak_id in list(perubahan_ternak):
+            tanggal = datetime.date.fromisoformat(perubahan_ternak[ternak_id].pop('_tanggal')).toordinal()
+            s = riwayat.get(ternak_id)
+            if s is not None and s['akhir_tgl'] > tanggal:
+                del perubahan_ternak[ternak_id]
+    if perubahan_ternak:
+        ternak_diubah = update_csv_rows(LIVESTOCK_FILE, perubahan_ternak, HEADERS_LIVESTOCK)
+
+    durasi = time.perf_counter() - mulai
+    hasil = {
+        'jenis': jenis,
+        'file': path,
+        'diterima': diterima,
+        'ditolak': ditolak,
+        'ternak_diubah': ternak_diubah,
+        'detik': durasi,
+        'baris_per_detik': (diterima + len(ditolak)) / durasi if durasi > 0 else 0.0,
+    }
+    if ditolak:
+        hasil['file_ditolak'] = _tulis_baris_ditolak(path, ditolak)
+    if tampilkan:
+        _cetak_ringkasan_impor(hasil)
+    return hasil
+
+def _tulis_baris_ditolak(path, ditolak):
+    # Menyimpan semua baris yang ditolak ke '<file>.ditolak.csv' untuk diperbaiki.
+    path_ditolak = path + '.ditolak.csv'
+    try:
+        with open(path_ditolak, mode='w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['baris', 'alasan', 'data'])
+            for item in ditolak:
+                writer.writerow([item['baris'], item['alasan'], json.dumps(item['data'], ensure_ascii=False)])
+    except IOError as e:
+        print(f"ERROR: Tidak dapat menulis {path_ditolak}. {e}")
+        return None
+    return path_ditolak
+
+def _cetak_ringkasan_impor(hasil, maks_tampil=20):
+    print(f"\n--- Hasil Impor ({hasil['jenis']}) ---")
+    print(f"Diterima      : {hasil['diterima']} baris")
+    print(f"Ditolak       : {len(hasil['ditolak'])} baris")
+    print(f"Ternak diubah : {hasil['ternak_diubah']}")
+    print(f"Waktu         : {hasil['detik']:.3f} detik ({hasil['baris_per_detik']:.0f} baris/detik)")
+    if hasil['ditolak']:
+        print_table([{'baris': item['baris'], 'alasan': item['alasan']} for item in hasil['ditolak'][:maks_tampil]],
+                    ['baris', 'alasan'])
+        if len(hasil['ditolak']) > maks_tampil:
+            print(f"... dan {len(hasil['ditolak']) - maks_tampil} baris lainnya.")
+        if hasil.get('file_ditolak'):
+            print(f"Daftar lengkap baris yang ditolak: {hasil['file_ditolak']}")
+
+# ---------- VALIDASI INTEGRITAS DATA ----------
+
+# Aturan per tabel:
+#   pk      -> kolom ID (harus ada & unik)
+#   wajib   -> kolom yang tidak boleh kosong
+#   tanggal -> kolom tanggal YYYY-MM-DD
+#   angka   -> kolom angka > 0 dan <= batas atas
+#   pilihan -> kolom dengan daftar nilai yang diizinkan
+#   fk      -> kolom yang harus merujuk ke kunci di livestock.csv ('ternak' = ternak_id,
+#              'kandang' = kandang_id yang masih berisi ternak)
+# validasi_data() memeriksa semua tabel dalam satu pass per tabel (kunci livestock
+# dikumpulkan sekali, sambil memvalidasi livestock itu sendiri). Mode INCREMENTAL
+# memeriksa hanya baris yang berubah: pendengar perubahan (masih di dalam kunci
+# tabel penulis) menyalin baris itu dan mengecek ID gandanya lewat indeks, lalu
+# thread validator memeriksa salinan tersebut tanpa membaca tabelnya lagi.
+# Pelanggaran dicatat (pelanggaran_terbaru, ditampilkan di dasbor admin) dan
+# dicetak sebagai Warning ke stderr -- di menu interaktif hanya dicatat, agar tidak
+# menyela prompt. Mode ini opt-in untuk menu, perintah CLI dan 'serve': aktif hanya
+# jika SIMTERNAK_VALIDASI=1 diset (atau lewat atur_validasi_incremental).
+VALIDASI_INCREMENTAL = os.environ.get('SIMTERNAK_VALIDASI', '0') == '1'
+BATAS_BERAT_KG = 2000.0
+BATAS_PAKAN_KG = 10000.0   # satu catatan pakan (satu kandang, satu kali pemberian)
+ATURAN_VALIDASI = {
+    LIVESTOCK_FILE: {'pk': 'ternak_id', 'wajib': ['jenis_ternak', 'kandang_id'], 'tanggal': ['tgl_lahir'],
+                     'angka': {'berat_sekarang': BATAS_BERAT_KG}, 'format_kandang': ['kandang_id']},
+    USERS_FILE: {'pk': 'username', 'wajib': ['password'], 'pilihan': {'role': ('admin', 'pekerja')}},
+    HEALTH_FILE: {'pk': 'record_id', 'tanggal': ['tanggal'], 'fk': {'ternak_id': 'ternak'}},
+    FEEDING_FILE: {'pk': 'log_id', 'wajib': ['jenis_pakan'], 'tanggal': ['tanggal'],
+                   'angka': {'jumlah_kg': BATAS_PAKAN_KG}, 'fk': {'kandang_id': 'kandang'},
+                   'format_kandang': ['kandang_id']},
+    WEIGHT_FILE: {'pk': 'timbang_id', 'tanggal': ['tanggal'], 'angka': {'berat': BATAS_BERAT_KG},
+                  'fk': {'ternak_id': 'ternak'}},
+}
+# Urutan validasi penuh: livestock dulu, karena kuncinya dipakai tabel lain
+URUTAN_VALIDASI = [LIVESTOCK_FILE, USERS_FILE, HEALTH_FILE, FEEDING_FILE, WEIGHT_FILE]
+MAKS_PELANGGARAN_TERBARU = 1000
+
+def _pelanggaran(filename, row, kolom, jenis, pesan):
+    aturan = ATURAN_VALIDASI[os.path.basename(filename)]
+    return {'tabel': os.path.basename(filename), 'id': row.get(aturan['pk'], ''), 'kolom': kolom,
+            'nilai': row.get(kolom, ''), 'jenis': jenis, 'pesan': pesan}
+
+def _cek_baris(filename, row, kunci):
+    # Semua pelanggaran satu baris (tanpa cek ID ganda). kunci: {'ternak': set, 'kandang': dict}.
+    aturan = ATURAN_VALIDASI[os.path.basename(filename)]
+    hasil = []
+    for kolom in [aturan['pk']] + aturan.get('wajib', []):
+        if not _teks(row, kolom):
+            hasil.append(_pelanggaran(filename, row, kolom, 'wajib', f"{kolom} kosong"))
+    for kolom in aturan.get('tanggal', []):
+        nilai = _teks(row, kolom)
+        if not nilai:
+            hasil.append(_pelanggaran(filename, row, kolom, 'tanggal', f"{kolom} kosong"))
+        elif _validasi_tanggal(nilai)[1]:
+            hasil.append(_pelanggaran(filename, row, kolom, 'tanggal', _validasi_tanggal(nilai)[1]))
+    for kolom, batas in aturan.get('angka', {}).items():
+        angka, alasan = _validasi_angka_positif(row.get(kolom), kolom)
+        if alasan is None and angka > batas:
+            alasan = f"{kolom} {angka:g} melebihi batas {batas:g}"
+        if alasan:
+            hasil.append(_pelanggaran(filename, row, kolom, 'angka', alasan))
+    for kolom, pilihan in aturan.get('pilihan', {}).items():
+        if row.get(kolom) not in pilihan:
+            hasil.append(_pelanggaran(filename, row, kolom, 'pilihan',
+                                      f"{kolom} '{row.get(kolom)}' bukan salah satu dari {', '.join(pilihan)}"))
+    for kolom in aturan.get('format_kandang', []):
+        nilai = row.get(kolom) or ''
+        if nilai and nilai != nilai.strip().upper():
+            # 'k1', ' K1' dan 'K1' akan dianggap kandang yang berbeda
+            hasil.append(_pelanggaran(filename, row, kolom, 'format',
+                                      f"{kolom} '{nilai}' tidak seragam (seharusnya '{nilai.strip().upper()}')"))
+    for kolom, jenis_kunci in aturan.get('fk', {}).items():
+        nilai = row.get(kolom) or ''
+        if nilai and nilai not in kunci[jenis_kunci]:
+            pesan = (f"ternak '{nilai}' tidak ada di {LIVESTOCK_FILE}" if jenis_kunci == 'ternak'
+                     else f"kandang '{nilai}' tidak berisi ternak di {LIVESTOCK_FILE}")
+            hasil.append(_pelanggaran(filename, row, kolom, 'fk', pesan))
+    return hasil
+
+def _kunci_dari_ternak(rows):
+    kunci = {'ternak': set(), 'kandang': {}}
+    for row in rows:
+        _kunci_ubah(kunci, row, 1)
+    return kunci
+
+def _kunci_ubah(kunci, row, arah):
+    # Menambah (arah 1) / mengurangi (arah -1) satu baris livestock dari himpunan kunci.
+    if arah > 0:
+        kunci['ternak'].add(row.get('ternak_id'))
+    else:
+        kunci['ternak'].discard(row.get('ternak_id'))
+    _tambah_nilai(kunci['kandang'], row.get('kandang_id') or '', arah)
+
+def _baris_validasi(filename, arsip):
+    # Baris satu tabel untuk divalidasi, satu kali jalan: partisi arsip (jika diminta)
+    # lalu isi aktif. Cache dipakai jika sudah hangat; jika belum, CSV tanpa journal
+    # dibaca streaming (tidak dimuat ke cache sekaligus).
+    if arsip:
+        yield from baris_arsip(filename)
+    if _entri_cache_valid(filename) is None and _bisa_pakai_mmap(filename):
+        with kunci_tabel(filename, eksklusif=False):
+            with open(filename, mode='r', newline='', encoding='utf-8') as file:
+                yield from csv.DictReader(file)
+        return
+    yield from read_csv(filename)
+
+def validasi_data(tabel=None, arsip=True, konteks=None):
+    # Validasi penuh: {'pelanggaran': [...], 'baris': {tabel: jumlah}, 'per_jenis': {jenis: jumlah}}.
+    # Setiap pelanggaran: {tabel, id, kolom, nilai, jenis, pesan}.
+    # jenis: wajib / tanggal / angka / pilihan / format / fk / duplikat.
+    tabel = [os.path.basename(t) for t in tabel] if tabel else URUTAN_VALIDASI
+    pelanggaran = []
+    jumlah_baris = {}
+    kunci = {'ternak': set(), 'kandang': {}}
+    for nama in URUTAN_VALIDASI:
+        diperiksa = nama in tabel
+        if not diperiksa and nama != LIVESTOCK_FILE:
+            continue
+        filename = _tabel(konteks, nama)
+        if not (os.path.exists(filename) or _pakai_sqlite(filename)):
+            continue
+        pk = ATURAN_VALIDASI[nama]['pk']
+        terlihat = set()
+        n = 0
+        for row in _baris_validasi(filename, arsip and diperiksa):
+            if nama == LIVESTOCK_FILE:
+                _kunci_ubah(kunci, row, 1)
+            if not diperiksa:
+                continue
+            n += 1
+            pelanggaran.extend(_cek_baris(filename, row, kunci))
+            nilai_pk = row.get(pk)
+            if nilai_pk in terlihat:
+                pelanggaran.append(_pelanggaran(filename, row, pk, 'duplikat', f"{pk} '{nilai_pk}' ganda"))
+            terlihat.add(nilai_pk)
+        if diperiksa:
+            jumlah_baris[nama] = n
+    per_jenis = {}
+    for item in pelanggaran:
+        per_jenis[item['jenis']] = per_jenis.get(item['jenis'], 0) + 1
+    return {'pelanggaran': pelanggaran, 'baris': jumlah_baris, 'per_jenis': per_jenis}
+
+# ---------- VALIDASI INCREMENTAL (SETIAP PENULISAN) ----------
+
+# 'kunci': path absolut livestock.csv -> himpunan kunci dataset itu (lihat _kunci_validator)
+_VALIDATOR = {'pid': None, 'antrian': None, 'kunci': {}, 'cetak': True}
+_PELANGGARAN_TERBARU = collections.deque(maxlen=MAKS_PELANGGARAN_TERBARU)
+
+def _antrian_validator():
+    # Antrian + thread validator milik proses ini (dibuat ulang di proses hasil fork).
+    if _VALIDATOR['pid'] != os.getpid():
+        _VALIDATOR.update(pid=os.getpid(), antrian=queue.Queue(), kunci={})
+        threading.Thread(target=_jalankan_validator, args=(_VALIDATOR['antrian'],),
+                         name='simternak-validasi', daemon=True).start()
+    return _VALIDATOR['antrian']
+
+def _id_ganda(filename, dihapus, ditambah):
+    # ID baris baru (bukan versi baru dari baris lama) yang sudah dipakai baris lain.
+    # Dipanggil penulis di dalam kunci tabelnya: indeks menyimpan baris PERTAMA per ID
+    # dan belum bisa diubah thread lain, jadi baris lain dengan ID itu berarti ID ganda.
+    pk = ATURAN_VALIDASI[os.path.basename(filename)]['pk']
+    id_lama = {row.get(pk) for row in dihapus}
+    ganda = set()
+    for row in ditambah:
+        if row.get(pk) in id_lama:
+            continue
+        lama = cari_berdasarkan_id(filename, row.get(pk))
+        if lama is not None and lama is not row and lama != _normalisasi_baris(row, list(lama)):
+            ganda.add(row.get(pk))
+    return ganda
+
+def _validasi_pada_perubahan(filename, tanda_lama, tanda_baru, dihapus, ditambah):
+    # Pendengar perubahan (masih di dalam kunci tabel penulis): baris yang berubah
+    # disalin (baris di cache bisa diubah di tempat oleh penulis berikutnya) dan ID
+    # gandanya dicek sekarang; pemeriksaan lain dilakukan thread validator pada salinan itu.
+    if os.path.basename(filename) not in ATURAN_VALIDASI:
+        return
+    salinan_dihapus = None if dihapus is None else [dict(row) for row in dihapus]
+    salinan_ditambah = [dict(row) for row in ditambah]
+    ganda = None if dihapus is None else _id_ganda(filename, dihapus, ditambah)
+    _antrian_validator().put((filename, tanda_lama, tanda_baru, salinan_dihapus, salinan_ditambah, ganda))
+
+def _kunci_validator(filename, tanda_lama, tanda_baru, dihapus, ditambah):
+    # Himpunan kunci livestock dataset tempat 'filename' berada, diperbarui per
+    # perubahan selama tandanya berurutan; jika tidak (misal ditulis proses lain),
+    # dibangun ulang dari tabel.
+    livestock_file = _path_saudara(filename, LIVESTOCK_FILE)
+    kunci = _VALIDATOR['kunci'].get(_kunci_cache(livestock_file))
+    if os.path.basename(filename) == LIVESTOCK_FILE and kunci is not None and dihapus is not None \
+            and kunci['tanda'] == tanda_lama:
+        for row in dihapus:
+            _kunci_ubah(kunci, row, -1)
+        for row in ditambah:
+            _kunci_ubah(kunci, row, 1)
+        kunci['tanda'] = tanda_baru
+    elif kunci is None or kunci['tanda'] != _tanda_tabel(livestock_file):
+        with kunci_tabel(livestock_file, eksklusif=False):
+            tanda = _tanda_tabel(livestock_file)
+            kunci = dict(_kunci_dari_ternak(read_csv(livestock_file)), tanda=tanda)
+        _VALIDATOR['kunci'][_kunci_cache(livestock_file)] = kunci
+    return kunci
+
+def validasi_perubahan(filename, tanda_lama, tanda_baru, dihapus, ditambah, ganda=None):
+    # Memeriksa hanya baris yang berubah. Mengembalikan list pelanggaran.
+    # ganda: ID baris baru yang sudah dipakai (dari _id_ganda di dalam kunci penulis);
+    # None -> dicek di sini di bawah kunci bersama tabel.
+    kunci = _kunci_validator(filename, tanda_lama, tanda_baru, dihapus, ditambah)
+    pk = ATURAN_VALIDASI[os.path.basename(filename)]['pk']
+    hasil = []
+    if dihapus is None:
+        # Seluruh isi tabel diganti dan isi lamanya tidak diketahui: semua baris
+        # 'ditambah' diperiksa, ID ganda dicari di antara baris itu sendiri
+        terlihat = set()
+        for row in ditambah:
+            hasil.extend(_cek_baris(filename, row, kunci))
+            if row.get(pk) in terlihat:
+                hasil.append(_pelanggaran(filename, row, pk, 'duplikat', f"{pk} '{row.get(pk)}' ganda"))
+            terlihat.add(row.get(pk))
+        return hasil
+    if ganda is None:
+        with kunci_tabel(filename, eksklusif=False):
+            ganda = _id_ganda(filename, dihapus, ditambah)
+    id_lama = {row.get(pk) for row in dihapus}
+    for row in ditambah:
+        hasil.extend(_cek_baris(filename, row, kunci))
+        if row.get(pk) in ganda:
+            hasil.append(_pelanggaran(filename, row, pk, 'duplikat', f"{pk} '{row.get(pk)}' ganda"))
+    if os.path.basename(filename) == LIVESTOCK_FILE:
+        # Ternak yang dihapus tetapi masih punya riwayat: riwayatnya menjadi yatim
+        def jumlah_riwayat(riwayat_file, ternak_id):
+            with kunci_tabel(riwayat_file, eksklusif=False):
+                aktif = len(cari_semua(riwayat_file, 'ternak_id', ternak_id))
+            return aktif + len(cari_arsip(riwayat_file, 'ternak_id', ternak_id))
+
+        for ternak_id in id_lama - {row.get(pk) for row in ditambah}:
+            riwayat = {f: jumlah_riwayat(_path_saudara(filename, f), ternak_id) for f in (HEALTH_FILE, WEIGHT_FILE)}
+            if any(riwayat.values()):
+                hasil.append({'tabel': LIVESTOCK_FILE, 'id': ternak_id, 'kolom': pk, 'nilai': ternak_id,
+                              'jenis': 'fk', 'pesan': f"ternak '{ternak_id}' dihapus, riwayat tertinggal: "
+                              + ', '.join(f"{n} baris {f}" for f, n in riwayat.items() if n)})
+    return hasil
+
+def _jalankan_validator(antrian):
+    while True:
+        item = antrian.get()
+        try:
+            for p in validasi_perubahan(*item):
+                _PELANGGARAN_TERBARU.append(p)
+                if _VALIDATOR['cetak']:
+                    print(f"Warning: Validasi {p['tabel']} [{p['id']}] {p['pesan']}.", file=sys.stderr)
+        except Exception as e:
+            print(f"ERROR: Validasi incremental {item[0]} gagal. {e}", file=sys.stderr)
+        finally:
+            antrian.task_done()
+
+def tunggu_validasi():
+    # Menunggu semua penulisan yang sudah terjadi selesai divalidasi.
+    if _VALIDATOR['pid'] == os.getpid():
+        _VALIDATOR['antrian'].join()
+
+def pelanggaran_terbaru(kosongkan=False):
+    # Pelanggaran dari validasi incremental (paling banyak MAKS_PELANGGARAN_TERBARU).
+    hasil = list(_PELANGGARAN_TERBARU)
+    if kosongkan:
+        _PELANGGARAN_TERBARU.clear()
+    return hasil
+
+def atur_validasi_incremental(aktif, cetak=True):
+    # Menyalakan/mematikan validasi per penulisan di proses ini.
+    # cetak=False: pelanggaran hanya dicatat (pelanggaran_terbaru / dasbor admin).
+    _VALIDATOR['cetak'] = cetak
+    if aktif:
+        tambah_pendengar_perubahan(_validasi_pada_perubahan)
+    else:
+        hapus_pendengar_perubahan(_validasi_pada_perubahan)
+
+if VALIDASI_INCREMENTAL:
+    tambah_pendengar_perubahan(_validasi_pada_perubahan)
+# Didaftarkan selalu (tanpa thread validator keduanya tidak menunggu apa pun),
+# karena validasi bisa dinyalakan belakangan lewat atur_validasi_incremental.
+atexit.register(tunggu_validasi)
+if hasattr(os, 'register_at_fork'):
+    # Proses anak hasil fork mewarisi kunci yang sedang dipegang thread validator
+    # (kunci tabel, stdout) tanpa thread-nya: tunggu sampai validator diam dulu.
+    os.register_at_fork(before=tunggu_validasi)
+
+# ---------- 9. FUNGSI MENU UTAMA (Navigasi) ----------
+
+def menu_admin(username):
+    """Menampilkan menu utama untuk Admin."""
+    # Dasbor diperbarui di latar belakang selama admin login
+    dasbor = DasborAdmin().mulai()
+    try:
+        while True:
+            clear_screen()
+            print(f"--- Menu Admin (Login sebagai: {username}) ---")
+            sakit_baru = dasbor.sakit_baru()
+            if sakit_baru:
+                print(f"[!] {len(sakit_baru)} ternak baru berstatus Sakit: {', '.join(sorted(sakit_baru))} (lihat menu 9)")
+            pelanggaran = pelanggaran_terbaru()
+            if pelanggaran:
+                print(f"[!] {len(pelanggaran)} pelanggaran validasi data baru (lihat menu 9)")
+            print("1. Manajemen Ternak (Tambah/Update/Hapus)")
+            print("2. Lihat Laporan Ternak (Sortir)")
+            print("3. Lihat Riwayat Kesehatan Ternak (Search)")
+            print("4. Lihat Log Pemberian Pakan")
+            print("5. Manajemen Pengguna (Tambah Pekerja)")
+            print("6. Impor Data Batch (Pakan/Kesehatan/Bobot)")
+            print("7. Laporan Ringkasan (Pakan/Bobot/Kesehatan)")
+            print("8. Statistik Performa (Instrumentasi/Profil)")
+            print("9. Dasbor Peternakan")
+            print("10. Logout")
+        
+            pilihan = input("Pilihan [1-10]: ")
+        
+            if pilihan == '1':
+                admin_manajemen_ternak()
+            elif pilihan == '2':
+                admin_laporan_ternak()
+            elif pilihan == '3':
+                admin_cari_riwayat_kesehatan()
+            elif pilihan == '4':
+                admin_lihat_log_pakan()
+            elif pilihan == '5':
+                admin_tambah_pekerja()
+            elif pilihan == '6':
+                admin_impor_batch(username)
+            elif pilihan == '7':
+                admin_laporan_ringkasan()
+            elif pilihan == '8':
+                admin_statistik_performa()
+            elif pilihan == '9':
+                admin_dasbor(dasbor)
+            elif pilihan == '10':
+                print("Logout berhasil.")
+                break
+            else:
+                print("Pilihan tidak valid.")
+            
+            input("\nTekan Enter untuk kembali ke menu...")
+    finally:
+        dasbor.hentikan()
+
+def menu_pekerja(username):
+    """Menampilkan menu utama untuk Pekerja."""
+    while True:
+        clear_screen()
+        print(f"--- Menu Pekerja (Login sebagai: {username}) ---")
+        print("1. Catat Cek Kesehatan Harian")
+        print("2. Catat Pemberian Pakan")
+        print("3. Update Bobot Ternak (Timbang)")
+        print("4. Lihat Daftar Semua Ternak (Read-only)")
+        print("5. Logout")
+        
+        pilihan = input("Pilihan [1-5]: ")
+        
+        if pilihan == '1':
+            pekerja_catat_kesehatan(username)
+        elif pilihan == '2':
+            pekerja_catat_pakan(username)
+        elif pilihan == '3':
+            pekerja_update_bobot(username)
+        elif pilihan == '4':
+            pekerja_lihat_ternak()
+        elif pilihan == '5':
+            print("Logout berhasil.")
+            break
+        else:
+            print("Pilihan tidak valid.")
+        
+        input("\nTekan Enter untuk kembali ke menu...")
+
+# ---------- INSTRUMENTASI & PROFIL ----------
+
+# Instrumentasi membungkus fungsi-fungsi jalur panas (baca/tulis CSV, ID, sortir,
+# tampil tabel) dengan pengukur waktu. Caranya: nama global fungsi diganti dengan
+# pembungkus saat diaktifkan dan dikembalikan ke aslinya saat dinonaktifkan.
+# Karena semua pemanggil memanggil lewat nama global, saat NONAKTIF tidak ada
+# pembungkus sama sekali (biaya nol).
+#   SIMTERNAK_INSTRUMENTASI=1         -> aktif sejak program mulai
+#   SIMTERNAK_PROFIL=1                -> cProfile per aksi menu (file .prof di FOLDER_PROFIL)
+#   SIMTERNAK_STATISTIK=statistik.json -> statistik disimpan otomatis saat program keluar
+# Dari menu: Admin -> Statistik Performa.
+
+INSTRUMENTASI_AWAL = os.environ.get('SIMTERNAK_INSTRUMENTASI', '0') == '1'
+PROFIL_AWAL = os.environ.get('SIMTERNAK_PROFIL', '0') == '1'
+FILE_STATISTIK = os.environ.get('SIMTERNAK_STATISTIK')
+FOLDER_PROFIL = os.environ.get('SIMTERNAK_FOLDER_PROFIL', 'profil')
+
+# Batas atas ember histogram waktu (detik); ember terakhir untuk >= 1 detik
+BATAS_HISTOGRAM = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+LABEL_HISTOGRAM = ['<10us', '<100us', '<1ms', '<10ms', '<100ms', '<1s', '>=1s']
+KOLOM_STATISTIK_TABEL = ['parse', 'byte_dibaca', 'baris_dibaca', 'byte_ditulis', 'baris_ditulis', 'id_dibuat']
+
+AKSI_MENU_PROFIL = [
+    'admin_manajemen_ternak', 'admin_laporan_ternak', 'admin_cari_riwayat_kesehatan',
+    'admin_lihat_log_pakan', 'admin_tambah_pekerja', 'admin_impor_batch', 'admin_laporan_ringkasan',
+    'admin_dasbor',
+    'pekerja_catat_kesehatan', 'pekerja_catat_pakan', 'pekerja_update_bobot', 'pekerja_lihat_ternak',
+]
+
+_STATISTIK_FUNGSI = {}
+_STATISTIK_TABEL = {}
+_KUNCI_STATISTIK = threading.Lock()
+_FUNGSI_ASLI = {}       # nama -> fungsi asli, selama instrumentasi aktif
+_AKSI_ASLI = {}         # nama -> fungsi asli, selama profil aktif
+_PROFIL_BERJALAN = threading.local()
+
+def _ukuran_file(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def _tabel_statistik(filename):
+    # Dipanggil di bawah _KUNCI_STATISTIK.
+    nama = os.path.basename(filename)
+    t = _STATISTIK_TABEL.get(nama)
+    if t is None:
+        t = _STATISTIK_TABEL[nama] = dict.fromkeys(KOLOM_STATISTIK_TABEL, 0)
+    return t
+
+def _catat_statistik_tabel(filename, **tambahan):
+    with _KUNCI_STATISTIK:
+        t = _tabel_statistik(filename)
+        for kolom, nilai in tambahan.items():
+            t[kolom] += nilai
+
+# Pengukur tambahan per fungsi: (sebelum(args) -> konteks, sesudah(konteks, args, hasil) -> jumlah baris).
+# Byte dicatat di fungsi tingkat paling bawah saja agar tidak terhitung dua kali.
+
+def _sebelum_entri_cache(args):
+    filename = args[0]
+    return _entri_cache_valid(filename) is None
+
+def _sesudah_entri_cache(parse, args, hasil):
+    if parse and hasil is not None:
+        filename = args[0]
+        byte = 0 if _pakai_sqlite(filename) else _ukuran_file(filename) + _ukuran_file(filename + JOURNAL_SUFFIX)
+        _catat_statistik_tabel(filename, parse=1, byte_dibaca=byte)
+        return len(hasil['rows'])
+    return 0
+
+def _sesudah_read_csv(_, args, hasil):
+    _catat_statistik_tabel(args[0], baris_dibaca=len(hasil))
+    return len(hasil)
+
+def _sesudah_tulis_file_csv(_, args, hasil):
+    if hasil:
+        _catat_statistik_tabel(args[0], byte_ditulis=_ukuran_file(args[0]), baris_ditulis=len(args[1]))
+    return len(args[1])
+
+def _sebelum_tambah_ukuran(args):
+    return _ukuran_file(args[0])
+
+def _sesudah_append_csv_rows(ukuran_awal, args, hasil):
+    byte = 0 if _pakai_sqlite(args[0]) else max(0, _ukuran_file(args[0]) - ukuran_awal)
+    _catat_statistik_tabel(args[0], byte_ditulis=byte, baris_ditulis=len(args[1]))
+    return len(args[1])
+
+def _sebelum_catat_journal(args):
+    return _ukuran_file(args[0] + JOURNAL_SUFFIX)
+
+def _sesudah_catat_journal(ukuran_awal, args, hasil):
+    byte = max(0, _ukuran_file(args[0] + JOURNAL_SUFFIX) - ukuran_awal)
+    _catat_statistik_tabel(args[0], byte_ditulis=byte, baris_ditulis=len(args[2]))
+    return len(args[2])
+
+def _sesudah_sqlite_simpan(_, args, hasil):
+    _catat_statistik_tabel(args[0], baris_ditulis=len(args[2]))
+    return len(args[2])
+
+def _sesudah_generate_id(_, args, hasil):
+    _catat_statistik_tabel(args[1], id_dibuat=1)
+    return 0
+
+def _sesudah_jumlah_arg0(_, args, hasil):
+    return len(args[0])
+
+FUNGSI_INSTRUMENTASI = {
+    'read_csv': (None, _sesudah_read_csv),
+    '_entri_cache': (_sebelum_entri_cache, _sesudah_entri_cache),
+    'write_csv_overwrite': (None, None),
+    '_tulis_file_csv': (None, _sesudah_tulis_file_csv),
+    'append_csv_row': (None, None),
+    'append_csv_rows': (_sebelum_tambah_ukuran, _sesudah_append_csv_rows),
+    'update_csv_rows': (None, None),
+    '_catat_journal': (_sebelum_catat_journal, _sesudah_catat_journal),
+    '_sqlite_simpan_perubahan': (None, _sesudah_sqlite_simpan),
+    'generate_id': (None, _sesudah_generate_id),
+    'bubble_sort': (None, _sesudah_jumlah_arg0),
+    'sortir_data': (None, _sesudah_jumlah_arg0),
+    'print_table': (None, _sesudah_jumlah_arg0),
+    'print_table_stream': (None, lambda _, args, hasil: hasil[0]),
+}
+
+def _catat_waktu(nama, detik, baris):
+    with _KUNCI_STATISTIK:
+        s = _STATISTIK_FUNGSI.get(nama)
+        if s is None:
+            s = _STATISTIK_FUNGSI[nama] = {'panggilan': 0, 'total_detik': 0.0, 'maks_detik': 0.0,
+                                           'baris': 0, 'histogram': [0] * len(LABEL_HISTOGRAM)}
+        s['panggilan'] += 1
+        s['total_detik'] += detik
+        if detik > s['maks_detik']:
+            s['maks_detik'] = detik
+        s['baris'] += baris
+        s['histogram'][bisect.bisect_right(BATAS_HISTOGRAM, detik)] += 1
+
+def _bungkus_instrumentasi(nama, fungsi):
+    sebelum, sesudah = FUNGSI_INSTRUMENTASI[nama]
+
+    @functools.wraps(fungsi)
+    def pembungkus(*args, **kwargs):
+        konteks = sebelum(args) if sebelum is not None else None
+        mulai = time.perf_counter()
+        hasil = fungsi(*args, **kwargs)
+        detik = time.perf_counter() - mulai
+        _catat_waktu(nama, detik, sesudah(konteks, args, hasil) if sesudah is not None else 0)
+        return hasil
+    return pembungkus
+
+def instrumentasi_aktif():
+    return bool(_FUNGSI_ASLI)
+
+def aktifkan_instrumentasi():
+    modul = globals()
+    for nama in FUNGSI_INSTRUMENTASI:
+        if nama not in _FUNGSI_ASLI:
+            _FUNGSI_ASLI[nama] = modul[nama]
+            modul[nama] = _bungkus_instrumentasi(nama, modul[nama])
+
+def nonaktifkan_instrumentasi():
+    modul = globals()
+    for nama, fungsi in _FUNGSI_ASLI.items():
+        modul[nama] = fungsi
+    _FUNGSI_ASLI.clear()
+
+def reset_statistik():
+    with _KUNCI_STATISTIK:
+        _STATISTIK_FUNGSI.clear()
+        _STATISTIK_TABEL.clear()
+
+def ringkasan_statistik():
+    # Salinan statistik saat ini (aman dipakai saat program terus berjalan).
+    with _KUNCI_STATISTIK:
+        return {
+            'waktu': datetime.datetime.now().isoformat(timespec='seconds'),
+            'aktif': instrumentasi_aktif(),
+            'label_histogram': LABEL_HISTOGRAM,
+            'fungsi': {nama: dict(s, histogram=list(s['histogram'])) for nama, s in _STATISTIK_FUNGSI.items()},
+            'tabel': {nama: dict(t) for nama, t in _STATISTIK_TABEL.items()},
+        }
+
+def simpan_statistik(path):
+    _tulis_json_atomik(path, ringkasan_statistik())
+
+def _bungkus_profil(nama, fungsi):
+    @functools.wraps(fungsi)
+    def pembungkus(*args, **kwargs):
+        # Aksi menu yang memanggil aksi lain diprofil sebagai satu kesatuan
+        if getattr(_PROFIL_BERJALAN, 'aktif', False):
+            return fungsi(*args, **kwargs)
+        import cProfile
+        import pstats
+        profil = cProfile.Profile()
+        _PROFIL_BERJALAN.aktif = True
+        try:
+            return profil.runcall(fungsi, *args, **kwargs)
+        finally:
+            _PROFIL_BERJALAN.aktif = False
+            os.makedirs(FOLDER_PROFIL, exist_ok=True)
+            path = os.path.join(FOLDER_PROFIL, f"{nama}-{datetime.datetime.now():%Y%m%d-%H%M%S}.prof")
+            profil.dump_stats(path)
+            print(f"\n--- Profil {nama} (10 teratas, waktu kumulatif) -> {path} ---")
+            pstats.Stats(profil).sort_stats('cumulative').print_stats(10)
+    return pembungkus
+
+def profil_aktif():
+    return bool(_AKSI_ASLI)
+
+def aktifkan_profil():
+    modul = globals()
+    for nama in AKSI_MENU_PROFIL:
+        if nama not in _AKSI_ASLI:
+            _AKSI_ASLI[nama] = modul[nama]
+            modul[nama] = _bungkus_profil(nama, modul[nama])
+
+def nonaktifkan_profil():
+    modul = globals()
+    for nama, fungsi in _AKSI_ASLI.items():
+        modul[nama] = fungsi
+    _AKSI_ASLI.clear()
+
+# ---------- BENCHMARK ----------
+
+# Data sintetis dibuat deterministik dari 'seed': dataset yang sama untuk versi
+# program yang berbeda, sehingga hasil benchmark bisa dibandingkan langsung.
+JENIS_TERNAK_SINTETIS = ['Holstein', 'Limousin', 'Simmental', 'Hereford', 'Brahman', 'Bali']
+JENIS_PAKAN_SINTETIS = ['Rumput Gajah', 'Konsentrat', 'Jerami', 'Silase', 'Dedak']
+GEJALA_SINTETIS = [('batuk', 'obat batuk'), ('diare', 'elektrolit'), ('demam', 'antipiretik'),
+                   ('pincang', 'perawatan kuku'), ('nafsu makan turun', 'vitamin'), ('', 'cek rutin')]
+TERNAK_PER_KANDANG = 50
+TANGGAL_AKHIR_SINTETIS = datetime.date(2025, 12, 31)
+
+def _baris_ternak_sintetis(rng, jumlah, jumlah_kandang=60):
+    # Generator baris ternak acak dengan format seperti livestock.csv.
+    awal = datetime.date(2018, 1, 1).toordinal()
+    for i in range(1, jumlah + 1):
+        yield {
+            'ternak_id': f"S{i:03d}",
+            'jenis_ternak': rng.choice(JENIS_TERNAK_SINTETIS),
+            'tgl_lahir': datetime.date.fromordinal(awal + rng.randrange(2500)).isoformat(),
+            'berat_sekarang': f"{rng.uniform(40, 900):.1f}",
+            'status_kesehatan': 'Sakit' if rng.random() < 0.05 else 'Sehat',
+            'kandang_id': str(rng.randint(1, jumlah_kandang)),
+        }
+
+def _data_ternak_sintetis(jumlah, seed=42):
+    # Membuat data ternak acak (deterministik) dengan format seperti livestock.csv.
+    return list(_baris_ternak_sintetis(random.Random(seed), jumlah))
+
+def buat_dataset_sintetis(folder, jumlah_ternak=1000, hari=365, seed=42, interval_timbang=30,
+                          laju_cek_kesehatan=0.002, tanggal_akhir=TANGGAL_AKHIR_SINTETIS):
+    # Menulis dataset lengkap (users, livestock, log pakan, kesehatan, bobot) ke 'folder'.
+    # Log mencakup 'hari' hari sampai tanggal_akhir dan ditulis urut tanggal:
+    #   - pakan: satu catatan per kandang per hari,
+    #   - kesehatan: rata-rata laju_cek_kesehatan x jumlah_ternak catatan per hari,
+    #   - bobot: tiap ternak ditimbang setiap interval_timbang hari; berat_sekarang
+    #     di livestock.csv sama dengan hasil timbang terakhir.
+    # Semua file ditulis streaming, jadi 1 juta ternak tidak perlu muat di memori
+    # sebagai dict. Mengembalikan jumlah baris per file.
+    os.makedirs(folder, exist_ok=True)
+    jumlah_kandang = max(1, jumlah_ternak // TERNAK_PER_KANDANG)
+
+    # Tahap 1: hanya kandang & berat tiap ternak yang disimpan (array ringkas)
+    kandang = array.array('l')
+    berat = array.array('d')
+    for row in _baris_ternak_sintetis(random.Random(seed), jumlah_ternak, jumlah_kandang):
+        kandang.append(int(row['kandang_id']))
+        berat.append(float(row['berat_sekarang']))
+    isi_kandang = [0] * (jumlah_kandang + 1)
+    for k in kandang:
+        isi_kandang[k] += 1
+
+    rng = random.Random(seed + 1)
+    # ADG (kg/hari) per ternak; berat awal periode dihitung mundur dari berat akhir
+    adg = array.array('d', (rng.uniform(0.2, 1.2) for _ in range(jumlah_ternak)))
+    for i in range(jumlah_ternak):
+        berat[i] = max(20.0, berat[i] - adg[i] * hari)
+
+    pekerja = [f"pekerja{i:02d}" for i in range(1, min(10, max(1, jumlah_kandang // 10)) + 1)]
+    jumlah = {USERS_FILE: 1 + len(pekerja), LIVESTOCK_FILE: jumlah_ternak,
+              FEEDING_FILE: 0, HEALTH_FILE: 0, WEIGHT_FILE: 0}
+
+    with open(os.path.join(folder, USERS_FILE), mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADERS_USERS)
+        writer.writerow(['admin', hash_password('admin'), 'admin'])
+        for nama in pekerja:
+            writer.writerow([nama, hash_password('pekerja'), 'pekerja'])
+
+    awal = tanggal_akhir.toordinal() - hari + 1
+    with open(os.path.join(folder, FEEDING_FILE), mode='w', newline='', encoding='utf-8') as f_pakan, \
+            open(os.path.join(folder, HEALTH_FILE), mode='w', newline='', encoding='utf-8') as f_sehat, \
+            open(os.path.join(folder, WEIGHT_FILE), mode='w', newline='', encoding='utf-8') as f_bobot:
+        w_pakan, w_sehat, w_bobot = csv.writer(f_pakan), csv.writer(f_sehat), csv.writer(f_bobot)
+        w_pakan.writerow(HEADERS_FEEDING)
+        w_sehat.writerow(HEADERS_HEALTH)
+        w_bobot.writerow(HEADERS_WEIGHT)
+        for hari_ke in range(hari):
+            tanggal = datetime.date.fromordinal(awal + hari_ke).isoformat()
+            baris = []
+            for k in range(1, jumlah_kandang + 1):
+                if isi_kandang[k]:
+                    jumlah[FEEDING_FILE] += 1
+                    baris.append((f"F{jumlah[FEEDING_FILE]:03d}", str(k), tanggal, rng.choice(JENIS_PAKAN_SINTETIS),
+                                  f"{isi_kandang[k] * rng.uniform(8, 12):.1f}", rng.choice(pekerja)))
+            w_pakan.writerows(baris)
+
+            baris = []
+            for _ in range(int(jumlah_ternak * laju_cek_kesehatan + rng.random())):
+                gejala, tindakan = rng.choice(GEJALA_SINTETIS)
+                jumlah[HEALTH_FILE] += 1
+                baris.append((f"H{jumlah[HEALTH_FILE]:03d}", f"S{rng.randrange(jumlah_ternak) + 1:03d}", tanggal,
+                              gejala or "Cek Rutin", tindakan, rng.choice(pekerja)))
+            w_sehat.writerows(baris)
+
+            baris = []
+            for i in range(hari_ke % interval_timbang, jumlah_ternak, interval_timbang):
+                berat[i] += adg[i] * interval_timbang + rng.uniform(-2, 2)
+                jumlah[WEIGHT_FILE] += 1
+                baris.append((f"W{jumlah[WEIGHT_FILE]:03d}", f"S{i + 1:03d}", tanggal, f"{berat[i]:.1f}",
+                              rng.choice(pekerja)))
+            w_bobot.writerows(baris)
+
+    # Tahap 2: livestock.csv dibuat ulang dari seed yang sama, dengan berat terakhir
+    with open(os.path.join(folder, LIVESTOCK_FILE), mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=HEADERS_LIVESTOCK)
+        writer.writeheader()
+        for i, row in enumerate(_baris_ternak_sintetis(random.Random(seed), jumlah_ternak, jumlah_kandang)):
+            row['berat_sekarang'] = f"{berat[i]:.1f}"
+            writer.writerow(row)
+    return jumlah
+
+def benchmark_sortir(ukuran=(1000, 10000, 100000), batas_bubble=10000):
+    # Membandingkan bubble_sort dengan sortir_data untuk laporan berat ternak.
+    # bubble_sort adalah O(n^2): untuk ukuran di atas batas_bubble waktunya
+    # diestimasi secara kuadratik dari ukuran terbesar yang benar-benar diukur.
+    hasil = []
+    acuan = None  # (n, detik) bubble_sort terukur terbesar
+    for n in ukuran:
+        data = _data_ternak_sintetis(n)
+
+        mulai = time.perf_counter()
+        cepat = sortir_data(data, [('berat_sekarang', False)])
+        waktu_cepat = time.perf_counter() - mulai
+
+        if n <= batas_bubble:
+            mulai = time.perf_counter()
+            lambat = bubble_sort(data, key='berat_sekarang')
+            waktu_bubble = time.perf_counter() - mulai
+            acuan = (n, waktu_bubble)
+            if [r['ternak_id'] for r in lambat] != [r['ternak_id'] for r in cepat]:
+                print(f"Warning: hasil sortir berbeda pada n={n}.")
+            keterangan = 'terukur'
+        elif acuan is not None:
+            waktu_bubble = acuan[1] * (n / acuan[0]) ** 2
+            keterangan = 'estimasi'
+        else:
+            waktu_bubble = None
+            keterangan = '-'
+
+        hasil.append({
+            'n': n,
+            'bubble_sort_detik': waktu_bubble,
+            'bubble_sort_keterangan': keterangan,
+            'sortir_data_detik': waktu_cepat,
+            'percepatan': (waktu_bubble / waktu_cepat) if waktu_bubble and waktu_cepat else None,
+        })
+
+    print("\n--- Benchmark Sortir: bubble_sort vs sortir_data ---")
+    print_table([{
+        'n': r['n'],
+        'bubble_sort': f"{r['bubble_sort_detik']:.3f}s ({r['bubble_sort_keterangan']})" if r['bubble_sort_detik'] is not None else '-',
+        'sortir_data': f"{r['sortir_data_detik']:.4f}s",
+        'percepatan': f"{r['percepatan']:.0f}x" if r['percepatan'] else '-',
+    } for r in hasil], ['n', 'bubble_sort', 'sortir_data', 'percepatan'])
+    return hasil
+
+def _ukur_memori(buat):
+    # Menjalankan buat() dan mengembalikan (hasil, byte memori yang masih dipakai hasilnya).
+    tracemalloc.start()
+    try:
+        hasil = buat()
+        terpakai, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return hasil, terpakai
+
+def _ukur_waktu(fungsi, ulang=3):
+    # Waktu tercepat dari beberapa kali menjalankan fungsi().
+    terbaik = None
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        durasi = time.perf_counter() - mulai
+        terbaik = durasi if terbaik is None else min(terbaik, durasi)
+    return terbaik
+
+def benchmark_kolom(n=100000):
+    # Membandingkan list of dicts (hasil read_csv) dengan TabelTernak pada n ternak:
+    # memori yang dipakai dan waktu operasi laporan yang umum.
+    teks = io.StringIO()
+    writer = csv.DictWriter(teks, fieldnames=HEADERS_LIVESTOCK)
+    writer.writeheader()
+    writer.writerows(_data_ternak_sintetis(n))
+    teks = teks.getvalue()
+
+    baris, memori_dict = _ukur_memori(lambda: list(csv.DictReader(io.StringIO(teks))))
+    tabel, memori_kolom = _ukur_memori(lambda: TabelTernak(csv.DictReader(io.StringIO(teks))))
+
+    def rata_rata_dict():
+        jumlah, total = {}, {}
+        for row in baris:
+            berat = _dekor_nilai(row.get('berat_sekarang'), 'berat_sekarang')
+            if berat is not None:
+                jumlah[row['kandang_id']] = jumlah.get(row['kandang_id'], 0) + 1
+                total[row['kandang_id']] = total.get(row['kandang_id'], 0.0) + berat
+        return {k: (jumlah[k], total[k] / jumlah[k]) for k in jumlah}
+
+    kasus = [
+        ('sortir berat', lambda: urutan_sortir(baris, [('berat_sekarang', False)]),
+         lambda: tabel.urutan([('berat_sekarang', False)])),
+        ('sortir tgl_lahir', lambda: urutan_sortir(baris, [('tgl_lahir', True)]),
+         lambda: tabel.urutan([('tgl_lahir', True)])),
+        ('sortir kandang, berat', lambda: urutan_sortir(baris, [('kandang_id', False), ('berat_sekarang', True)]),
+         lambda: tabel.urutan([('kandang_id', False), ('berat_sekarang', True)])),
+        ('rata-rata berat/kandang', rata_rata_dict, lambda: tabel.rata_rata_berat('kandang_id')),
+    ]
+    hasil = {'n': n, 'memori_dict_byte': memori_dict, 'memori_kolom_byte': memori_kolom, 'operasi': []}
+    for nama, lewat_dict, lewat_kolom in kasus:
+        if lewat_dict() != lewat_kolom():
+            print(f"Warning: hasil '{nama}' berbeda antara list of dicts dan model kolom.")
+        hasil['operasi'].append({'operasi': nama, 'dict_detik': _ukur_waktu(lewat_dict),
+                                 'kolom_detik': _ukur_waktu(lewat_kolom)})
+
+    print(f"\n--- Benchmark Model Kolom Ternak (n={n}) ---")
+    print(f"Memori list of dicts : {memori_dict / 1e6:.1f} MB")
+    print(f"Memori model kolom   : {memori_kolom / 1e6:.1f} MB ({memori_dict / max(memori_kolom, 1):.1f}x lebih hemat)")
+    print_table([{
+        'operasi': r['operasi'],
+        'list_of_dicts': f"{r['dict_detik']:.4f}s",
+        'model_kolom': f"{r['kolom_detik']:.4f}s",
+        'percepatan': f"{r['dict_detik'] / r['kolom_detik']:.1f}x" if r['kolom_detik'] else '-',
+    } for r in hasil['operasi']], ['operasi', 'list_of_dicts', 'model_kolom', 'percepatan'])
+    return hasil
+
+def benchmark_password(daftar_iterasi=(50000, 100000, 200000, 400000, 600000), ulang=5, target_detik=0.25):
+    # Mengukur waktu satu verifikasi login untuk beberapa nilai iterasi PBKDF2,
+    # termasuk berapa login per detik yang bisa dilayani satu inti CPU
+    # (penting saat banyak pekerja login bersamaan di pergantian shift).
+    hasil = []
+    for iterasi in daftar_iterasi:
+        tersimpan = hash_password('password-uji', iterasi)
+        detik = _ukur_waktu(lambda: verifikasi_password('password-uji', tersimpan), ulang)
+        hasil.append({'iterasi': iterasi, 'detik_per_login': detik, 'login_per_detik': 1 / detik if detik else None})
+
+
+    print("\n--- Benchmark Hash Password (PBKDF2-SHA256) ---")
+    print_table([{
+        'iterasi': r['iterasi'],
+        'per_login': f"{r['detik_per_login'] * 1000:.1f} ms",
+        'login/detik/inti': f"{r['login_per_detik']:.1f}",
+        'aktif': '<--' if r['iterasi'] == PASSWORD_ITERASI else '',
+    } for r in hasil], ['iterasi', 'per_login', 'login/detik/inti', 'aktif'])
+    cocok = [r['iterasi'] for r in hasil if r['detik_per_login'] <= target_detik]
+    if cocok:
+        print(f"Iterasi terbesar dengan waktu <= {target_detik * 1000:.0f} ms: {max(cocok)} "
+              f"(atur lewat SIMTERNAK_PBKDF2_ITER)")
+    return hasil
+
+def _ukur_skenario(fungsi, ulang=3, persiapan=None, operasi=1):
+    # Menjalankan fungsi() 'ulang' kali (persiapan() sebelum tiap kali, tidak ikut diukur).
+    # Output print dari fungsi dibuang agar tidak mempengaruhi waktu.
+    waktu = []
+    for _ in range(ulang):
+        if persiapan is not None:
+            persiapan()
+        with contextlib.redirect_stdout(io.StringIO()):
+            mulai = time.perf_counter()
+            fungsi()
+            waktu.append(time.perf_counter() - mulai)
+    waktu.sort()
+    return {'ulang': ulang, 'operasi': operasi, 'detik_terbaik': waktu[0],
+            'detik_median': waktu[len(waktu) // 2], 'detik_per_operasi': waktu[len(waktu) // 2] / operasi}
+
+def _skenario_benchmark(konteks, jumlah, rng, ulang, jumlah_operasi, batas_bubble):
+    # Menghasilkan (nama, hasil ukur) per skenario untuk dataset 'konteks'.
+    # 'jumlah' adalah hasil buat_dataset_sintetis (jumlah baris per file).
+    n = jumlah[LIVESTOCK_FILE]
+    ids = [f"S{rng.randrange(n) + 1:03d}" for _ in range(jumlah_operasi)]
+    tanggal_akhir = TANGGAL_AKHIR_SINTETIS.isoformat()
+    awal_30 = (TANGGAL_AKHIR_SINTETIS - datetime.timedelta(days=29)).isoformat()
+
+    def id_dingin():
+        _ID_ALLOCATOR.clear()
+        _ID_TERSIMPAN.clear()
+        for filename in (konteks.health, konteks.feeding):
+            if os.path.exists(filename + ID_STATE_SUFFIX):
+                os.remove(filename + ID_STATE_SUFFIX)
+
+    def tampil_halaman(mulai):
+        ambil = sumber_tabel(konteks.feeding)
+        print_table_stream(ambil(mulai, BARIS_PER_HALAMAN), HEADERS_FEEDING, out=io.StringIO())
+
+    def update_status():
+        for i, ternak_id in enumerate(ids):
+            update_csv_row(konteks.livestock, ternak_id, {'status_kesehatan': 'Sakit' if i % 2 else 'Sehat'},
+                           HEADERS_LIVESTOCK)
+
+    def update_bobot():
+        for ternak_id in ids:
+            catat_penimbangan(ternak_id, round(rng.uniform(100, 900), 1), 'benchmark', tanggal_akhir, konteks)
+
+    kasus = [
+        ('read_csv livestock (dingin)', lambda: read_csv(konteks.livestock), hapus_cache_tabel, 1),
+        ('read_csv livestock (hangat)', lambda: read_csv(konteks.livestock), None, 1),
+        ('read_csv feeding_log (dingin)', lambda: read_csv(konteks.feeding), hapus_cache_tabel, 1),
+        ('generate_id health (dingin)', lambda: generate_id('H', konteks.health, 'record_id'), id_dingin, 1),
+        ('generate_id health (hangat)', lambda: [generate_id('H', konteks.health, 'record_id')
+                                                 for _ in range(jumlah_operasi)], None, jumlah_operasi),
+        ('laporan sortir berat (bubble_sort)', lambda: bubble_sort(read_csv(konteks.livestock), 'berat_sekarang'),
+         None, 1) if n <= batas_bubble else None,
+        ('laporan sortir berat (sortir_data)', lambda: sortir_data(read_csv(konteks.livestock),
+                                                                    [('berat_sekarang', False)]), None, 1),
+        ('laporan sortir kandang+berat (kolom)', lambda: laporan_sortir([('kandang_id', False),
+                                                                        ('berat_sekarang', True)], konteks), None, 1),
+        ('update status kesehatan', update_status, None, jumlah_operasi),
+        ('update bobot (penimbangan)', update_bobot, None, jumlah_operasi),
+        ('cari riwayat kesehatan (dingin, mmap)', lambda: riwayat_kesehatan(ids[0], konteks=konteks), _reset_state_memori, 1),
+        ('cari riwayat kesehatan', lambda: [riwayat_kesehatan(t, konteks=konteks) for t in ids], None, jumlah_operasi),
+        ('cari riwayat kesehatan 30 hari', lambda: [riwayat_kesehatan(t, awal_30, tanggal_akhir, konteks) for t in ids],
+         None, jumlah_operasi),
+        ('tampil log pakan halaman 1', lambda: tampil_halaman(0), hapus_cache_tabel, 1),
+        ('tampil log pakan halaman tengah', lambda: tampil_halaman(jumlah[FEEDING_FILE] // 2), hapus_cache_tabel, 1),
+        ('log pakan 30 hari terakhir', lambda: cari_rentang_tanggal(konteks.feeding, awal_30, tanggal_akhir),
+         None, 1),
+    ]
+    for item in kasus:
+        if item is None:
+            continue
+        nama, fungsi, persiapan, operasi = item
+        yield nama, _ukur_skenario(fungsi, ulang, persiapan, operasi)
+
+def _meta_benchmark(seed, hari):
+    try:
+        with open(os.path.abspath(__file__), mode='rb') as file:
+            sidik = hashlib.sha256(file.read()).hexdigest()[:12]
+    except (NameError, OSError):
+        sidik = None
+    return {
+        'waktu': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'backend': STORAGE_BACKEND,
+        'journal': JOURNAL_AKTIF,
+        'sidik_skrip': sidik,
+        'seed': seed,
+        'hari_log': hari,
+    }
+
+def benchmark_suite(ukuran=(1000, 10000, 100000), hari=365, seed=42, ulang=3, jumlah_operasi=50,
+                    batas_bubble=5000, output=None, bandingkan=None):
+    # Menjalankan semua skenario benchmark untuk tiap ukuran dataset sintetis
+    # (dibuat di folder sementara, data asli tidak disentuh). Hasil dikembalikan
+    # sebagai dict dan, jika 'output' diisi, disimpan sebagai JSON.
+    # 'bandingkan' = path JSON hasil versi sebelumnya untuk melihat regresi.
+    hasil = {'meta': _meta_benchmark(seed, hari), 'hasil': []}
+    for n in ukuran:
+        folder = tempfile.mkdtemp(prefix='simternak_bench_')
+        try:
+            mulai = time.perf_counter()
+            jumlah = buat_dataset_sintetis(folder, n, hari, seed)
+            print(f"Dataset n={n}: {jumlah[FEEDING_FILE]} log pakan, {jumlah[HEALTH_FILE]} catatan kesehatan, "
+                  f"{jumlah[WEIGHT_FILE]} penimbangan ({time.perf_counter() - mulai:.1f}s)", file=sys.stderr)
+            konteks = KonteksData(folder)
+            if STORAGE_BACKEND == 'sqlite':
+                with contextlib.redirect_stdout(io.StringIO()):
+                    migrasi_csv_ke_sqlite(konteks)
+            for nama, ukur in _skenario_benchmark(konteks, jumlah, random.Random(seed), ulang, jumlah_operasi,
+                                                  batas_bubble):
+                hasil['hasil'].append(dict({'n': n, 'skenario': nama}, **ukur))
+        finally:
+            tunggu_validasi()
+            shutil.rmtree(folder, ignore_errors=True)
+            # Ukuran berikutnya diukur dari keadaan dingin; cache folder yang dihapus dibuang
+            _reset_state_memori()
+
+    acuan = {}
+    if bandingkan:
+        with open(bandingkan, mode='r', encoding='utf-8') as file:
+            acuan = {(r['n'], r['skenario']): r for r in json.load(file)['hasil']}
+    baris = []
+    for r in hasil['hasil']:
+        lama = acuan.get((r['n'], r['skenario']))
+        if lama is not None and lama['detik_median']:
+            r['rasio_vs_acuan'] = r['detik_median'] / lama['detik_median']
+        baris.append({
+            'n': r['n'],
+            'skenario': r['skenario'],
+            'median': f"{r['detik_median'] * 1000:.2f}ms",
+            'per_operasi': f"{r['detik_per_operasi'] * 1000:.3f}ms",
+            'vs_acuan': (f"{r['rasio_vs_acuan']:.2f}x" + (" LAMBAT" if r['rasio_vs_acuan'] > 1.25 else ""))
+                        if 'rasio_vs_acuan' in r else '-',
+        })
+    print("\n--- Benchmark SimTernak ---")
+    print_table(baris, ['n', 'skenario', 'median', 'per_operasi', 'vs_acuan'])
+    if output:
+        _tulis_json_atomik(output, hasil)
+        print(f"Hasil disimpan ke {output}")
+    return hasil
+
+def _stress_worker(folder, nomor_proses, jumlah, ternak_ids):
+    # Dijalankan di proses terpisah: menambah berat setiap ternak +1.0 berkali-kali
+    # (read-modify-write atomik) dan mencatat satu catatan kesehatan per iterasi.
+    # Cache & alokator yang diwarisi dari induk (fork) tetap sah: tanda file diperiksa
+    # di setiap akses, jadi penulisan proses lain selalu terlihat.
+    konteks = KonteksData(folder)
+    for i in range(jumlah):
+        ternak_id = ternak_ids[i % len(ternak_ids)]
+        update_csv_row(konteks.livestock, ternak_id,
+                       lambda row: {'berat_sekarang': float(row['berat_sekarang']) + 1.0},
+                       HEADERS_LIVESTOCK)
+        append_csv_row_dengan_id(konteks.health, 'H', 'record_id', {
+            'ternak_id': ternak_id,
+            'tanggal': get_current_date(),
+            'gejala': 'Cek Rutin',
+            'tindakan': f"stress-{nomor_proses}-{i}",
+            'dicatat_oleh': 'stress',
+        }, HEADERS_HEALTH)
+
+def stress_test_konkurensi(jumlah_proses=4, update_per_proses=250, jumlah_ternak=5):
+    # Uji tulis bersamaan dari banyak proses pada salinan data sementara.
+    # Lulus jika tidak ada update yang hilang (total berat sesuai) dan semua
+    # record_id unik. Mengembalikan True/False.
+    # Diimpor di sini agar start-up program (menu & perintah CLI) tetap cepat
+    import multiprocessing
+
+    folder = tempfile.mkdtemp(prefix='simternak_stress_')
+    try:
+        konteks = KonteksData(folder)
+        setup_files(konteks)
+        ternak_ids = []
+        for _ in range(jumlah_ternak):
+            ternak_ids.append(append_csv_row_dengan_id(konteks.livestock, 'S', 'ternak_id', {
+                'jenis_ternak': 'Uji', 'tgl_lahir': '2024-01-01', 'berat_sekarang': 0.0,
+                'status_kesehatan': 'Sehat', 'kandang_id': '1',
+            }, HEADERS_LIVESTOCK))
+
+        mulai = time.perf_counter()
+        proses = [multiprocessing.Process(target=_stress_worker,
+                                          args=(folder, n, update_per_proses, ternak_ids))
+                  for n in range(jumlah_proses)]
+        for p in proses:
+            p.start()
+        for p in proses:
+            p.join()
+        durasi = time.perf_counter() - mulai
+
+        hapus_cache_tabel(konteks.livestock)
+        hapus_cache_tabel(konteks.health)
+        total_operasi = jumlah_proses * update_per_proses
+        total_berat = sum(float(r['berat_sekarang']) for r in read_csv(konteks.livestock))
+        record_ids = [r['record_id'] for r in read_csv(konteks.health)]
+        lulus = (total_berat == float(total_operasi)
+                 and len(record_ids) == total_operasi
+                 and len(set(record_ids)) == total_operasi
+                 and all(p.exitcode == 0 for p in proses))
+
+        print("\n--- Stress Test Konkurensi ---")
+        print(f"Proses: {jumlah_proses}, operasi/proses: {update_per_proses}")
+        print(f"Total berat: {total_berat:.1f} (harus {float(total_operasi):.1f})")
+        print(f"Catatan kesehatan: {len(record_ids)} (unik: {len(set(record_ids))}, harus {total_operasi})")
+        print(f"Throughput: {2 * total_operasi / durasi:.0f} tulis/detik")
+        print("HASIL: " + ("LULUS" if lulus else "GAGAL (ada update yang hilang)"))
+        return lulus
+    finally:
+        # Penulisan yang masih antri di validator membaca folder ini
+        tunggu_validasi()
+        shutil.rmtree(folder, ignore_errors=True)
+
+# ---------- LAPORAN KONSOLIDASI MULTI-FARM (PARALEL) ----------
+
+# Tiap farm diringkas di proses terpisah (ProcessPoolExecutor): parsing CSV dan
+# perhitungan agregat berjalan paralel di semua inti CPU. Hasil parsial berupa
+# jumlah mentah (bukan rata-rata), jadi penggabungannya cukup penjumlahan.
+
+def _ringkasan_farm(folder):
+    # Dijalankan di proses pool: ringkasan parsial satu farm.
+    konteks = KonteksData(folder)
+    if not konteks.ada():
+        raise FileNotFoundError(f"data SimTernak tidak ditemukan di {konteks.folder}")
+    ternak = agregat_tabel(konteks.livestock)['jenis']
+    pakan = agregat_tabel(konteks.feeding)['bulan']
+    kesehatan = agregat_tabel(konteks.health)['bulan']
+    pakan_bulan = {}
+    for per_bulan in pakan.values():
+        for bulan, kg in per_bulan.items():
+            _tambah_nilai(pakan_bulan, bulan, kg)
+    return {
+        'farm': konteks.nama,
+        'folder': konteks.folder,
+        'jenis': {jenis: dict(statistik) for jenis, statistik in ternak.items()},
+        'pakan_bulan': pakan_bulan,
+        'kesehatan_bulan': {bulan: isi['catatan'] for bulan, isi in kesehatan.items()},
+    }
+
+def _jumlahkan(tujuan, sumber):
+    # tujuan[k] += sumber[k] untuk semua angka di sumber.
+    for kunci, nilai in sumber.items():
+        tujuan[kunci] = round(tujuan.get(kunci, 0) + nilai, 6)
+
+def laporan_konsolidasi(folders, proses=None):
+    # Ringkasan gabungan beberapa farm: {farm: [...], jenis: {...}, pakan_bulan: {...},
+    # kesehatan_bulan: {...}, total: {...}, galat: [...]}.
+    # proses=1 -> serial di proses ini; None -> satu proses per inti CPU.
+    folders = list(folders)
+    mulai = time.perf_counter()
+    jumlah_proses = max(1, min(proses or os.cpu_count() or 1, len(folders)))
+    parsial = []
+    galat = []
+    if jumlah_proses == 1:
+        for folder in folders:
+            try:
+                parsial.append(_ringkasan_farm(folder))
+            except Exception as e:
+                galat.append({'folder': os.path.abspath(folder), 'pesan': str(e)})
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jumlah_proses) as pool:
+            futures = [pool.submit(_ringkasan_farm, folder) for folder in folders]
+            for folder, future in zip(folders, futures):
+                try:
+                    parsial.append(future.result())
+                except Exception as e:
+                    galat.append({'folder': os.path.abspath(folder), 'pesan': str(e)})
+
+    jenis, pakan_bulan, kesehatan_bulan = {}, {}, {}
+    per_farm = []
+    for r in parsial:
+        total_farm = {}
+        for kunci, statistik in r['jenis'].items():
+            _jumlahkan(jenis.setdefault(kunci, {}), statistik)
+            _jumlahkan(total_farm, statistik)
+        _jumlahkan(pakan_bulan, r['pakan_bulan'])
+        _jumlahkan(kesehatan_bulan, r['kesehatan_bulan'])
+        per_farm.append(dict(
+            {'farm': r['farm'], 'folder': r['folder']},
+            **(_statistik_bobot(total_farm) if total_farm else {'jumlah': 0}),
+            total_pakan_kg=round(sum(r['pakan_bulan'].values()), 6),
+            catatan_kesehatan=sum(r['kesehatan_bulan'].values())))
+    total = {}
+    for statistik in jenis.values():
+        _jumlahkan(total, statistik)
+    return {
+        'farm': per_farm,
+        'jenis': {kunci: _statistik_bobot(statistik) for kunci, statistik in jenis.items()},
+        'pakan_bulan': pakan_bulan,
+        'kesehatan_bulan': kesehatan_bulan,
+        'total': dict(_statistik_bobot(total) if total else {'jumlah': 0},
+                      total_pakan_kg=round(sum(pakan_bulan.values()), 6),
+                      catatan_kesehatan=sum(kesehatan_bulan.values())),
+        'galat': galat,
+        'proses': jumlah_proses,
+        'detik': time.perf_counter() - mulai,
+    }
+
+# ---------- SERVER API (HTTP/JSON) ----------
+
+# Satu proses server melayani banyak tablet lapangan:
+#   - tiap koneksi dilayani thread sendiri (ThreadingHTTPServer),
+#   - semua request berbagi cache tabel & indeks yang sama di memori (tetap hangat),
+#   - semua operasi tulis masuk ke SATU antrian dan dijalankan berurutan oleh
+#     satu thread penulis, jadi tidak ada dua thread yang menulis bersamaan.
+# _KUNCI_API menjaga cache bersama: pembaca memegangnya hanya selama mengambil
+# salinan baris dari memori, penulis selama satu operasi tulis. Verifikasi
+# password (PBKDF2), filter/sortir, baca partisi arsip, encode JSON dan I/O
+# jaringan berjalan di luar kunci, jadi request baca benar-benar paralel.
+#
+# Autentikasi: HTTP Basic (username/password yang sama dengan menu), atau token
+# sesi agar klien tidak membayar PBKDF2 di setiap request:
+#   POST   /api/sesi  (Basic)  -> {"token": ...}; kirim 'Authorization: Bearer <token>'
+#   DELETE /api/sesi  (Bearer) -> logout, token tidak berlaku lagi
+# Token tidak berlaku setelah SIMTERNAK_API_SESI detik, atau jika password user diganti.
+#   GET  /api/status                         -> cek server hidup (tanpa login)
+#   GET  /api/ternak?kandang=24&status=Sakit&sort=berat_sekarang:desc
+#   GET  /api/ternak/S005                    -> data ternak + statistik pertumbuhan
+#   GET  /api/kesehatan/S005?hari=7          -> riwayat kesehatan (admin)
+#   POST /api/pakan      {"kandang_id", "jenis_pakan", "jumlah_kg"}
+#   POST /api/kesehatan  {"ternak_id", "gejala", "tindakan"}
+#   POST /api/bobot      {"ternak_id", "berat"}
+
+API_HOST = os.environ.get('SIMTERNAK_API_HOST', '127.0.0.1')
+API_PORT = int(os.environ.get('SIMTERNAK_API_PORT', '8080'))
+BATAS_BODY_API = 64 * 1024
+SESI_API_DETIK = int(os.environ.get('SIMTERNAK_API_SESI', str(8 * 3600)))
+BATAS_SESI_API = 10000
+
+_KUNCI_API = threading.RLock()
+# sha256(token) -> {'username', 'password' (hash saat login), 'kedaluwarsa'}.
+# Token disimpan sebagai hash, jadi isi dict ini tidak bisa dipakai untuk login.
+_SESI_API = {}
+_KUNCI_SESI_API = threading.Lock()
+
+class GalatApi(Exception):
+    # Error yang dikembalikan ke klien sebagai {"error": pesan} dengan status HTTP.
+    def __init__(self, status, pesan):
+        super().__init__(pesan)
+        self.status = status
+        self.pesan = pesan
+
+class AntrianPenulis:
+    # Satu thread penulis untuk semua operasi tulis server (single-writer).
+    # kirim() memasukkan operasi ke antrian lalu menunggu hasilnya; exception
+    # dari operasi diteruskan ke thread pemanggil.
+
+    def __init__(self):
+        self._antrian = queue.Queue()
+        self._thread = threading.Thread(target=self._jalan, name='simternak-penulis', daemon=True)
+        self._thread.start()
+
+    def kirim(self, fungsi, *args):
+        hasil = concurrent.futures.Future()
+        self._antrian.put((fungsi, args, hasil))
+        return hasil.result()
+
+    def tutup(self):
+        self._antrian.put(None)
+        self._thread.join()
+
+    def _jalan(self):
+        while True:
+            tugas = self._antrian.get()
+            if tugas is None:
+                return
+            fungsi, args, hasil = tugas
+            try:
+                with _KUNCI_API:
+                    nilai = fungsi(*args)
+            except BaseException as e:
+                hasil.set_exception(e)
+            else:
+                hasil.set_result(nilai)
+
+def _baca_api(fungsi, *args):
+    # Menjalankan lookup baca di bawah _KUNCI_API dan mengembalikan SALINAN barisnya,
+    # karena dict dari cache bisa diubah penulis setelah kunci dilepas. Pengolahan
+    # lanjutan (filter, sortir, encode JSON) dilakukan pemanggil di luar kunci.
+    with _KUNCI_API:
+        hasil = fungsi(*args)
+        if isinstance(hasil, list):
+            return [dict(row) for row in hasil]
+        return dict(hasil) if isinstance(hasil, (dict, BarisTernak)) else hasil
+
+def _kunci_sesi_api(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+def buat_sesi_api(user):
+    # Membuat token sesi untuk user yang sudah login (PBKDF2 sekali per sesi).
+    token = secrets.token_urlsafe(32)
+    sekarang = time.monotonic()
+    with _KUNCI_SESI_API:
+        if len(_SESI_API) >= BATAS_SESI_API:
+            for kunci in [k for k, sesi in _SESI_API.items() if sesi['kedaluwarsa'] <= sekarang]:
+                del _SESI_API[kunci]
+            if len(_SESI_API) >= BATAS_SESI_API:
+                _SESI_API.pop(next(iter(_SESI_API)))
+        _SESI_API[_kunci_sesi_api(token)] = {'username': user['username'], 'password': user['password'],
+                                             'kedaluwarsa': sekarang + SESI_API_DETIK}
+    return token
+
+def hapus_sesi_api(token):
+    with _KUNCI_SESI_API:
+        return _SESI_API.pop(_kunci_sesi_api(token), None) is not None
+
+def _user_sesi_api(token):
+    # User pemilik token, atau None jika token tidak dikenal / kedaluwarsa /
+    # password user sudah diganti (atau user dihapus) sejak token dibuat.
+    kunci = _kunci_sesi_api(token)
+    with _KUNCI_SESI_API:
+        sesi = _SESI_API.get(kunci)
+        if sesi is not None and sesi['kedaluwarsa'] <= time.monotonic():
+            del _SESI_API[kunci]
+            sesi = None
+    if sesi is None:
+        return None
+    user = _baca_api(cari_berdasarkan_id, USERS_FILE, sesi['username'])
+    if user is None or user['password'] != sesi['password']:
+        hapus_sesi_api(token)
+        return None
+    return user
+
+def _field_api(data, kolom, wajib=True):
+    nilai = data.get(kolom)
+    if nilai is None or (isinstance(nilai, str) and not nilai.strip()):
+        if wajib:
+            raise GalatApi(400, f"field '{kolom}' wajib diisi")
+        return ''
+    return str(nilai).strip()
+
+def _angka_api(data, kolom):
+    angka, alasan = _validasi_angka_positif(data.get(kolom), kolom)
+    if alasan:
+        raise GalatApi(400, alasan)
+    return angka
+
+def _tanggal_api(nilai, kolom='tanggal'):
+    if not nilai:
+        return None
+    try:
+        return datetime.date.fromisoformat(nilai).isoformat()
+    except (TypeError, ValueError):
+        raise GalatApi(400, f"{kolom} '{nilai}' bukan format YYYY-MM-DD")
+
+def _api_tulis_pakan(data, user):
+    log_id = catat_pakan(_field_api(data, 'kandang_id').upper(), _field_api(data, 'jenis_pakan'),
+                         _angka_api(data, 'jumlah_kg'), user['username'], _tanggal_api(data.get('tanggal')))
+    return dict(cari_berdasarkan_id(FEEDING_FILE, log_id))
+
+def _api_tulis_kesehatan(data, user):
+    ternak_id = _field_api(data, 'ternak_id').upper()
+    if cari_berdasarkan_id(LIVESTOCK_FILE, ternak_id) is None:
+        raise GalatApi(404, f"ternak {ternak_id} tidak ditemukan")
+    record_id, status_diubah = catat_kesehatan(ternak_id, _field_api(data, 'gejala', wajib=False),
+                                               _field_api(data, 'tindakan', wajib=False), user['username'],
+                                               _tanggal_api(data.get('tanggal')))
+    hasil = dict(cari_berdasarkan_id(HEALTH_FILE, record_id))
+    hasil['status_sakit_diupdate'] = bool(status_diubah)
+    return hasil
+
+def _api_tulis_bobot(data, user):
+    ternak_id = _field_api(data, 'ternak_id').upper()
+    if cari_berdasarkan_id(LIVESTOCK_FILE, ternak_id) is None:
+        raise GalatApi(404, f"ternak {ternak_id} tidak ditemukan")
+    timbang_id = catat_penimbangan(ternak_id, _angka_api(data, 'berat'), user['username'],
+                                   _tanggal_api(data.get('tanggal')))
+    return {'timbang_id': timbang_id, 'ternak': dict(cari_berdasarkan_id(LIVESTOCK_FILE, ternak_id)),
+            'pertumbuhan': pertumbuhan_ternak(ternak_id)}
+
+def _api_daftar_ternak(query):
+    # Hanya pengambilan salinan baris yang memegang kunci; filter & sortir di luar kunci.
+    if query.get('kandang'):
+        data = _baca_api(cari_semua, LIVESTOCK_FILE, 'kandang_id', query['kandang'][0].upper())
+    else:
+        data = _baca_api(read_csv, LIVESTOCK_FILE)
+    if query.get('status'):
+        status = query['status'][0].lower()
+        data = [row for row in data if row['status_kesehatan'].lower() == status]
+    if query.get('sort'):
+        try:
+            kunci = [_kunci_sortir_cli(teks) for teks in query['sort']]
+        except argparse.ArgumentTypeError as e:
+            raise GalatApi(400, str(e))
+        data = sortir_data(data, kunci)
+    return data
+
+def _api_detail_ternak(ternak_id):
+    with _KUNCI_API:
+        ternak = cari_berdasarkan_id(LIVESTOCK_FILE, ternak_id)
+        if ternak is None:
+            raise GalatApi(404, f"ternak {ternak_id} tidak ditemukan")
+        return {'ternak': dict(ternak), 'pertumbuhan': pertumbuhan_ternak(ternak_id)}
+
+def _api_riwayat_kesehatan(ternak_id, query):
+    awal = _tanggal_api(query.get('dari', [None])[0], 'dari')
+    akhir = _tanggal_api(query.get('sampai', [None])[0], 'sampai')
+    if query.get('hari'):
+        hari = query['hari'][0]
+        if not hari.isdigit() or int(hari) < 1:
+            raise GalatApi(400, "hari harus bilangan bulat positif")
+        awal, akhir = _rentang_hari_terakhir(int(hari))
+    if awal or akhir:
+        return _baca_api(riwayat_kesehatan, ternak_id, awal, akhir)
+    # Seluruh riwayat: hanya bulan berjalan yang diambil di bawah kunci; partisi
+    # arsip (gzip) dibaca di luar kunci. Catatan yang pindah ke arsip di antaranya
+    # (rotasi dari proses lain) tidak ditampilkan dua kali.
+    terkini = _baca_api(cari_semua, HEALTH_FILE, 'ternak_id', ternak_id)
+    sudah = {row['record_id'] for row in terkini}
+    return [row for row in riwayat_arsip_kesehatan(ternak_id) if row['record_id'] not in sudah] + terkini
+
+# (metode, bagian path) -> (fungsi, peran yang dibutuhkan, operasi tulis?)
+# Fungsi baca menerima (user, sisa path, query) dan memegang _KUNCI_API sendiri
+# (lewat _baca_api) hanya selama menyalin baris; fungsi tulis menerima (body JSON, user).
+RUTE_API = {
+    ('GET', 'ternak'): (lambda user, sisa, query: _api_detail_ternak(sisa.upper()) if sisa
+                        else _api_daftar_ternak(query), None, False),
+    ('GET', 'kesehatan'): (lambda user, sisa, query: _api_riwayat_kesehatan(sisa.upper(), query),
+                           'admin', False),
+    ('POST', 'pakan'): (_api_tulis_pakan, None, True),
+    ('POST', 'kesehatan'): (_api_tulis_kesehatan, None, True),
+    ('POST', 'bobot'): (_api_tulis_bobot, None, True),
+}
+
+def _buat_handler_api(penulis):
+    from http.server import BaseHTTPRequestHandler
+    from urllib.parse import urlsplit, parse_qs
+
+    class HandlerApi(BaseHTTPRequestHandler):
+        # HTTP/1.1: koneksi keep-alive dipakai ulang oleh klien (latensi rendah)
+        protocol_version = 'HTTP/1.1'
+        server_version = 'SimTernak/1.0'
+
+        def do_GET(self):
+            self._layani('GET')
+
+        def do_POST(self):
+            self._layani('POST')
+
+        def do_PUT(self):
+            self._layani('PUT')
+
+        def do_DELETE(self):
+            self._layani('DELETE')
+
+        def _kirim_json(self, status, isi):
+            body = json.dumps(isi, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            if status == 401:
+                self.send_header('WWW-Authenticate', 'Basic realm="SimTernak"')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _baca_body(self):
+            panjang = int(self.headers.get('Content-Length') or 0)
+            if panjang > BATAS_BODY_API:
+                self.close_connection = True
+                raise GalatApi(413, "body terlalu besar")
+            mentah = self.rfile.read(panjang) if panjang else b''
+            try:
+                data = json.loads(mentah or b'{}')
+            except ValueError:
+                raise GalatApi(400, "body bukan JSON yang valid")
+            if not isinstance(data, dict):
+                raise GalatApi(400, "body harus berupa objek JSON")
+            return data
+
+        def _login(self, sesi=True):
+            header = self.headers.get('Authorization', '')
+            if sesi and header.startswith('Bearer '):
+                user = _user_sesi_api(header[7:].strip())
+                if user is None:
+                    raise GalatApi(401, "token sesi tidak valid atau kedaluwarsa")
+                return user
+            if not header.startswith('Basic '):
+                raise GalatApi(401, "butuh login (HTTP Basic)" if not sesi
+                               else "butuh login (HTTP Basic atau token sesi)")
+            try:
+                username, _, password = base64.b64decode(header[6:]).decode('utf-8').partition(':')
+            except ValueError:
+                raise GalatApi(401, "header Authorization tidak valid")
+            # PBKDF2 penuh di setiap login Basic, di luar _KUNCI_API
+            user = _cek_login(username, password, _KUNCI_API)
+            if user is None:
+                raise GalatApi(401, "username atau password salah")
+            return user
+
+        def _layani_sesi(self, metode):
+            if metode == 'POST':
+                self._baca_body()
+                user = self._login(sesi=False)
+                self._kirim_json(201, {'token': buat_sesi_api(user), 'berlaku_detik': SESI_API_DETIK,
+                                       'username': user['username'], 'role': user['role']})
+            elif metode == 'DELETE':
+                header = self.headers.get('Authorization', '')
+                if not header.startswith('Bearer ') or not hapus_sesi_api(header[7:].strip()):
+                    raise GalatApi(401, "token sesi tidak valid atau kedaluwarsa")
+                self._kirim_json(200, {'status': 'logout'})
+            else:
+                raise GalatApi(405, "metode tidak didukung")
+
+        def _layani(self, metode):
+            try:
+                url = urlsplit(self.path)
+                bagian = url.path.strip('/').split('/', 2)
+                if url.path.rstrip('/') == '/api/status':
+                    self._kirim_json(200, {'status': 'ok'})
+                    return
+                if len(bagian) < 2 or bagian[0] != 'api':
+                    raise GalatApi(404, "endpoint tidak ditemukan")
+                if url.path.rstrip('/') == '/api/sesi':
+                    self._layani_sesi(metode)
+                    return
+                rute = RUTE_API.get((metode, bagian[1]))
+                if rute is None:
+                    ada = any(nama == bagian[1] for _, nama in RUTE_API)
+                    raise GalatApi(405 if ada else 404, "metode tidak didukung" if ada else "endpoint tidak ditemukan")
+                fungsi, peran, tulis = rute
+                # Body dibaca dulu agar koneksi keep-alive tetap sinkron walau login gagal
+                data = self._baca_body() if metode == 'POST' else None
+                user = self._login()
+                user = {'username': user['username'], 'role': user['role']}
+                if peran is not None and user['role'] != peran:
+                    raise GalatApi(403, f"endpoint ini hanya untuk peran '{peran}'")
+                if tulis:
+                    self._kirim_json(201, penulis.kirim(fungsi, data, user))
+                else:
+                    sisa = bagian[2] if len(bagian) > 2 else ''
+                    self._kirim_json(200, fungsi(user, sisa, parse_qs(url.query)))
+            except GalatApi as e:
+                self._kirim_json(e.status, {'error': e.pesan})
+            except Exception as e:
+                self.log_error("error internal: %r", e)
+                self._kirim_json(500, {'error': "kesalahan internal server"})
+
+    return HandlerApi
+
+def jalankan_server(host=API_HOST, port=API_PORT, siap=None):
+    # Menjalankan server API sampai dihentikan (Ctrl+C). 'siap' (opsional)
+    # dipanggil dengan objek server setelah socket terbuka, berguna untuk tes.
+    from http.server import ThreadingHTTPServer
+    setup_files()
+    rotasi_log_bila_perlu()
+    # Panaskan cache & indeks sekali di awal, bukan pada request pertama
+    for filename in (LIVESTOCK_FILE, FEEDING_FILE, HEALTH_FILE, WEIGHT_FILE, USERS_FILE):
+        _entri_cache_terindeks(filename)
+    penulis = AntrianPenulis()
+    server = ThreadingHTTPServer((host, port), _buat_handler_api(penulis))
+    server.daemon_threads = True
+    print(f"SimTernak API berjalan di http://{server.server_address[0]}:{server.server_address[1]}/api/")
+    if siap is not None:
+        siap(server)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServer dihentikan.")
+    finally:
+        server.server_close()
+        penulis.tutup()
+
+# ---------- 10. FUNGSI MAIN (Titik Awal Program) ----------
+
+# Diaktifkan di sini, setelah semua fungsi yang dibungkus selesai didefinisikan
+if INSTRUMENTASI_AWAL:
+    aktifkan_instrumentasi()
+if PROFIL_AWAL:
+    aktifkan_profil()
+if FILE_STATISTIK:
+    atexit.register(simpan_statistik, FILE_STATISTIK)
+
+# ---------- MODE PERINTAH (CLI) ----------
+
+# Contoh pemakaian (tanpa menu, cocok untuk cron / pipeline shell):
+#   export SIMTERNAK_USER=admin SIMTERNAK_PASSWORD=admin
+#   python "Projek SimTernak.py" ternak list --kandang 24 --format csv
+#   python "Projek SimTernak.py" pakan log --kandang 24 --jenis-pakan Rumput --jumlah 15
+#   python "Projek SimTernak.py" kesehatan history S005 --hari 7
+#   python "Projek SimTernak.py" laporan sort --kunci kandang_id --kunci berat_sekarang:desc
+# Hasil ditulis ke stdout sebagai JSON (default) atau CSV; pesan error ke stderr.
+# Kode keluar: 0 berhasil, 1 data tidak ditemukan / tidak valid, 2 argumen salah,
+# 3 login gagal atau peran tidak diizinkan.
+
+def _kunci_sortir_cli(teks):
+    # 'kolom' atau 'kolom:desc' -> (kolom, reverse)
+    kolom, _, arah = teks.partition(':')
+    if kolom not in HEADERS_LIVESTOCK or arah not in ('', 'asc', 'desc'):
+        raise argparse.ArgumentTypeError(f"kunci sortir tidak valid: '{teks}'")
+    return kolom, arah == 'desc'
+
+def _tanggal_cli(teks):
+    try:
+        return datetime.date.fromisoformat(teks).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tanggal '{teks}' bukan format YYYY-MM-DD")
+
+def _angka_positif_cli(teks):
+    angka, alasan = _validasi_angka_positif(teks, 'nilai')
+    if alasan:
+        raise argparse.ArgumentTypeError(alasan)
+    return angka
+
+def _parser_cli():
+    umum = argparse.ArgumentParser(add_help=False)
+    # default SUPPRESS: opsi boleh ditulis sebelum atau sesudah nama perintah
+    umum.add_argument('--format', choices=['json', 'csv'], default=argparse.SUPPRESS,
+                      help="format output (default: json)")
+    umum.add_argument('--user', default=argparse.SUPPRESS, help="username (default: env SIMTERNAK_USER)")
+    umum.add_argument('--password', default=argparse.SUPPRESS, help="password (default: env SIMTERNAK_PASSWORD)")
+
+    parser = argparse.ArgumentParser(prog='simternak', parents=[umum],
+                                     description="SimTernak - mode perintah. Tanpa argumen: menu interaktif.")
+    perintah = parser.add_subparsers(dest='perintah', metavar='PERINTAH')
+
+    p = perintah.add_parser('login', parents=[umum], help="cek username/password")
+    p.set_defaults(fungsi=_cli_login, peran=None)
+
+    ternak = perintah.add_parser('ternak', help="data master ternak").add_subparsers(dest='aksi', metavar='AKSI')
+    ternak.required = True
+    p = ternak.add_parser('add', parents=[umum], help="tambah ternak")
+    p.add_argument('--jenis', required=True)
+    p.add_argument('--tgl-lahir', required=True, type=_tanggal_cli)
+    p.add_argument('--berat', required=True, type=_angka_positif_cli)
+    p.add_argument('--kandang', required=True)
+    p.add_argument('--status', default='Sehat')
+    p.set_defaults(fungsi=_cli_ternak_add, peran='admin')
+    p = ternak.add_parser('update', parents=[umum], help="ubah data ternak")
+    p.add_argument('ternak_id')
+    p.add_argument('--jenis')
+    p.add_argument('--tgl-lahir', type=_tanggal_cli)
+    p.add_argument('--berat', type=_angka_positif_cli)
+    p.add_argument('--kandang')
+    p.add_argument('--status')
+    p.set_defaults(fungsi=_cli_ternak_update, peran='admin')
+    p = ternak.add_parser('delete', parents=[umum], help="hapus ternak")
+    p.add_argument('ternak_id')
+    p.set_defaults(fungsi=_cli_ternak_delete, peran='admin')
+    p = ternak.add_parser('list', parents=[umum], help="daftar ternak")
+    p.add_argument('--kandang')
+    p.add_argument('--status')
+    p.add_argument('--sort', action='append', type=_kunci_sortir_cli, metavar='KOLOM[:desc]')
+    p.set_defaults(fungsi=_cli_ternak_list, peran=None)
+
+    pakan = perintah.add_parser('pakan', help="log pemberian pakan").add_subparsers(dest='aksi', metavar='AKSI')
+    pakan.required = True
+    p = pakan.add_parser('log', parents=[umum], help="catat pemberian pakan")
+    p.add_argument('--kandang', required=True)
+    p.add_argument('--jenis-pakan', required=True)
+    p.add_argument('--jumlah', required=True, type=_angka_positif_cli, help="kg")
+    p.add_argument('--tanggal', type=_tanggal_cli)
+    p.set_defaults(fungsi=_cli_pakan_log, peran=None, rotasi=True)
+    p = pakan.add_parser('list', parents=[umum], help="lihat log pakan per rentang tanggal")
+    p.add_argument('--dari', type=_tanggal_cli)
+    p.add_argument('--sampai', type=_tanggal_cli)
+    p.add_argument('--kandang')
+    p.set_defaults(fungsi=_cli_pakan_list, peran='admin')
+
+    kesehatan = perintah.add_parser('kesehatan', help="catatan kesehatan").add_subparsers(dest='aksi', metavar='AKSI')
+    kesehatan.required = True
+    p = kesehatan.add_parser('log', parents=[umum], help="catat cek kesehatan")
+    p.add_argument('ternak_id')
+    p.add_argument('--gejala', default='', help="kosong = Cek Rutin")
+    p.add_argument('--tindakan', default='')
+    p.add_argument('--tanggal', type=_tanggal_cli)
+    p.set_defaults(fungsi=_cli_kesehatan_log, peran=None, rotasi=True)
+    p = kesehatan.add_parser('history', parents=[umum], help="riwayat kesehatan satu ternak")
+    p.add_argument('ternak_id')
+    p.add_argument('--hari', type=int, help="hanya N hari terakhir")
+    p.add_argument('--dari', type=_tanggal_cli)
+    p.add_argument('--sampai', type=_tanggal_cli)
+    p.set_defaults(fungsi=_cli_kesehatan_history, peran='admin')
+    p = kesehatan.add_parser('search', parents=[umum], help="cari kata di gejala/tindakan")
+    p.add_argument('kata', nargs='+')
+    p.add_argument('--kolom', choices=KOLOM_INDEKS_TEKS, help="default: gejala dan tindakan")
+    p.add_argument('--mode', choices=['tepat', 'awalan', 'fuzzy'], default='awalan')
+    p.add_argument('--semua', action='store_true', help="semua kata harus cocok (default: salah satu)")
+    p.add_argument('--hari', type=int, help="hanya N hari terakhir")
+    p.add_argument('--dari', type=_tanggal_cli)
+    p.add_argument('--sampai', type=_tanggal_cli)
+    p.set_defaults(fungsi=_cli_kesehatan_search, peran='admin')
+
+    laporan = perintah.add_parser('laporan', help="laporan").add_subparsers(dest='aksi', metavar='AKSI')
+    laporan.required = True
+    p = laporan.add_parser('sort', parents=[umum], help="laporan ternak terurut")
+    p.add_argument('--kunci', action='append', type=_kunci_sortir_cli, metavar='KOLOM[:desc]', required=True)
+    p.set_defaults(fungsi=_cli_laporan_sort, peran='admin')
+
+    # Perintah pemeliharaan (dijalankan operator di mesin server, tanpa login)
+    p = perintah.add_parser('impor', help="impor file event batch")
+    p.add_argument('jenis', choices=sorted(JENIS_IMPOR))
+    p.add_argument('path')
+    p.add_argument('username', nargs='?', default='impor')
+    p.set_defaults(fungsi=_cli_impor, pemeliharaan=True, butuh_setup=True, rotasi=True)
+    for nama, fungsi, butuh_setup, keterangan in (
+            ('migrasi-sqlite', migrasi_csv_ke_sqlite, False, "pindahkan data CSV ke SQLite"),
+            ('ekspor-csv', ekspor_sqlite_ke_csv, False, "tulis ulang CSV dari SQLite"),
+            ('migrasi-password', migrasi_password, True, "hash semua password teks biasa"),
+            ('benchmark-sortir', benchmark_sortir, False, "benchmark bubble_sort vs sortir_data"),
+            ('benchmark-password', benchmark_password, False, "benchmark iterasi PBKDF2")):
+        p = perintah.add_parser(nama, help=keterangan)
+        p.set_defaults(fungsi=_cli_pemeliharaan(fungsi), pemeliharaan=True, butuh_setup=butuh_setup)
+    p = perintah.add_parser('benchmark-kolom', help="benchmark model kolom ternak")
+    p.add_argument('n', nargs='?', type=int, default=100000)
+    p.set_defaults(fungsi=_cli_benchmark_kolom, pemeliharaan=True, butuh_setup=False)
+    p = perintah.add_parser('benchmark', help="benchmark skenario utama pada dataset sintetis")
+    p.add_argument('--ukuran', type=int, nargs='+', default=[1000, 10000, 100000], metavar='N',
+                   help="jumlah ternak per dataset")
+    p.add_argument('--hari', type=int, default=365, help="panjang log (hari)")
+    p.add_argument('--seed', type=int, default=42)
+    p.add_argument('--ulang', type=int, default=3)
+    p.add_argument('--operasi', type=int, default=50, help="jumlah operasi per skenario berulang")
+    p.add_argument('--output', help="simpan hasil sebagai JSON")
+    p.add_argument('--bandingkan', metavar='JSON', help="hasil JSON versi sebelumnya")
+    p.set_defaults(fungsi=_cli_benchmark, pemeliharaan=True, butuh_setup=False)
+    p = perintah.add_parser('generate-data', help="buat dataset sintetis deterministik")
+    p.add_argument('folder')
+    p.add_argument('--ternak', type=int, default=1000)
+    p.add_argument('--hari', type=int, default=365)
+    p.add_argument('--seed', type=int, default=42)
+    p.set_defaults(fungsi=_cli_generate_data, pemeliharaan=True, butuh_setup=False)
+    p = perintah.add_parser('rotasi-log', help="pindahkan log bulan lalu ke partisi arsip")
+    p.add_argument('--bulan-aktif', metavar='YYYY-MM', help="bulan pertama yang tetap di file aktif")
+    p.add_argument('--tanpa-gzip', action='store_true', help="partisi arsip tidak dikompres")
+    p.set_defaults(fungsi=_cli_rotasi_log, pemeliharaan=True, butuh_setup=False)
+    p = perintah.add_parser('validasi', help="periksa integritas data (kunci asing, tanggal, angka, ID ganda)")
+    p.add_argument('--tabel', nargs='+', choices=URUTAN_VALIDASI, help="default: semua tabel")
+    p.add_argument('--tanpa-arsip', action='store_true', help="partisi arsip tidak ikut diperiksa")
+    p.add_argument('--maks', type=int, default=50, help="jumlah pelanggaran yang ditampilkan")
+    p.add_argument('--output', help="simpan semua pelanggaran sebagai JSON")
+    p.set_defaults(fungsi=_cli_validasi, pemeliharaan=True, butuh_setup=False)
+    p = perintah.add_parser('laporan-farm', help="laporan gabungan beberapa folder farm (paralel)")
+    p.add_argument('folder', nargs='+')
+    p.add_argument('--proses', type=int, help="jumlah proses (default: jumlah inti CPU; 1 = serial)")
+    p.add_argument('--output', help="simpan hasil sebagai JSON")
+    p.set_defaults(fungsi=_cli_laporan_farm, pemeliharaan=True, butuh_setup=False)
+    p = perintah.add_parser('serve', help="jalankan server API HTTP/JSON")
+    p.add_argument('--host', default=API_HOST)
+    p.add_argument('--port', type=int, default=API_PORT)
+    p.set_defaults(fungsi=_cli_serve, pemeliharaan=True, butuh_setup=False)
+    p = perintah.add_parser('stress-test', help="uji tulis bersamaan banyak proses")
+    p.set_defaults(fungsi=lambda args: 0 if stress_test_konkurensi() else 1, pemeliharaan=True, butuh_setup=False)
+    return parser
+
+def _cetak_keluaran(data, format_keluaran, headers=None):
+    # Menulis hasil perintah ke stdout sebagai JSON atau CSV.
+    if format_keluaran == 'json':
+        sys.stdout.write(json.dumps(data, ensure_ascii=False) + "\n")
+        return
+    rows = data if isinstance(data, list) else [data]
+    if headers is None:
+        headers = list(rows[0].keys()) if rows else []
+    writer = csv.DictWriter(sys.stdout, fieldnames=headers, extrasaction='ignore', lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(rows)
+
+def _error_cli(pesan, kode=1):
+    sys.stderr.write(f"ERROR: {pesan}\n")
+    return kode
+
+def _cli_login(args, user):
+    _cetak_keluaran({'username': user['username'], 'role': user['role']}, args.format)
+    return 0
+
+def _cli_ternak_add(args, user):
+    ternak_id = tambah_ternak(args.jenis, args.tgl_lahir, args.berat, args.kandang.upper(), args.status)
+    _cetak_keluaran(cari_berdasarkan_id(LIVESTOCK_FILE, ternak_id) or {'ternak_id': ternak_id},
+                    args.format, HEADERS_LIVESTOCK)
+    return 0
+
+def _cli_ternak_update(args, user):
+    ternak_id = args.ternak_id.upper()
+    perubahan = {kolom: nilai for kolom, nilai in (
+        ('jenis_ternak', args.jenis), ('tgl_lahir', args.tgl_lahir), ('berat_sekarang', args.berat),
+        ('kandang_id', args.kandang.upper() if args.kandang else None), ('status_kesehatan', args.status))
+        if nilai is not None}
+    if not perubahan:
+        return _error_cli("tidak ada kolom yang diubah.", 2)
+    if not ubah_ternak(ternak_id, perubahan):
+        return _error_cli(f"ternak {ternak_id} tidak ditemukan.")
+    _cetak_keluaran(cari_berdasarkan_id(LIVESTOCK_FILE, ternak_id), args.format, HEADERS_LIVESTOCK)
+    return 0
+
+def _cli_ternak_delete(args, user):
+    ternak_id = args.ternak_id.upper()
+    if not hapus_ternak(ternak_id):
+        return _error_cli(f"ternak {ternak_id} tidak ditemukan.")
+    _cetak_keluaran({'ternak_id': ternak_id, 'dihapus': True}, args.format)
+    return 0
+
+def _cli_ternak_list(args, user):
+    if args.kandang:
+        data = cari_semua(LIVESTOCK_FILE, 'kandang_id', args.kandang.upper())
+    else:
+        data = read_csv(LIVESTOCK_FILE)
+    if args.status:
+        data = [row for row in data if row['status_kesehatan'].lower() == args.status.lower()]
+    if args.sort:
+        data = sortir_data(data, args.sort)
+    _cetak_keluaran(data, args.format, HEADERS_LIVESTOCK)
+    return 0
+
+def _cli_pakan_log(args, user):
+    log_id = catat_pakan(args.kandang.upper(), args.jenis_pakan, args.jumlah, user['username'], args.tanggal)
+    _cetak_keluaran(cari_berdasarkan_id(FEEDING_FILE, log_id) or {'log_id': log_id}, args.format, HEADERS_FEEDING)
+    return 0
+
+def _cli_pakan_list(args, user):
+    saring = {'kandang_id': args.kandang.upper()} if args.kandang else None
+    _cetak_keluaran(cari_rentang_tanggal(FEEDING_FILE, args.dari, args.sampai, saring), args.format, HEADERS_FEEDING)
+    return 0
+
+def _cli_kesehatan_log(args, user):
+    ternak_id = args.ternak_id.upper()
+    if cari_berdasarkan_id(LIVESTOCK_FILE, ternak_id) is None:
+        return _error_cli(f"ternak {ternak_id} tidak ditemukan.")
+    record_id, status_diubah = catat_kesehatan(ternak_id, args.gejala, args.tindakan, user['username'], args.tanggal)
+    hasil = dict(cari_berdasarkan_id(HEALTH_FILE, record_id) or {'record_id': record_id})
+    hasil['status_sakit_diupdate'] = bool(status_diubah)
+    _cetak_keluaran(hasil, args.format, HEADERS_HEALTH + ['status_sakit_diupdate'])
+    return 0
+
+def _cli_kesehatan_history(args, user):
+    awal, akhir = args.dari, args.sampai
+    if args.hari:
+        awal, akhir = _rentang_hari_terakhir(args.hari)
+    _cetak_keluaran(riwayat_kesehatan(args.ternak_id.upper(), awal, akhir), args.format, HEADERS_HEALTH)
+    return 0
+
+def _cli_kesehatan_search(args, user):
+    awal, akhir = args.dari, args.sampai
+    if args.hari:
+        awal, akhir = _rentang_hari_terakhir(args.hari)
+    _cetak_keluaran(cari_teks_kesehatan(' '.join(args.kata), args.kolom, args.mode, awal, akhir, args.semua),
+                    args.format, HEADERS_HEALTH)
+    return 0
+
+def _cli_laporan_sort(args, user):
+    _cetak_keluaran(laporan_sortir(args.kunci), args.format, HEADERS_LIVESTOCK)
+    return 0
+
+def _cli_pemeliharaan(fungsi):
+    # Membungkus fungsi pemeliharaan tanpa argumen; hasilnya sudah dicetak sendiri.
+    def jalankan(args):
+        fungsi()
+        return 0
+    return jalankan
+
+def _cli_benchmark_kolom(args):
+    benchmark_kolom(args.n)
+    return 0
+
+def _cli_benchmark(args):
+    benchmark_suite(args.ukuran, args.hari, args.seed, args.ulang, args.operasi,
+                    output=args.output, bandingkan=args.bandingkan)
+    return 0
+
+def _cli_generate_data(args):
+    jumlah = buat_dataset_sintetis(args.folder, args.ternak, args.hari, args.seed)
+    for filename, n in jumlah.items():
+        print(f"{os.path.join(args.folder, filename)}: {n} baris")
+    return 0
+
+def _cli_rotasi_log(args):
+    if args.bulan_aktif:
+        try:
+            datetime.date.fromisoformat(args.bulan_aktif + '-01')
+        except ValueError:
+            return _error_cli(f"bulan '{args.bulan_aktif}' bukan format YYYY-MM.", 2)
+    hasil = rotasi_log_bila_perlu(args.bulan_aktif, kompres=not args.tanpa_gzip)
+    if not hasil:
+        print("Tidak ada log yang perlu diarsipkan.")
+    for filename, per_bulan in hasil.items():
+        for info in baca_manifest(filename)['partisi']:
+            if info['bulan'] in per_bulan:
+                print(f"  {info['file']}: {info['baris']} baris, {info['id_awal']}..{info['id_akhir']}, "
+                      f"{info['tgl_awal']}..{info['tgl_akhir']}")
+    return 0
+
+def _cli_validasi(args):
+    mulai = time.perf_counter()
+    hasil = validasi_data(args.tabel, arsip=not args.tanpa_arsip)
+    pelanggaran = hasil['pelanggaran']
+    print(f"--- Validasi Data ({time.perf_counter() - mulai:.2f} detik) ---")
+    print_table([{'tabel': tabel, 'baris': n,
+                  'pelanggaran': sum(1 for p in pelanggaran if p['tabel'] == tabel)}
+                 for tabel, n in hasil['baris'].items()], ['tabel', 'baris', 'pelanggaran'])
+    if pelanggaran:
+        print("\nPer jenis: " + ', '.join(f"{jenis}={n}" for jenis, n in sorted(hasil['per_jenis'].items())))
+        print_table(pelanggaran[:args.maks], ['tabel', 'id', 'kolom', 'jenis', 'pesan'])
+        if len(pelanggaran) > args.maks:
+            print(f"... dan {len(pelanggaran) - args.maks} pelanggaran lainnya.")
+    else:
+        print("\nTidak ada pelanggaran.")
+    if args.output:
+        _tulis_json_atomik(args.output, hasil)
+        print(f"Hasil disimpan ke {args.output}")
+    return 1 if pelanggaran else 0
+
+def _cli_laporan_farm(args):
+    hasil = laporan_konsolidasi(args.folder, args.proses)
+
+    def angka(value):
+        return '-' if value is None else f"{value:.2f}"
+
+    kolom = ['jumlah', 'sakit', 'persen_sakit', 'rata_berat', 'simpangan']
+
+    def baris(statistik):
+        return {'jumlah': statistik['jumlah'], 'sakit': statistik.get('sakit', 0),
+                'persen_sakit': angka(statistik.get('persen_sakit')), 'rata_berat': angka(statistik.get('rata_rata')),
+                'simpangan': angka(statistik.get('simpangan'))}
+
+    print(f"--- Laporan Gabungan {len(hasil['farm'])} Farm "
+          f"({hasil['proses']} proses, {hasil['detik']:.2f} detik) ---")
+    print_table([dict(baris(r), farm=r['farm'], total_pakan_kg=angka(r['total_pakan_kg']),
+                      catatan_kesehatan=r['catatan_kesehatan']) for r in hasil['farm']]
+                + [dict(baris(hasil['total']), farm='TOTAL', total_pakan_kg=angka(hasil['total']['total_pakan_kg']),
+                        catatan_kesehatan=hasil['total']['catatan_kesehatan'])],
+                ['farm'] + kolom + ['total_pakan_kg', 'catatan_kesehatan'])
+    print("\nBobot & kesehatan per jenis (semua farm):")
+    print_table([dict(baris(s), jenis_ternak=jenis) for jenis, s in sorted(hasil['jenis'].items())],
+                ['jenis_ternak'] + kolom)
+    print("\nPakan & catatan kesehatan per bulan (semua farm):")
+    bulan = sorted(set(hasil['pakan_bulan']) | set(hasil['kesehatan_bulan']))
+    print_table([{'bulan': b, 'pakan_kg': angka(hasil['pakan_bulan'].get(b, 0)),
+                  'catatan_kesehatan': hasil['kesehatan_bulan'].get(b, 0)} for b in bulan],
+                ['bulan', 'pakan_kg', 'catatan_kesehatan'])
+    for g in hasil['galat']:
+        print(f"ERROR: Farm {g['folder']} dilewati. {g['pesan']}", file=sys.stderr)
+    if args.output:
+        _tulis_json_atomik(args.output, hasil)
+        print(f"Hasil disimpan ke {args.output}")
+    return 1 if hasil['galat'] else 0
+
+def _cli_serve(args):
+    jalankan_server(args.host, args.port)
+    return 0
+
+def _cli_impor(args):
+    hasil = impor_batch(args.path, args.jenis, args.username)
+    return 0 if hasil is not None else 1
+
+def jalankan_cli(argv):
+    # Menjalankan satu perintah non-interaktif. Mengembalikan kode keluar.
+    parser = _parser_cli()
+    args = parser.parse_args(argv)
+    if getattr(args, 'fungsi', None) is None:
+        parser.print_help()
+        return 2
+    if getattr(args, 'pemeliharaan', False):
+        if args.butuh_setup:
+            setup_files()
+        if getattr(args, 'rotasi', False):
+            rotasi_log_bila_perlu()
+        return args.fungsi(args)
+    args.format = getattr(args, 'format', 'json')
+
+    # Pesan setup (misal "File ... berhasil dibuat") tidak boleh tercampur dengan output data
+    with contextlib.redirect_stdout(sys.stderr):
+        setup_files()
+    username = getattr(args, 'user', None) or os.environ.get('SIMTERNAK_USER')
+    password = getattr(args, 'password', None) or os.environ.get('SIMTERNAK_PASSWORD')
+    if not username or password is None:
+        return _error_cli("butuh --user/--password atau env SIMTERNAK_USER/SIMTERNAK_PASSWORD.", 3)
+    user = _cek_login(username, password)
+    if user is None:
+        return _error_cli("username atau password salah.", 3)
+    if args.peran is not None and user['role'] != args.peran and user['role'] != 'admin':
+        return _error_cli(f"perintah ini hanya untuk peran '{args.peran}'.", 3)
+    if getattr(args, 'rotasi', False):
+        # Hanya perintah yang mencatat log; perintah baca tidak memindahkan data ke arsip
+        rotasi_log_bila_perlu()
+    return args.fungsi(args, user)
+
+def main():
+    """Fungsi utama untuk menjalankan program."""
+    
+    # 1. Siapkan file CSV (buat jika belum ada), lalu arsipkan log bulan yang sudah lewat
+    setup_files()
+    rotasi_log_bila_perlu()
+    # Pelanggaran validasi hanya dicatat untuk dasbor admin, tidak dicetak di tengah menu
+    atur_validasi_incremental(VALIDASI_INCREMENTAL, cetak=False)
+    
+    # 2. Loop Program Utama
+    while True:
+        clear_screen()
+        print("========================================")
+        print("  Selamat Datang di SimTernak v1.0")
+        print("========================================")
+        print("1. Login")
+        print("2. Exit")
+        
+        pilihan_utama = input("Pilihan [1-2]: ")
+        
+        if pilihan_utama == '1':
+            # 3. Proses Login
+            username, role = fungsi_login()
+            
+            # 4. Arahkan ke menu yang sesuai
+            if role == 'admin':
+                menu_admin(username)
+            elif role == 'pekerja':
+                menu_pekerja(username)
+            else:
+                input("\nTekan Enter untuk mencoba login kembali...")
+                
+        elif pilihan_utama == '2':
+            print("Terima kasih telah menggunakan SimTernak.")
+            break
+        else:
+            print("Pilihan tidak valid.")
+            input("\nTekan Enter untuk melanjutkan...")
+
+# --- Menjalankan Program ---
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        try:
+            sys.exit(jalankan_cli(sys.argv[1:]))
+        except BrokenPipeError:
+            # Output dipotong pembaca (misal '| head'); jangan tampilkan traceback
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(1)
     main()
\ No newline at end of file
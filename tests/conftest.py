@@ -0,0 +1,29 @@
+import importlib.util
+import os
+
+import pytest
+
+# Hash password murah agar setup_files() tidak membuat tes lambat
+os.environ.setdefault('SIMTERNAK_PBKDF2_ITER', '1000')
+
+PATH_PROGRAM = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Projek SimTernak.py')
+
+
+@pytest.fixture(scope='session')
+def sim():
+    # Nama file program mengandung spasi, jadi dimuat lewat importlib.
+    spec = importlib.util.spec_from_file_location('simternak', PATH_PROGRAM)
+    modul = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modul)
+    return modul
+
+
+@pytest.fixture
+def data(sim, tmp_path, monkeypatch):
+    # Folder data kosong (hanya header + akun admin) sebagai direktori kerja tes.
+    monkeypatch.chdir(tmp_path)
+    sim._reset_state_memori()
+    sim.setup_files()
+    yield tmp_path
+    sim.tunggu_validasi()
+    sim._reset_state_memori()
@@ -0,0 +1,94 @@
+import datetime
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+LOGIN = ['--user', 'admin', '--password', 'admin']
+
+
+@pytest.fixture
+def log_bulan_lalu(sim, data):
+    # Satu catatan pakan bulan lalu dan satu bulan ini di file aktif.
+    hari_ini = datetime.date.today()
+    bulan_lalu = (hari_ini.replace(day=1) - datetime.timedelta(days=1)).isoformat()
+    sim.catat_pakan('1', 'Rumput', 10, 'tes', bulan_lalu)
+    sim.catat_pakan('1', 'Rumput', 12, 'tes', hari_ini.isoformat())
+    return bulan_lalu
+
+
+def test_perintah_baca_tidak_merotasi_log(sim, log_bulan_lalu, capsys):
+    assert sim.jalankan_cli(['pakan', 'list', '--format', 'csv'] + LOGIN) == 0
+    assert not os.path.exists(sim.ARSIP_FOLDER)
+    assert len(sim.read_csv(sim.FEEDING_FILE)) == 2
+    assert 'F001' in capsys.readouterr().out
+
+
+def test_perintah_tulis_merotasi_log(sim, log_bulan_lalu, capsys):
+    assert sim.jalankan_cli(['pakan', 'log', '--kandang', '1', '--jenis-pakan', 'Rumput',
+                             '--jumlah', '5'] + LOGIN) == 0
+    assert [info['bulan'] for info in sim.baca_manifest(sim.FEEDING_FILE)['partisi']] == [log_bulan_lalu[:7]]
+    assert [r['log_id'] for r in sim.read_csv(sim.FEEDING_FILE)] == ['F002', 'F003']
+    # Riwayat lengkap tetap terbaca lewat partisi arsip
+    assert len(sim.cari_rentang_tanggal(sim.FEEDING_FILE)) == 3
+    # Pesan arsip tidak tercampur dengan output JSON di stdout
+    keluaran = capsys.readouterr()
+    assert json.loads(keluaran.out)['log_id'] == 'F003'
+    assert 'Arsip feeding_log.csv' in keluaran.err
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='mode file POSIX')
+def test_partisi_dan_pendamping_mengikuti_mode_file_data(sim, log_bulan_lalu):
+    os.chmod(sim.FEEDING_FILE, 0o640)
+    sim.rotasi_log_bila_perlu()
+    sim.laporan_pakan()
+    partisi = [os.path.join(sim.ARSIP_FOLDER, nama) for nama in os.listdir(sim.ARSIP_FOLDER)]
+    for path in partisi + [sim.FEEDING_FILE + sim.MANIFEST_SUFFIX, sim.FEEDING_FILE + sim.AGREGAT_SUFFIX]:
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o640, path
+
+
+def test_ternak_id_arsip_dari_manifest(sim, data, monkeypatch):
+    bulan_lalu = (datetime.date.today().replace(day=1) - datetime.timedelta(days=1)).isoformat()
+    sim.catat_kesehatan('SAPI-LAMA', '', 'cek', 'tes', bulan_lalu)
+    sim.rotasi_log_bila_perlu()
+    assert sim.read_csv(sim.HEALTH_FILE) == []
+    assert sim.baca_manifest(sim.HEALTH_FILE)['nilai'] == {'ternak_id': ['SAPI-LAMA']}
+
+    def tidak_boleh_dibuka(*args):
+        raise AssertionError('partisi arsip dibuka')
+
+    monkeypatch.setattr(sim, '_baca_partisi', tidak_boleh_dibuka)
+    assert sim._adalah_id_riwayat('SAPI-LAMA')
+    assert not sim._adalah_id_riwayat('demam')
+
+
+def test_manifest_lama_dilengkapi_sekali(sim, data):
+    bulan_lalu = (datetime.date.today().replace(day=1) - datetime.timedelta(days=1)).isoformat()
+    sim.catat_kesehatan('SAPI-LAMA', '', 'cek', 'tes', bulan_lalu)
+    sim.rotasi_log_bila_perlu()
+    path = sim.HEALTH_FILE + sim.MANIFEST_SUFFIX
+    with open(path, encoding='utf-8') as file:
+        manifest = json.load(file)
+    del manifest['nilai']
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file)
+    assert sim.nilai_arsip(sim.HEALTH_FILE, 'ternak_id') == {'SAPI-LAMA'}
+    with open(path, encoding='utf-8') as file:
+        assert json.load(file)['nilai'] == {'ternak_id': ['SAPI-LAMA']}
+
+
+def test_indeks_teks_hanya_posting_dan_mencari_arsip(sim, data):
+    bulan_lalu = (datetime.date.today().replace(day=1) - datetime.timedelta(days=1)).isoformat()
+    lama, _ = sim.catat_kesehatan('S001', 'demam tinggi', 'antipiretik', 'tes', bulan_lalu)
+    sim.rotasi_log_bila_perlu()
+    baru, _ = sim.catat_kesehatan('S002', 'demam ringan', 'istirahat', 'tes')
+    assert [r['record_id'] for r in sim.cari_teks_kesehatan('demam')] == [lama, baru]
+    with open(sim.HEALTH_FILE + sim.INDEKS_TEKS_SUFFIX, encoding='utf-8') as file:
+        snapshot = json.load(file)
+    # Isi catatan tidak disalin ke indeks: baris diambil dari tabel / partisi arsip
+    assert set(snapshot['data']) == {'kata'}
+    sim._INDEKS_TEKS.clear()
+    hasil = sim.cari_teks_kesehatan('antipiretik', kolom='tindakan')
+    assert [(r['record_id'], r['gejala']) for r in hasil] == [(lama, 'demam tinggi')]
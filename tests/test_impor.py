@@ -0,0 +1,26 @@
+import shutil
+
+
+def test_ekspor_riwayat_bobot_bisa_diimpor_kembali(sim, data):
+    sim.tambah_ternak('Sapi', '2024-01-01', 90.0, '1')
+    sim.catat_penimbangan('S001', 100.0, 'tes', '2025-01-01')
+    sim.catat_penimbangan('S001', 110.0, 'tes', '2025-01-10')
+    shutil.copy(sim.WEIGHT_FILE, 'ekspor.csv')
+
+    hasil = sim.impor_batch('ekspor.csv', 'bobot', tampilkan=False)
+    assert hasil['diterima'] == 2 and hasil['ditolak'] == []
+    # timbang_id di file diabaikan: ID baru dibuat sistem
+    assert [r['timbang_id'] for r in sim.read_csv(sim.WEIGHT_FILE)] == ['W001', 'W002', 'W003', 'W004']
+
+
+def test_impor_bobot_kolom_lama_dan_kolom_asing(sim, data):
+    sim.tambah_ternak('Sapi', '2024-01-01', 90.0, '1')
+    with open('lama.csv', 'w', encoding='utf-8') as file:
+        file.write('ternak_id,tanggal,berat_sekarang\nS001,2025-02-01,321\n')
+    assert sim.impor_batch('lama.csv', 'bobot', tampilkan=False)['ternak_diubah'] == 1
+    assert sim.cari_berdasarkan_id(sim.LIVESTOCK_FILE, 'S001')['berat_sekarang'] == '321.0'
+
+    with open('asing.csv', 'w', encoding='utf-8') as file:
+        file.write('ternak_id,tanggal,berat,catatan\nS001,2025-02-02,322,x\n')
+    hasil = sim.impor_batch('asing.csv', 'bobot', tampilkan=False)
+    assert hasil['diterima'] == 0 and 'catatan' in hasil['ditolak'][0]['alasan']
@@ -0,0 +1,92 @@
+import base64
+import json
+import subprocess
+import sys
+import threading
+import urllib.request
+
+import pytest
+
+
+def test_stress_test_multi_proses(sim, capsys):
+    assert sim.stress_test_konkurensi(jumlah_proses=3, update_per_proses=40, jumlah_ternak=3)
+    assert 'HASIL: LULUS' in capsys.readouterr().out
+
+
+def test_cache_bersama_dibaca_banyak_thread(sim, data):
+    for _ in range(5):
+        sim.tambah_ternak('Sapi', '2024-01-01', 100.0, '1')
+    for putaran in range(20):
+        sim.cari_berdasarkan_id(sim.LIVESTOCK_FILE, 'S001')
+        # Proses lain menambah baris: semua thread melihat ekor baru yang sama
+        with open(sim.LIVESTOCK_FILE, 'a', newline='', encoding='utf-8') as file:
+            file.write(f"X{putaran:03d},Sapi,2024-01-01,1.0,Sehat,2\r\n")
+        mulai = threading.Barrier(8)
+
+        def baca():
+            mulai.wait()
+            sim.read_csv(sim.LIVESTOCK_FILE)
+            sim.cari_semua(sim.LIVESTOCK_FILE, 'kandang_id', '2')
+
+        threads = [threading.Thread(target=baca) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        ids = [r['ternak_id'] for r in sim.read_csv(sim.LIVESTOCK_FILE)]
+        assert len(ids) == len(set(ids)) == 6 + putaran
+        assert len(sim.cari_semua(sim.LIVESTOCK_FILE, 'kandang_id', '2')) == putaran + 1
+
+
+def _kunci_bersama_dari_proses_lain(path):
+    # True jika proses lain bisa memperoleh kunci bersama pada file kunci tabel saat ini.
+    kode = ("import fcntl, sys\n"
+            "f = open(sys.argv[1], 'a+b')\n"
+            "try:\n"
+            "    fcntl.flock(f.fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)\n"
+            "except OSError:\n"
+            "    sys.exit(1)\n")
+    return subprocess.run([sys.executable, '-c', kode, path]).returncode == 0
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='memakai fcntl.flock')
+def test_kunci_bersama_dinaikkan_ke_eksklusif(sim, data):
+    path = sim._kunci_cache(sim.LIVESTOCK_FILE) + '.lock'
+    with sim.kunci_tabel(sim.LIVESTOCK_FILE, eksklusif=False):
+        assert _kunci_bersama_dari_proses_lain(path)
+        with sim.kunci_tabel(sim.LIVESTOCK_FILE):
+            assert not _kunci_bersama_dari_proses_lain(path)
+        # Kembali ke kunci bersama setelah bagian dalam selesai
+        assert _kunci_bersama_dari_proses_lain(path)
+    assert _kunci_bersama_dari_proses_lain(path)
+
+
+def test_server_api_lewat_hook_siap(sim, data):
+    sim.tambah_ternak('Sapi', '2024-01-01', 100.0, '7')
+    siap = threading.Event()
+    server = {}
+
+    def pasang(s):
+        server['s'] = s
+        siap.set()
+
+    thread = threading.Thread(target=sim.jalankan_server, args=('127.0.0.1', 0, pasang), daemon=True)
+    thread.start()
+    assert siap.wait(10)
+    alamat = f"http://127.0.0.1:{server['s'].server_address[1]}/api"
+
+    def minta(metode, path, header=None):
+        req = urllib.request.Request(alamat + path, method=metode, headers=header or {})
+        with urllib.request.urlopen(req, timeout=10) as respon:
+            return respon.status, json.loads(respon.read())
+
+    try:
+        assert minta('GET', '/status')[0] == 200
+        basic = {'Authorization': 'Basic ' + base64.b64encode(b'admin:admin').decode()}
+        status, sesi = minta('POST', '/sesi', basic)
+        assert status == 201
+        status, ternak = minta('GET', '/ternak?kandang=7', {'Authorization': 'Bearer ' + sesi['token']})
+        assert status == 200 and [r['ternak_id'] for r in ternak] == ['S001']
+    finally:
+        server['s'].shutdown()
+        thread.join(10)
@@ -0,0 +1,83 @@
+import os
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def dua_farm(sim, tmp_path):
+    farm = []
+    for nama, jumlah_ternak in (('farm_a', 20), ('farm_b', 35)):
+        folder = tmp_path / nama
+        folder.mkdir()
+        sim.buat_dataset_sintetis(str(folder), jumlah_ternak, 10, seed=1)
+        farm.append(sim.KonteksData(folder))
+    yield farm
+    sim.tunggu_validasi()
+    sim._reset_state_memori()
+
+
+def test_konteks_menyimpan_path_absolut(sim, tmp_path):
+    konteks = sim.KonteksData(tmp_path)
+    assert konteks.livestock == os.path.join(str(tmp_path), sim.LIVESTOCK_FILE)
+    assert all(os.path.isabs(p) for p in (konteks.users, konteks.health, konteks.feeding,
+                                           konteks.weight, konteks.db))
+    assert not konteks.ada()
+
+
+def test_dua_konteks_dipakai_bersamaan_dari_thread(sim, dua_farm, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mulai = threading.Barrier(len(dua_farm))
+    hasil = {}
+    galat = []
+
+    def kerja(konteks):
+        try:
+            mulai.wait()
+            for _ in range(10):
+                sim.append_csv_row_dengan_id(konteks.feeding, 'F', 'log_id', {
+                    'kandang_id': '1', 'tanggal': '2025-12-31', 'jenis_pakan': 'Uji', 'jumlah_kg': 1,
+                    'dicatat_oleh': konteks.nama}, sim.HEADERS_FEEDING)
+            sim.catat_penimbangan('S001', 321.0, konteks.nama, '2026-01-01', konteks)
+            hasil[konteks.nama] = {
+                'ternak': len(sim.read_csv(konteks.livestock)),
+                'uji': len(sim.cari_semua(konteks.feeding, 'kandang_id', '1')),
+                'pakan': sim.laporan_pakan('hari', konteks)['1']['2025-12-31'],
+            }
+        except Exception as e:
+            galat.append(e)
+
+    threads = [threading.Thread(target=kerja, args=(k,)) for k in dua_farm]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not galat
+    assert os.getcwd() == str(tmp_path)
+    assert not os.path.exists(sim.LIVESTOCK_FILE)
+    a, b = dua_farm
+    assert hasil[a.nama]['ternak'] == 20 and hasil[b.nama]['ternak'] == 35
+    # Tulisan satu farm tidak muncul di farm lain
+    for konteks in dua_farm:
+        oleh = {r['dicatat_oleh'] for r in sim.read_csv(konteks.feeding) if r['jenis_pakan'] == 'Uji'}
+        assert oleh == {konteks.nama}
+        assert sim.cari_berdasarkan_id(konteks.livestock, 'S001')['berat_sekarang'] == '321.0'
+
+
+def test_sqlite_per_folder_farm(sim, dua_farm, monkeypatch):
+    monkeypatch.setattr(sim, 'STORAGE_BACKEND', 'sqlite')
+    for konteks in dua_farm:
+        sim.migrasi_csv_ke_sqlite(konteks)
+        assert os.path.exists(konteks.db)
+    a, b = dua_farm
+    assert len(sim.read_csv(a.livestock)) == 20
+    assert len(sim.read_csv(b.livestock)) == 35
+    assert sim.generate_id('S', b.livestock, 'ternak_id') == 'S036'
+
+
+def test_konsolidasi_tidak_mengubah_folder_kerja(sim, dua_farm, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    hasil = sim.laporan_konsolidasi([k.folder for k in dua_farm], proses=1)
+    assert not hasil['galat']
+    assert [f['jumlah'] for f in hasil['farm']] == [20, 35]
+    assert os.getcwd() == str(tmp_path)
@@ -0,0 +1,143 @@
+import csv
+import os
+
+
+def _tambah_ternak(sim, jumlah, kandang_id='1'):
+    return [sim.tambah_ternak('Sapi', '2024-01-01', 100.0, kandang_id) for _ in range(jumlah)]
+
+
+def _isi_csv(filename):
+    with open(filename, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+
+# ---------- JOURNAL & KOMPAKSI ----------
+
+def test_update_dan_hapus_masuk_journal(sim, data):
+    _tambah_ternak(sim, 3)
+    assert sim.ubah_ternak('S001', {'berat_sekarang': 150.5})
+    assert sim.hapus_ternak('S002')
+
+    journal = sim.LIVESTOCK_FILE + sim.JOURNAL_SUFFIX
+    assert os.path.exists(journal)
+    # CSV utama belum ditulis ulang; isi terkini = CSV + journal
+    assert [r['ternak_id'] for r in _isi_csv(sim.LIVESTOCK_FILE)] == ['S001', 'S002', 'S003']
+    sim.hapus_cache_tabel()
+    rows = sim.read_csv(sim.LIVESTOCK_FILE)
+    assert [r['ternak_id'] for r in rows] == ['S001', 'S003']
+    assert rows[0]['berat_sekarang'] == '150.5'
+
+
+def test_kompaksi_melipat_journal_ke_csv(sim, data):
+    _tambah_ternak(sim, 3)
+    sim.ubah_ternak('S003', {'status_kesehatan': 'Sakit'})
+    sim.hapus_ternak('S001')
+
+    assert sim.kompaksi_journal(sim.LIVESTOCK_FILE, sim.HEADERS_LIVESTOCK)
+    assert not os.path.exists(sim.LIVESTOCK_FILE + sim.JOURNAL_SUFFIX)
+    isi = _isi_csv(sim.LIVESTOCK_FILE)
+    assert [r['ternak_id'] for r in isi] == ['S002', 'S003']
+    assert isi[1]['status_kesehatan'] == 'Sakit'
+    # Cache dan indeks tetap sama dengan isi file setelah kompaksi
+    assert sim.read_csv(sim.LIVESTOCK_FILE) == isi
+    assert sim.cari_berdasarkan_id(sim.LIVESTOCK_FILE, 'S001') is None
+
+
+def test_kompaksi_otomatis_setelah_batas(sim, data, monkeypatch):
+    _tambah_ternak(sim, 2)
+    monkeypatch.setattr(sim, 'BATAS_KOMPAKSI_JOURNAL', 1)
+    sim.ubah_ternak('S002', {'berat_sekarang': 99})
+    assert not os.path.exists(sim.LIVESTOCK_FILE + sim.JOURNAL_SUFFIX)
+    assert _isi_csv(sim.LIVESTOCK_FILE)[1]['berat_sekarang'] == '99'
+
+
+def test_journal_dari_proses_lain_terbaca(sim, data):
+    _tambah_ternak(sim, 2)
+    sim.read_csv(sim.LIVESTOCK_FILE)
+    with open(sim.LIVESTOCK_FILE + sim.JOURNAL_SUFFIX, 'a', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['_op'] + sim.HEADERS_LIVESTOCK)
+        writer.writerow(['D', 'S001', '', '', '', '', ''])
+    assert [r['ternak_id'] for r in sim.read_csv(sim.LIVESTOCK_FILE)] == ['S002']
+
+
+# ---------- ALOKATOR ID ----------
+
+def test_id_berurutan_dan_tidak_dipakai_ulang(sim, data):
+    assert _tambah_ternak(sim, 3) == ['S001', 'S002', 'S003']
+    sim.hapus_ternak('S003')
+    assert sim.generate_id('S', sim.LIVESTOCK_FILE, 'ternak_id') == 'S004'
+
+
+def test_id_melanjutkan_dari_state_tersimpan(sim, data):
+    for _ in range(5):
+        sim.catat_pakan('1', 'Rumput', 10, 'tes')
+    sim._simpan_state_id(sim.FEEDING_FILE, 'F', sim._ID_ALLOCATOR[(sim._kunci_cache(sim.FEEDING_FILE), 'F')])
+    # Proses baru: state dibaca dari file pendamping, lalu hanya ekor file yang dipindai
+    sim._reset_state_memori()
+    with open(sim.FEEDING_FILE, 'a', newline='', encoding='utf-8') as file:
+        file.write('F010,1,2025-01-01,Rumput,5,lain\r\n')
+    assert sim.generate_id('F', sim.FEEDING_FILE, 'log_id') == 'F011'
+
+
+def test_id_setelah_file_ditulis_ulang(sim, data):
+    _tambah_ternak(sim, 2)
+    rows = sim.read_csv(sim.LIVESTOCK_FILE) + [dict(sim.read_csv(sim.LIVESTOCK_FILE)[0], ternak_id='S050')]
+    sim.write_csv_overwrite(sim.LIVESTOCK_FILE, rows, sim.HEADERS_LIVESTOCK)
+    assert sim.generate_id('S', sim.LIVESTOCK_FILE, 'ternak_id') == 'S051'
+
+
+def test_id_sqlite_setelah_tabel_ditulis_ulang(sim, data, monkeypatch):
+    monkeypatch.setattr(sim, 'STORAGE_BACKEND', 'sqlite')
+    sim.setup_files()
+    for _ in range(6):
+        sim.catat_pakan('1', 'Rumput', 10, 'tes')
+    # Tabel diganti dengan isi lebih sedikit: rowid mulai lagi dari 1
+    awal = sim.read_csv(sim.FEEDING_FILE)[:2]
+    rows = awal + [dict(awal[0], log_id='F020')]
+    sim.write_csv_overwrite(sim.FEEDING_FILE, rows, sim.HEADERS_FEEDING)
+    assert sim.generate_id('F', sim.FEEDING_FILE, 'log_id') == 'F021'
+
+
+# ---------- INDEKS ----------
+
+def test_indeks_hash_mengikuti_update_dan_hapus(sim, data):
+    _tambah_ternak(sim, 3, kandang_id='1')
+    assert [r['ternak_id'] for r in sim.cari_semua(sim.LIVESTOCK_FILE, 'kandang_id', '1')] == ['S001', 'S002', 'S003']
+    sim.ubah_ternak('S002', {'kandang_id': '2'})
+    sim.hapus_ternak('S003')
+    assert [r['ternak_id'] for r in sim.cari_semua(sim.LIVESTOCK_FILE, 'kandang_id', '1')] == ['S001']
+    assert [r['ternak_id'] for r in sim.cari_semua(sim.LIVESTOCK_FILE, 'kandang_id', '2')] == ['S002']
+    assert sim.cari_berdasarkan_id(sim.LIVESTOCK_FILE, 'S003') is None
+    assert sim.cari_berdasarkan_id(sim.LIVESTOCK_FILE, 'S002')['kandang_id'] == '2'
+
+
+def test_indeks_hash_membaca_ekor_dari_proses_lain(sim, data):
+    _tambah_ternak(sim, 2, kandang_id='1')
+    sim.cari_semua(sim.LIVESTOCK_FILE, 'kandang_id', '1')
+    with open(sim.LIVESTOCK_FILE, 'a', newline='', encoding='utf-8') as file:
+        file.write('S009,Kambing,2024-02-01,30.0,Sehat,1\r\n')
+    assert [r['ternak_id'] for r in sim.cari_semua(sim.LIVESTOCK_FILE, 'kandang_id', '1')] == ['S001', 'S002', 'S009']
+    assert sim.cari_berdasarkan_id(sim.LIVESTOCK_FILE, 'S009')['jenis_ternak'] == 'Kambing'
+
+
+def test_indeks_tanggal_rentang_dan_journal(sim, data):
+    tanggal = ['2025-03-01', '2025-03-05', '2025-03-10', '2025-03-20']
+    ids = [sim.catat_pakan('1', 'Rumput', 10, 'tes', t) for t in tanggal]
+    hasil = sim.cari_rentang_tanggal(sim.FEEDING_FILE, '2025-03-02', '2025-03-10')
+    assert [r['log_id'] for r in hasil] == ids[1:3]
+    # Tanggal yang diubah lewat journal ikut dihitung
+    sim.update_csv_row(sim.FEEDING_FILE, ids[3], {'tanggal': '2025-03-06'}, sim.HEADERS_FEEDING)
+    hasil = sim.cari_rentang_tanggal(sim.FEEDING_FILE, '2025-03-02', '2025-03-10')
+    assert sorted(r['log_id'] for r in hasil) == ids[1:]
+
+
+def test_indeks_teks_kesehatan(sim, data):
+    _tambah_ternak(sim, 2)
+    sim.catat_kesehatan('S001', 'demam tinggi', 'antipiretik', 'tes', '2025-03-01')
+    record_id, _ = sim.catat_kesehatan('S002', 'batuk', 'obat batuk', 'tes', '2025-03-02')
+    assert [r['ternak_id'] for r in sim.cari_teks_kesehatan('dem')] == ['S001']
+    assert [r['ternak_id'] for r in sim.cari_teks_kesehatan('obat', kolom='tindakan')] == ['S002']
+    sim.update_csv_row(sim.HEALTH_FILE, record_id, {'gejala': 'demam'}, sim.HEADERS_HEALTH)
+    assert [r['ternak_id'] for r in sim.cari_teks_kesehatan('demam')] == ['S001', 'S002']
+    assert sim.cari_teks_kesehatan('batuk', kolom='gejala') == []
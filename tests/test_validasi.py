@@ -0,0 +1,67 @@
+import pytest
+
+
+@pytest.fixture
+def validasi(sim, data):
+    sim.pelanggaran_terbaru(kosongkan=True)
+    sim.atur_validasi_incremental(True, cetak=False)
+    yield sim
+    sim.tunggu_validasi()
+    sim.atur_validasi_incremental(sim.VALIDASI_INCREMENTAL)
+    sim.pelanggaran_terbaru(kosongkan=True)
+
+
+def _pelanggaran(sim):
+    sim.tunggu_validasi()
+    return [(p['tabel'], p['id'], p['jenis']) for p in sim.pelanggaran_terbaru(kosongkan=True)]
+
+
+def test_validasi_incremental_opt_in(sim, data):
+    sim.pelanggaran_terbaru(kosongkan=True)
+    if not sim.VALIDASI_INCREMENTAL:
+        # Tanpa SIMTERNAK_VALIDASI=1 penulisan tidak memicu validasi sama sekali
+        assert sim._validasi_pada_perubahan not in sim._PENDENGAR_PERUBAHAN
+    sim.atur_validasi_incremental(False)
+    sim.tambah_ternak('Sapi', '2024-01-01', 99999.0, '1')
+    sim.tunggu_validasi()
+    assert sim.pelanggaran_terbaru() == []
+
+
+def test_baris_baru_diperiksa(validasi):
+    sim = validasi
+    sim.tambah_ternak('Sapi', '2024-01-01', 99999.0, '1')
+    sim.catat_kesehatan('S999', '', 'cek', 'tes', '2025-01-01')
+    assert _pelanggaran(sim) == [('livestock.csv', 'S001', 'angka'), ('health_records.csv', 'H001', 'fk')]
+
+
+def test_update_setelah_tambah_bukan_id_ganda(validasi):
+    sim = validasi
+    sim.tambah_ternak('Sapi', '2024-01-01', 100.0, '1')
+    for i in range(20):
+        record_id, _ = sim.catat_kesehatan('S001', '', 'cek', 'tes', '2025-01-01')
+        sim.update_csv_row(sim.HEALTH_FILE, record_id, {'tindakan': f'ubah {i}'}, sim.HEADERS_HEALTH)
+    assert _pelanggaran(sim) == []
+
+
+def test_id_ganda_terdeteksi(validasi):
+    sim = validasi
+    sim.tambah_ternak('Sapi', '2024-01-01', 100.0, '1')
+    sim.append_csv_row(sim.LIVESTOCK_FILE, {'ternak_id': 'S001', 'jenis_ternak': 'Kambing', 'tgl_lahir': '2024-02-01',
+                                            'berat_sekarang': 30.0, 'status_kesehatan': 'Sehat',
+                                            'kandang_id': '1'}, sim.HEADERS_LIVESTOCK)
+    assert _pelanggaran(sim) == [('livestock.csv', 'S001', 'duplikat')]
+
+
+def test_tulis_ulang_hanya_memeriksa_baris_yang_berubah(validasi):
+    sim = validasi
+    for _ in range(3):
+        sim.tambah_ternak('Sapi', '2024-01-01', 100.0, '1')
+    # Pelanggaran lama (masuk tanpa validasi) tidak dilaporkan ulang saat tabel ditulis ulang
+    sim.atur_validasi_incremental(False)
+    sim.update_csv_row(sim.LIVESTOCK_FILE, 'S002', {'berat_sekarang': 99999}, sim.HEADERS_LIVESTOCK)
+    sim.atur_validasi_incremental(True, cetak=False)
+    rows = [dict(r) for r in sim.read_csv(sim.LIVESTOCK_FILE)]
+    rows[0]['tgl_lahir'] = '2024-13-01'
+    rows.append(dict(rows[2], ternak_id='S004'))
+    sim.write_csv_overwrite(sim.LIVESTOCK_FILE, rows, sim.HEADERS_LIVESTOCK)
+    assert _pelanggaran(sim) == [('livestock.csv', 'S001', 'tanggal')]